@@ -0,0 +1,164 @@
+"""Compare HTTP/1.1 and HTTP/2 for parallel DISCORDBOT_GET_MESSAGE calls.
+
+Starts a local stand-in for the Discord API (in its own process) that answers
+GET /channels/{channel_id}/messages/{message_id} after a fixed delay, then
+fires the same batch of concurrent tool calls through production.py once per
+mode and reports throughput and latency percentiles.
+
+The stand-in speaks cleartext HTTP/2 (h2c), so HTTP/2 mode runs with
+HTTP2_PRIOR_KNOWLEDGE; against discord.com the protocol is negotiated over TLS.
+
+Requires: pip install hypercorn h2
+
+Usage:
+    python benchmarks/bench_http2.py [--calls 2000] [--concurrency 200]
+                                     [--latency 0.02] [--pool-size 20]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MESSAGE = json.dumps({
+    "id": "1234567890123456789",
+    "channel_id": "876543210987654321",
+    "author": {"id": "111111111111111111", "username": "bench", "discriminator": "0", "avatar": None},
+    "content": "benchmark message " * 10,
+    "timestamp": "2024-01-01T00:00:00.000000+00:00",
+    "edited_timestamp": None,
+    "tts": False,
+    "mention_everyone": False,
+    "mentions": [],
+    "mention_roles": [],
+    "attachments": [],
+    "embeds": [],
+    "pinned": False,
+    "type": 0,
+}).encode()
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def make_app(latency: float):
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        await asyncio.sleep(latency)
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": MESSAGE})
+    return app
+
+def serve_stand_in(port: int, latency: float):
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+    
+    server_config = Config()
+    server_config.bind = [f"127.0.0.1:{port}"]
+    server_config.accesslog = None
+    server_config.errorlog = None
+    server_config.h2_max_concurrent_streams = 1000
+    server_config.keep_alive_max_requests = 10 ** 9
+    asyncio.run(serve(make_app(latency), server_config))
+
+async def wait_for_port(port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+async def run_mode(production, http2: bool, calls: int, concurrency: int, pool_size: int):
+    production.config.HTTP2_ENABLED = http2
+    production.config.HTTP2_PRIOR_KNOWLEDGE = http2
+    production.config.CONNECTION_POOL_SIZE = pool_size
+    production.config.MAX_KEEPALIVE_CONNECTIONS = pool_size
+    
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def call(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await production.DISCORDBOT_GET_MESSAGE("876543210987654321", str(1000 + i))
+            latencies.append(time.perf_counter() - start)
+    
+    async with production._server_lifespan(production.mcp):
+        # Warm the pool so both modes are measured with established connections
+        await asyncio.gather(*(call(i) for i in range(min(concurrency, calls))))
+        latencies.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(call(i) for i in range(calls)))
+        elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    return {
+        "mode": "HTTP/2" if http2 else "HTTP/1.1",
+        "throughput": calls / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02, help="stand-in server delay per request, seconds")
+    parser.add_argument("--pool-size", type=int, default=20, help="CONNECTION_POOL_SIZE for both modes")
+    args = parser.parse_args()
+    
+    try:
+        import hypercorn  # noqa: F401
+        import h2  # noqa: F401
+    except ImportError:
+        sys.exit("This benchmark needs hypercorn and h2: pip install hypercorn h2")
+    
+    port = _free_port()
+    server = multiprocessing.Process(target=serve_stand_in, args=(port, args.latency), daemon=True)
+    server.start()
+    await wait_for_port(port)
+    
+    os.environ.setdefault("DISCORD_BOT_TOKEN", "benchmark-token")
+    os.environ["DISCORD_API_BASE"] = f"http://127.0.0.1:{port}/api/v10"
+    os.environ["MAX_REQUESTS_PER_WINDOW"] = str(10 ** 9)
+    import production
+    import logging
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    
+    results = []
+    try:
+        for http2 in (False, True):
+            results.append(await run_mode(production, http2, args.calls, args.concurrency, args.pool_size))
+    finally:
+        server.terminate()
+        server.join()
+    
+    print(f"\n{args.calls} calls, concurrency {args.concurrency}, pool size {args.pool_size}, "
+          f"server latency {args.latency * 1000:.0f} ms")
+    print(f"{'mode':<10}{'calls/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['throughput']:>10.0f}{r['p50']:>10.1f}{r['p99']:>10.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
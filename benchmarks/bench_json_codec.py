@@ -0,0 +1,106 @@
+"""Compare the JSON codecs production.py can use for Discord payloads.
+
+Encodes and decodes payloads shaped like the largest responses the tools
+handle - a 1000-member DISCORDBOT_LIST_GUILD_MEMBERS page and a 100-message
+DISCORDBOT_LIST_MESSAGES page - with every installed codec (orjson, msgspec
+and the standard library) and reports the time per operation and the speedup
+over the standard library.
+
+Optional: pip install orjson msgspec
+
+Usage:
+    python benchmarks/bench_json_codec.py [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def make_members(count: int):
+    return [{
+        "user": {
+            "id": str(100000000000000000 + i),
+            "username": f"member{i}",
+            "global_name": f"Member Number {i}",
+            "discriminator": "0",
+            "avatar": "a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6",
+            "public_flags": 0,
+        },
+        "nick": None if i % 3 else f"nick {i}",
+        "avatar": None,
+        "roles": [str(200000000000000000 + r) for r in range(i % 5)],
+        "joined_at": "2023-05-01T12:34:56.789000+00:00",
+        "premium_since": None,
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+        "pending": False,
+    } for i in range(count)]
+
+def make_messages(count: int):
+    return [{
+        "id": str(300000000000000000 + i),
+        "channel_id": "876543210987654321",
+        "author": {"id": str(100000000000000000 + i % 20), "username": f"user{i % 20}",
+                   "discriminator": "0", "avatar": None},
+        "content": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (1 + i % 4),
+        "timestamp": "2024-01-01T00:00:00.000000+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [{"title": "Embed", "description": "Details " * 10, "color": 5814783,
+                    "fields": [{"name": f"Field {f}", "value": "value", "inline": True} for f in range(3)]}]
+                  if i % 5 == 0 else [],
+        "reactions": [{"emoji": {"id": None, "name": "\U0001F44D"}, "count": i % 7, "me": False}],
+        "pinned": False,
+        "type": 0,
+    } for i in range(count)]
+
+def timeit(fn, arg, repeat: int) -> float:
+    """Best-of-five mean seconds per call."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(arg)
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="operations per timing run")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DISCORD_BOT_TOKEN", "benchmark")
+    import production
+
+    codecs = []
+    for name in production.JSON_CODECS:
+        loaded = production._load_json_codec(name)
+        if loaded[0] == name:
+            codecs.append(loaded)
+
+    payloads = {"1000 guild members": make_members(1000), "100 messages": make_messages(100)}
+    for label, payload in payloads.items():
+        raw = production._stdlib_json_dumps(payload)
+        print(f"\n{label} ({len(raw) / 1024:.0f} KiB)")
+        print(f"{'codec':<10}{'decode ms':>12}{'encode ms':>12}{'decode x':>11}{'encode x':>11}")
+        baseline = None
+        results = []
+        for name, dumps, loads in codecs:
+            assert loads(dumps(payload)) == payload
+            results.append((name, timeit(loads, raw, args.repeat), timeit(dumps, payload, args.repeat)))
+            if name == "json":
+                baseline = results[-1]
+        for name, decode, encode in results:
+            print(f"{name:<10}{decode * 1000:>12.3f}{encode * 1000:>12.3f}"
+                  f"{baseline[1] / decode:>10.1f}x{baseline[2] / encode:>10.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,25 @@
 import os
+import re
+import sys
 import json
+import math
 import asyncio
 import time
-from typing import Optional, List, Dict, Any, Union, IO, BinaryIO
+import random
+import signal
+import hashlib
+import hmac
+import functools
+import sqlite3
+from typing import Optional, List, Dict, Any, Union, Tuple, IO, BinaryIO, Callable
 from urllib.parse import quote_plus, urlencode
-from dataclasses import dataclass
+from collections import deque, OrderedDict
+from bisect import bisect_left
+from dataclasses import dataclass, field, fields, asdict
 from datetime import datetime, timedelta
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor
 import httpx
 
 # Load .env file automatically from the same directory as this script
@@ -47,6 +61,7 @@ except Exception:
         from mcp.server.fastmcp import FastMCP  
     except Exception:
         raise ImportError("FastMCP import failed. Ensure 'mcp' package is installed.")
+from mcp.types import TextContent
 
 # ---------------- PRODUCTION CONFIGURATION ----------------
 @dataclass
@@ -56,16 +71,80 @@ class ProductionConfig:
     DISCORD_API_BASE: str = "https://discord.com/api/v10"
     REQUEST_TIMEOUT: float = 30.0
     MAX_RETRIES: int = 3
-    RETRY_DELAY: float = 1.0
+    RETRY_DELAY: float = 0.25  # base delay of the jittered backoff
+    RETRY_MAX_DELAY: float = 5.0  # cap on a single backoff sleep
+    RETRY_BUDGET: float = 15.0  # seconds of retrying allowed per call
     CONNECTION_POOL_SIZE: int = 100
     MAX_KEEPALIVE_CONNECTIONS: int = 20
-    
-    # Rate Limiting
-    RATE_LIMIT_WINDOW: int = 60  # seconds
+    KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle pooled connection is kept
+    HTTP2_ENABLED: bool = False  # multiplex requests over HTTP/2 (needs the 'h2' package)
+    HTTP2_PRIOR_KNOWLEDGE: bool = False  # speak HTTP/2 without TLS negotiation, e.g. to a local h2c server
+    JSON_CODEC: str = "auto"  # auto, orjson, msgspec or json (stdlib)
+    RAW_JSON_PASSTHROUGH: bool = False  # return Discord's JSON text from read tools without decoding it
+    
+    # Rate Limiting (defaults match Discord's global limit of 50 requests/second)
+    RATE_LIMIT_WINDOW: float = 1.0  # seconds
     MAX_REQUESTS_PER_WINDOW: int = 50
+    INVALID_REQUEST_LIMIT: int = 10000  # 401/403/429 responses before Cloudflare bans the IP
+    INVALID_REQUEST_WINDOW: float = 600.0  # seconds
+    INVALID_REQUEST_SLOWDOWN: float = 0.5  # fraction of the budget after which requests are slowed
+    RATE_LIMIT_MAX_WAIT: float = 60.0  # seconds a call may spend waiting out 429s before failing
+    
+    # Circuit Breaker (per route group: messages, guilds, channels, webhooks, interactions, ...)
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive calls failing with timeouts, connection errors or 5xx that open the circuit
+    CIRCUIT_RESET_TIMEOUT: float = 30.0  # seconds a circuit stays open before a half-open probe
+    
+    # Request Hedging (GET only)
+    HEDGING_ENABLED: bool = False  # send a second GET when the first is slower than usual for its route
+    HEDGE_PERCENTILE: float = 0.95  # route latency percentile after which a hedge is sent
+    HEDGE_BUDGET: float = 0.05  # hedges allowed per request sent (plus a small burst)
+    
+    # Bot Profiles (DISCORD_BOT_TOKEN and DISCORD_BOT_TOKEN_<NAME>, see BotProfile)
+    DEFAULT_BOT_PROFILE: str = "default"  # profile of tool calls that do not name one in _meta
+    
+    # Local Proxy (python production.py --proxy, see DiscordProxy)
+    PROXY_HOST: str = "127.0.0.1"
+    PROXY_PORT: int = 8765
+    PROXY_SOCKET: str = ""  # listen on this Unix socket instead of PROXY_HOST:PROXY_PORT
+    PROXY_SECRET: str = ""  # shared secret clients must send; required when the proxy listens on TCP
+    USE_DISCORD_PROXY: bool = False  # DISCORD_API_BASE is such a proxy: send bot profile names instead of tokens
+    DISCORD_API_SOCKET: str = ""  # reach DISCORD_API_BASE over this Unix socket, e.g. the proxy's PROXY_SOCKET
+    
+    # Request Scheduling (moderation > interactive > read > bulk, see TOOL_PRIORITIES)
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_MAX_CONCURRENCY: int = 0  # requests in flight to Discord at once, the rest queue by priority (0 = CONNECTION_POOL_SIZE)
+    PRIORITY_AGING: float = 5.0  # seconds of queueing that raise a waiting request by one priority class
+    
+    # Request Coalescing
+    SINGLE_FLIGHT_ENABLED: bool = True  # share one in-flight request between identical concurrent GETs
+    RESPONSE_CACHE_ENABLED: bool = True  # cache GET responses of read-mostly routes (see CACHE_TTL_POLICIES)
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    PERSISTENT_CACHE_ENABLED: bool = True  # keep static responses on disk across restarts (see PERSISTENT_CACHE_POLICIES)
+    PERSISTENT_CACHE_PATH: str = os.path.join(os.path.expanduser("~"), ".cache", "discordbot-mcp", "responses.sqlite3")
+    PERSISTENT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    
+    # Deadlines
+    TOOL_CALL_TIMEOUT: float = 120.0  # seconds a tool call may run before its requests are abandoned (0 = no limit)
+    
+    # Tracing (OpenTelemetry-compatible spans per tool call)
+    TRACING_ENABLED: bool = False
+    TRACE_EXPORT_PATH: str = os.path.join(os.path.expanduser("~"), ".cache", "discordbot-mcp", "traces.jsonl")  # "" = no file
+    OTLP_ENDPOINT: str = ""  # OTLP/HTTP JSON traces endpoint, e.g. http://localhost:4318/v1/traces
+    TRACE_SERVICE_NAME: str = "discordbot-mcp"
+    
+    # Metrics
+    METRICS_ENABLED: bool = True
+    METRICS_PORT: int = 0  # serve Prometheus metrics on http://METRICS_HOST:METRICS_PORT/metrics (0 = off)
+    METRICS_HOST: str = "127.0.0.1"
+    
+    # Messages
+    AUTO_MESSAGE_NONCE: bool = True  # give every sent message an enforced nonce so retries cannot double-post
     
     # Health Check
-    HEALTH_CHECK_INTERVAL: int = 30  # seconds
+    HEALTH_CHECK_ENABLED: bool = True  # probe Discord and keep pooled connections warm in the background
+    HEALTH_CHECK_INTERVAL: float = 30.0  # seconds between probes (0 = only pre-warm at startup)
+    PREWARM_CONNECTIONS: int = 2  # pooled connections opened at startup and kept live by each probe
     
     # File Upload
     MAX_FILE_SIZE: int = 25 * 1024 * 1024  # 25MB (Discord limit)
@@ -75,29 +154,1704 @@ class ProductionConfig:
         if self.ALLOWED_FILE_TYPES is None:
             self.ALLOWED_FILE_TYPES = ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.mp4', '.webm', '.mov']
 
-# Load configuration
-config = ProductionConfig()
+# ---------------- CONFIGURATION LOADING ----------------
+# Inclusive (minimum, maximum) of numeric settings; None leaves that side open
+CONFIG_LIMITS: Dict[str, Tuple[Optional[float], Optional[float]]] = {
+    "REQUEST_TIMEOUT": (0.1, None),
+    "MAX_RETRIES": (0, 10),
+    "RETRY_DELAY": (0, 60),
+    "RETRY_MAX_DELAY": (0, 300),
+    "RETRY_BUDGET": (0, None),
+    "CONNECTION_POOL_SIZE": (1, 1000),
+    "MAX_KEEPALIVE_CONNECTIONS": (0, 1000),
+    "KEEPALIVE_EXPIRY": (0, None),
+    "RATE_LIMIT_WINDOW": (0.01, 3600),
+    "MAX_REQUESTS_PER_WINDOW": (1, None),  # see check_config for the cap
+    "INVALID_REQUEST_LIMIT": (1, None),
+    "INVALID_REQUEST_WINDOW": (1, None),
+    "INVALID_REQUEST_SLOWDOWN": (0, 1),
+    "RATE_LIMIT_MAX_WAIT": (0, None),
+    "CIRCUIT_FAILURE_THRESHOLD": (1, None),
+    "CIRCUIT_RESET_TIMEOUT": (0, None),
+    "HEDGE_PERCENTILE": (0.5, 0.999),
+    "HEDGE_BUDGET": (0, 1),
+    "SCHEDULER_MAX_CONCURRENCY": (0, 1000),
+    "PRIORITY_AGING": (0, None),
+    "RESPONSE_CACHE_MAX_BYTES": (0, None),
+    "PERSISTENT_CACHE_MAX_BYTES": (0, None),
+    "TOOL_CALL_TIMEOUT": (0, None),
+    "METRICS_PORT": (0, 65535),
+    "PROXY_PORT": (1, 65535),
+    "HEALTH_CHECK_INTERVAL": (0, None),
+    "PREWARM_CONNECTIONS": (0, 100),
+    "MAX_FILE_SIZE": (1, None),
+}
+
+CONFIG_CHOICES: Dict[str, Tuple[str, ...]] = {
+    "JSON_CODEC": ("auto", "orjson", "msgspec", "json"),
+}
+
+# Settings that are file paths ("~" is expanded)
+CONFIG_PATHS = ("PERSISTENT_CACHE_PATH", "TRACE_EXPORT_PATH", "PROXY_SOCKET", "DISCORD_API_SOCKET")
+
+CONFIG_FIELDS = {f.name: f.type for f in fields(ProductionConfig)}
+
+# Discord's published limits, which the client-side limits may not exceed:
+# 50 requests per second per bot, 10,000 invalid requests per 10 minutes per IP
+DISCORD_GLOBAL_RATE_LIMIT = (50, 1.0)
+DISCORD_INVALID_REQUEST_LIMIT = (10000, 600.0)
+
+def parse_setting(name: str, value: Any) -> Any:
+    """Convert an environment string or JSON value to the type of a ProductionConfig field.
+    
+    Booleans accept true/false, yes/no, on/off and 1/0; lists (ALLOWED_FILE_TYPES)
+    accept a comma-separated string. Raises ValueError for unknown settings and for
+    values of the wrong type, outside CONFIG_LIMITS or not in CONFIG_CHOICES.
+    """
+    if name not in CONFIG_FIELDS:
+        raise ValueError(f"Unknown setting {name}")
+    kind = CONFIG_FIELDS[name]
+    try:
+        if kind is bool:
+            text = str(value).strip().lower()
+            if text not in ("1", "true", "yes", "on", "0", "false", "no", "off"):
+                raise ValueError
+            parsed = text in ("1", "true", "yes", "on")
+        elif kind is int:
+            if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+                raise ValueError
+            parsed = int(value) if isinstance(value, (int, float)) else int(str(value).strip())
+        elif kind is float:
+            if isinstance(value, bool):
+                raise ValueError
+            parsed = float(value)
+        elif kind is str:
+            parsed = str(value).strip()
+        else:
+            items = value if isinstance(value, (list, tuple)) else str(value).split(",")
+            parsed = [str(item).strip().lower() for item in items if str(item).strip()]
+    except (TypeError, ValueError):
+        expected = {bool: "true or false", int: "an integer", float: "a number"}.get(kind, "a list")
+        raise ValueError(f"{name} must be {expected}, got {value!r}") from None
+    
+    if name in CONFIG_LIMITS:
+        low, high = CONFIG_LIMITS[name]
+        if parsed != parsed or (low is not None and parsed < low) or (high is not None and parsed > high):
+            bounds = f"at least {low}" if high is None else f"between {low} and {high}"
+            raise ValueError(f"{name} must be {bounds}, got {parsed}")
+    if name in CONFIG_CHOICES:
+        parsed = parsed.lower()
+        if parsed not in CONFIG_CHOICES[name]:
+            raise ValueError(f"{name} must be one of {', '.join(CONFIG_CHOICES[name])}, got {value!r}")
+    if name in CONFIG_PATHS:
+        parsed = os.path.expanduser(parsed)
+    if name == "ALLOWED_FILE_TYPES":
+        parsed = [ext if ext.startswith(".") else f".{ext}" for ext in parsed]
+    return parsed
+
+def check_config(settings: Dict[str, Any]) -> List[str]:
+    """Problems with combinations of settings (each value on its own is already valid)."""
+    problems = []
+    if settings["RETRY_DELAY"] > settings["RETRY_MAX_DELAY"]:
+        problems.append("RETRY_DELAY cannot exceed RETRY_MAX_DELAY")
+    if settings["HTTP2_PRIOR_KNOWLEDGE"] and not settings["HTTP2_ENABLED"]:
+        problems.append("HTTP2_PRIOR_KNOWLEDGE requires HTTP2_ENABLED")
+    # A window shorter than Discord's allows its limit in every slice of the longer one
+    for count, window, (limit, period) in (
+            ("MAX_REQUESTS_PER_WINDOW", "RATE_LIMIT_WINDOW", DISCORD_GLOBAL_RATE_LIMIT),
+            ("INVALID_REQUEST_LIMIT", "INVALID_REQUEST_WINDOW", DISCORD_INVALID_REQUEST_LIMIT)):
+        allowed = int(limit * min(1.0, settings[window] / period))
+        if settings[count] > allowed:
+            problems.append(f"{count} cannot exceed {allowed} per {window} of {settings[window]}s "
+                            f"(Discord allows {limit} per {period:g}s)")
+    return problems
+
+def load_config() -> ProductionConfig:
+    """Build the configuration from the defaults and environment variables named after each field.
+    
+    Empty variables are ignored, except for string settings where "" is a
+    meaningful value (e.g. TRACE_EXPORT_PATH or OTLP_ENDPOINT). Every invalid
+    variable is reported at once in a single ValueError.
+    """
+    loaded = ProductionConfig()
+    problems = []
+    for name, kind in CONFIG_FIELDS.items():
+        value = os.getenv(name)
+        if value is None or (value.strip() == "" and kind is not str):
+            continue
+        try:
+            setattr(loaded, name, parse_setting(name, value))
+        except ValueError as e:
+            problems.append(str(e))
+    if not problems:
+        problems = check_config(asdict(loaded))
+    if problems:
+        raise ValueError("Invalid configuration: " + "; ".join(problems))
+    return loaded
+
+# Load configuration (defaults overridden by environment variables)
+config = load_config()
+
+# Bot tokens
+# DISCORD_BOT_TOKEN is the "default" bot profile; DISCORD_BOT_TOKEN_<NAME> adds a
+# profile called <name> that tool calls select with "_meta": {"profile": "<name>"}
+BOT_TOKEN_PREFIX = "DISCORD_BOT_TOKEN_"
+
+# Headers an MCP server with USE_DISCORD_PROXY sends the local proxy instead of a token
+PROXY_PROFILE_HEADER = "X-Discord-Bot-Profile"
+PROXY_PRIORITY_HEADER = "X-Discord-Priority"
+PROXY_TIMEOUT_HEADER = "X-Discord-Timeout"
+PROXY_SECRET_HEADER = "X-Discord-Proxy-Secret"
+
+def _load_bot_tokens() -> Dict[str, str]:
+    """Authorization header of every configured bot profile, by profile name.
+    
+    Raises ValueError when DEFAULT_BOT_PROFILE names none of them, rather than
+    failing every tool call that does not pick a profile.
+    """
+    tokens = {}
+    if os.getenv("DISCORD_BOT_TOKEN"):
+        tokens["default"] = os.getenv("DISCORD_BOT_TOKEN")
+    for name, value in sorted(os.environ.items()):
+        if name.startswith(BOT_TOKEN_PREFIX) and name != BOT_TOKEN_PREFIX and value:
+            tokens[name[len(BOT_TOKEN_PREFIX):].lower()] = value
+    if not tokens:
+        if config.USE_DISCORD_PROXY:
+            # The proxy holds the tokens; requests only name the profile
+            return {config.DEFAULT_BOT_PROFILE: ""}
+        # Required; raises with setup instructions
+        tokens["default"] = get_env("DISCORD_BOT_TOKEN")
+    default = config.DEFAULT_BOT_PROFILE.lower()
+    if default not in tokens and not config.USE_DISCORD_PROXY:
+        variable = "DISCORD_BOT_TOKEN" if default == "default" else f"{BOT_TOKEN_PREFIX}{default.upper()}"
+        raise ValueError(f"Invalid configuration: DEFAULT_BOT_PROFILE is '{default}' but {variable} is not set; "
+                         f"configured profiles: {', '.join(sorted(tokens))}")
+    return {name: token if token.startswith("Bot ") else f"Bot {token}" for name, token in tokens.items()}
+
+BOT_TOKENS = _load_bot_tokens()
+
+# The Authorization header is added per request from the tool call's bot profile
+DEFAULT_HEADERS = {"Content-Type": "application/json"}
+
+# ---------------- JSON CODEC ----------------
+# Libraries tried, fastest first, when JSON_CODEC is "auto"
+JSON_CODECS = ("orjson", "msgspec", "json")
+
+def _stdlib_json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def _load_json_codec(name: str) -> Tuple[str, Callable[[Any], bytes], Callable[[Union[bytes, str]], Any]]:
+    """Return (name, dumps, loads) for a JSON library; "auto" picks the fastest installed.
+    
+    ``dumps`` returns UTF-8 bytes. Objects the fast libraries cannot encode
+    (e.g. integers wider than 64 bits) are handed to the stdlib encoder.
+    """
+    candidates = JSON_CODECS if name == "auto" else (name,)
+    if name not in JSON_CODECS and name != "auto":
+        raise ValueError(f"JSON_CODEC must be one of auto, {', '.join(JSON_CODECS)}")
+    for candidate in candidates:
+        if candidate == "orjson":
+            try:
+                import orjson
+            except ImportError:
+                continue
+            
+            def dumps(obj: Any, _encode=orjson.dumps, _option=orjson.OPT_NON_STR_KEYS) -> bytes:
+                try:
+                    return _encode(obj, option=_option)
+                except TypeError:
+                    return _stdlib_json_dumps(obj)
+            return "orjson", dumps, orjson.loads
+        if candidate == "msgspec":
+            try:
+                import msgspec
+            except ImportError:
+                continue
+            encoder, decoder = msgspec.json.Encoder(), msgspec.json.Decoder()
+            
+            def dumps(obj: Any, _encode=encoder.encode) -> bytes:
+                try:
+                    return _encode(obj)
+                except (TypeError, OverflowError):
+                    return _stdlib_json_dumps(obj)
+            return "msgspec", dumps, decoder.decode
+        if candidate == "json":
+            return "json", _stdlib_json_dumps, json.loads
+    print(f"Warning: JSON codec '{name}' is not installed, using the standard library", file=sys.stderr)
+    return "json", _stdlib_json_dumps, json.loads
+
+JSON_CODEC_NAME, _json_dumps, _json_loads = _load_json_codec(config.JSON_CODEC)
+
+# ---------------- ERRORS ----------------
+class DiscordError(RuntimeError):
+    """Base class of the errors raised for Discord API calls."""
+
+class DiscordHTTPError(DiscordError):
+    """Discord answered a request with an error status.
+    
+    Carries the HTTP ``status``, Discord's JSON error ``code`` and
+    ``message``, the nested ``errors`` tree of invalid form fields, the
+    rate limit ``bucket`` and ``retry_after`` when Discord sent them, and
+    the ``request_id`` of the call.
+    """
+    
+    def __init__(self, status: int, message: str = "", code: Optional[int] = None,
+                 errors: Optional[Dict[str, Any]] = None, bucket: Optional[str] = None,
+                 retry_after: Optional[float] = None, request_id: Optional[str] = None):
+        detail = f" (code {code})" if code else ""
+        super().__init__(f"Discord API Error {status}: {message}{detail}")
+        self.status = status
+        self.message = message
+        self.code = code
+        self.errors = errors or {}
+        self.bucket = bucket
+        self.retry_after = retry_after
+        self.request_id = request_id
+    
+    @classmethod
+    def from_response(cls, response: httpx.Response, request_id: Optional[str] = None) -> "DiscordHTTPError":
+        """Build the error subclass matching an error response's status."""
+        try:
+            body = _json_loads(response.content)
+        except ValueError:
+            body = None
+        if not isinstance(body, dict):
+            body = {"message": response.text}
+        status = response.status_code
+        bucket = response.headers.get("X-RateLimit-Bucket")
+        if status == 429:
+            info = RateLimitInfo.from_headers(response.headers)
+            retry_after, is_global = _parse_retry_after(response, info)
+            return DiscordRateLimitError(retry_after, is_global, info.scope if info else None, bucket, request_id)
+        
+        error_cls = _HTTP_ERROR_CLASSES.get(status)
+        if error_cls is None:
+            error_cls = DiscordServerError if status >= 500 else DiscordHTTPError
+        code = body.get("code")
+        return error_cls(status, str(body.get("message", "")), code if isinstance(code, int) else None,
+                         body.get("errors") if isinstance(body.get("errors"), dict) else None,
+                         bucket, None, request_id)
+    
+    @property
+    def field_errors(self) -> Dict[str, List[Dict[str, Any]]]:
+        """The ``errors`` tree flattened to {"embeds.0.title": [{"code": ..., "message": ...}]}."""
+        flat: Dict[str, List[Dict[str, Any]]] = {}
+        stack = [("", self.errors)]
+        while stack:
+            path, node = stack.pop()
+            for key, value in node.items():
+                if key == "_errors" and isinstance(value, list):
+                    flat[path or "_"] = [{"code": e.get("code"), "message": e.get("message")}
+                                         for e in value if isinstance(e, dict)]
+                elif isinstance(value, dict):
+                    stack.append((f"{path}.{key}" if path else key, value))
+        return dict(sorted(flat.items()))
+    
+    def details(self) -> Dict[str, Any]:
+        """Discord's error code, message, per-field errors and the request id, where known."""
+        return _filter_none({
+            "code": self.code,
+            "discord_message": self.message or None,
+            "field_errors": self.field_errors or None,
+            "request_id": self.request_id
+        })
+
+class DiscordBadRequestError(DiscordHTTPError):
+    """400: the request was malformed or failed Discord's validation."""
+
+class DiscordUnauthorizedError(DiscordHTTPError):
+    """401: the bot token is missing or invalid."""
+
+class DiscordForbiddenError(DiscordHTTPError):
+    """403: the bot lacks a permission or cannot use the endpoint."""
+
+class DiscordNotFoundError(DiscordHTTPError):
+    """404: the resource does not exist or is not visible to the bot."""
+
+class DiscordServerError(DiscordHTTPError):
+    """5xx: Discord failed to handle the request."""
+
+class DiscordRateLimitError(DiscordHTTPError):
+    """Raised when a request stays rate limited past ``RATE_LIMIT_MAX_WAIT``."""
+    
+    def __init__(self, retry_after: float, is_global: bool = False, scope: Optional[str] = None,
+                 bucket: Optional[str] = None, request_id: Optional[str] = None):
+        super().__init__(429, f"Rate limited: retry after {retry_after}s", bucket=bucket,
+                         retry_after=retry_after, request_id=request_id)
+        self.is_global = is_global
+        self.scope = scope
+
+_HTTP_ERROR_CLASSES = {
+    400: DiscordBadRequestError,
+    401: DiscordUnauthorizedError,
+    403: DiscordForbiddenError,
+    404: DiscordNotFoundError,
+}
+
+# ---------------- RATE LIMITING ----------------
+# Path segments whose following snowflake is named after the resource, so that
+# e.g. /channels/123/messages/456 becomes /channels/{channel_id}/messages/{message_id}.
+_ROUTE_PARAM_NAMES = {
+    "applications": "application_id",
+    "auto-moderation": "rule_id",
+    "bans": "user_id",
+    "channels": "channel_id",
+    "commands": "command_id",
+    "emoji": "user_id",
+    "emojis": "emoji_id",
+    "guilds": "guild_id",
+    "integrations": "integration_id",
+    "members": "user_id",
+    "messages": "message_id",
+    "permissions": "overwrite_id",
+    "recipients": "user_id",
+    "roles": "role_id",
+    "rules": "rule_id",
+    "scheduled-events": "event_id",
+    "sticker-packs": "pack_id",
+    "stickers": "sticker_id",
+    "thread-members": "user_id",
+    "users": "user_id",
+    "webhooks": "webhook_id",
+}
+
+# Segments that are followed by a free-form (non-snowflake) path parameter.
+_ROUTE_FREEFORM_PARAMS = {
+    "reactions": "emoji",
+    "invites": "invite_code",
+    "templates": "template_code",
+    "webhook_id": "webhook_token",
+}
+
+# Discord keys rate limits on these "major parameters" in addition to the route.
+_MAJOR_PARAMETERS = ("channel_id", "guild_id", "webhook_id", "webhook_token")
+
+_API_PREFIX = re.compile(r"^/api(?:/v\d+)?")
+
+def _parse_route(path: str) -> Tuple[str, Dict[str, str]]:
+    """Split an API path into its route template and path parameters."""
+    path = _API_PREFIX.sub("", path.split("?", 1)[0])
+    parts: List[str] = []
+    path_params: Dict[str, str] = {}
+    previous = None
+    for segment in path.strip("/").split("/"):
+        name = None
+        if previous in _ROUTE_FREEFORM_PARAMS:
+            name = _ROUTE_FREEFORM_PARAMS[previous]
+        elif segment.isdigit():
+            name = _ROUTE_PARAM_NAMES.get(previous, "id")
+        if name and name not in path_params:
+            path_params[name] = segment
+            parts.append("{" + name + "}")
+            previous = name
+        else:
+            parts.append(segment)
+            previous = segment
+    return "/" + "/".join(parts), path_params
 
-# Environment variable overrides
-config.DISCORD_API_BASE = os.getenv("DISCORD_API_BASE", config.DISCORD_API_BASE)
-config.REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", config.REQUEST_TIMEOUT))
+@dataclass
+class RateLimitInfo:
+    """Rate-limit state reported by Discord's X-RateLimit-* response headers."""
+    bucket: Optional[str] = None
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_after: Optional[float] = None
+    scope: Optional[str] = None
+    is_global: bool = False
+    
+    @classmethod
+    def from_headers(cls, headers: "httpx.Headers") -> Optional["RateLimitInfo"]:
+        """Parse rate-limit headers, or return None if the route sent none."""
+        if "x-ratelimit-limit" not in headers and "x-ratelimit-global" not in headers:
+            return None
+        try:
+            return cls(
+                bucket=headers.get("x-ratelimit-bucket"),
+                limit=int(headers["x-ratelimit-limit"]) if "x-ratelimit-limit" in headers else None,
+                remaining=int(headers["x-ratelimit-remaining"]) if "x-ratelimit-remaining" in headers else None,
+                reset_after=float(headers["x-ratelimit-reset-after"]) if "x-ratelimit-reset-after" in headers else None,
+                scope=headers.get("x-ratelimit-scope"),
+                is_global=headers.get("x-ratelimit-global", "").lower() == "true"
+            )
+        except ValueError:
+            return None
 
-# Bot token validation
-# Get bot token from environment variable (required)
-DISCORD_BOT_TOKEN = get_env("DISCORD_BOT_TOKEN")
+class RateLimitBucket:
+    """Client-side view of one Discord rate-limit bucket.
+    
+    Callers queue on the bucket in FIFO order. While the limits are unknown a
+    single request is let through to learn them; afterwards requests are
+    released as long as the bucket has capacity and otherwise wait for reset.
+    """
+    
+    # Responses whose reset times differ by more than this belong to a new window
+    WINDOW_TOLERANCE = 0.25
+    
+    def __init__(self, key: str, route_key: str = "", major: str = ""):
+        self.key = key
+        self.route_key = route_key
+        self.major = major
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        self.unlimited = False
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+        # Set once another bucket turned out to be the same Discord bucket; see merge_into()
+        self.merged_into: Optional["RateLimitBucket"] = None
+        self._rolled_over = False
+        self._queue = asyncio.Lock()
+        self._response: Optional[asyncio.Event] = None
+    
+    @property
+    def is_idle(self) -> bool:
+        return not self._queue.locked() and not self.in_flight and self.reset_at <= time.monotonic()
+    
+    async def _wait_for_response(self):
+        if self._response is None:
+            self._response = asyncio.Event()
+        await self._response.wait()
+    
+    async def acquire(self) -> float:
+        """Wait until a request may be sent on this bucket; return seconds waited."""
+        start = time.monotonic()
+        async with self._queue:
+            while not self.unlimited and self.merged_into is None:
+                if self.remaining is None:
+                    # Limits unknown: let one request through to learn them
+                    if not self.in_flight:
+                        break
+                    await self._wait_for_response()
+                    continue
+                
+                now = time.monotonic()
+                if now >= self.reset_at and not self._rolled_over:
+                    # The window has reset; the next response reports the new reset time
+                    self.remaining = self.limit
+                    self._rolled_over = True
+                if self.remaining > 0:
+                    self.remaining -= 1
+                    break
+                if now < self.reset_at:
+                    await asyncio.sleep(self.reset_at - now)
+                elif self.in_flight:
+                    await self._wait_for_response()
+                else:
+                    self._rolled_over = False
+            if self.merged_into is None:
+                self.in_flight += 1
+        if self.merged_into is not None:
+            # Queued here before the merge: wait on the shared bucket instead
+            await self.merged_into.acquire()
+        self.last_used = time.monotonic()
+        return self.last_used - start
+    
+    def try_acquire(self) -> bool:
+        """Take a request slot only if one is free right now, without queueing."""
+        if self.merged_into is not None:
+            return self.merged_into.try_acquire()
+        if self._queue.locked():
+            return False
+        if not self.unlimited:
+            if self.remaining is None or self.remaining <= 0 or time.monotonic() >= self.reset_at:
+                return False
+            self.remaining -= 1
+        self.in_flight += 1
+        self.last_used = time.monotonic()
+        return True
+    
+    def update(self, info: Optional[RateLimitInfo]):
+        """Record the limits reported by a response sent on this bucket."""
+        if self.merged_into is not None:
+            return self.merged_into.update(info)
+        self.release()
+        if info is None:
+            # Routes without rate-limit headers are not limited per bucket
+            self.unlimited = True
+        elif info.limit is not None and info.remaining is not None and info.reset_after is not None:
+            # Discord has not counted the requests still in flight yet
+            remaining = max(info.remaining - self.in_flight, 0)
+            reset_at = time.monotonic() + info.reset_after
+            if self.remaining is None or reset_at > self.reset_at + self.WINDOW_TOLERANCE:
+                self.remaining = remaining
+            else:
+                self.remaining = min(self.remaining, remaining)
+            self.limit = info.limit
+            self.reset_at = reset_at
+            self.unlimited = False
+            self._rolled_over = False
+    
+    def exhaust(self, retry_after: float):
+        """Mark the bucket empty until ``retry_after`` seconds from now."""
+        if self.merged_into is not None:
+            return self.merged_into.exhaust(retry_after)
+        self.remaining = 0
+        self.reset_at = max(self.reset_at, time.monotonic() + retry_after)
+        if self.limit is None:
+            self.limit = 1
+        self.unlimited = False
+        self._rolled_over = False
+    
+    def release(self):
+        """Mark one request sent on this bucket as finished and wake callers
+        waiting for its response."""
+        if self.merged_into is not None:
+            return self.merged_into.release()
+        self.in_flight = max(self.in_flight - 1, 0)
+        self._wake()
+    
+    def _wake(self):
+        if self._response is not None:
+            self._response.set()
+            self._response = None
+    
+    def merge_into(self, shared: "RateLimitBucket"):
+        """Hand this bucket over to ``shared``, which tracks the same Discord bucket.
+        
+        Requests in flight on this bucket now hold their slot on ``shared`` and
+        release it there; callers queued here are woken and wait on ``shared``,
+        so only one client-side bucket counts against the Discord bucket.
+        """
+        shared.in_flight += self.in_flight
+        self.in_flight = 0
+        if self.remaining is not None and (shared.remaining is None or self.reset_at > shared.reset_at):
+            # This bucket saw the more recent window
+            shared.limit, shared.remaining, shared.reset_at = self.limit, self.remaining, self.reset_at
+            shared.unlimited = False
+            shared._rolled_over = False
+        shared.last_used = max(shared.last_used, self.last_used)
+        self.merged_into = shared
+        self._wake()
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "bucket": self.key,
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_after": round(max(self.reset_at - time.monotonic(), 0.0), 3),
+            "in_flight": self.in_flight,
+            "queued": self._queue.locked()
+        }
 
-if not DISCORD_BOT_TOKEN.startswith("Bot "):
-    DISCORD_BOT_TOKEN = f"Bot {DISCORD_BOT_TOKEN}"
+class RateLimitManager:
+    """Maps (method, route, major parameters) to learned Discord rate-limit buckets."""
+    
+    # Idle buckets are dropped once more than this many are tracked
+    MAX_IDLE_BUCKETS = 1024
+    
+    def __init__(self):
+        self._route_buckets: Dict[str, str] = {}
+        self._buckets: Dict[str, RateLimitBucket] = {}
+    
+    def get_bucket(self, method: str, path: str) -> RateLimitBucket:
+        """Return the bucket a request to ``path`` is counted against."""
+        route, path_params = _parse_route(path)
+        route_key = f"{method.upper()} {route}"
+        major = ":".join(path_params[name] for name in _MAJOR_PARAMETERS if name in path_params)
+        key = f"{self._route_buckets.get(route_key, route_key)}:{major}"
+        
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_IDLE_BUCKETS:
+                self._prune()
+            bucket = self._buckets[key] = RateLimitBucket(key, route_key, major)
+        return bucket
+    
+    def update(self, bucket: RateLimitBucket, info: Optional[RateLimitInfo]):
+        """Apply response headers to ``bucket``, learning its Discord bucket hash."""
+        while bucket.merged_into is not None:
+            bucket = bucket.merged_into
+        if info is not None and info.bucket:
+            if self._route_buckets.get(bucket.route_key) != info.bucket:
+                self._route_buckets[bucket.route_key] = info.bucket
+                key = f"{info.bucket}:{bucket.major}"
+                shared = self._buckets.get(key)
+                self._buckets.pop(bucket.key, None)
+                if shared is None or shared is bucket:
+                    bucket.key = key
+                    self._buckets[key] = bucket
+                else:
+                    # Another route already maps to this bucket; it takes over this one's requests
+                    bucket.merge_into(shared)
+                    bucket = shared
+        bucket.update(info)
+    
+    def _prune(self):
+        for key in [k for k, b in self._buckets.items() if b.is_idle]:
+            del self._buckets[key]
+    
+    def status(self) -> List[Dict[str, Any]]:
+        return [b.status() for b in self._buckets.values() if b.limit is not None]
+
+class _PriorityLock:
+    """Lock handed to its waiters by priority class (see PRIORITY_CLASSES) instead of arrival order.
+    
+    As in RequestScheduler, a waiter is raised one class for every
+    PRIORITY_AGING seconds it has waited, and waiters of the same rank are
+    served in arrival order.
+    """
+    
+    def __init__(self):
+        self._locked = False
+        self._waiters: List[Tuple[int, float, asyncio.Future]] = []
+    
+    def locked(self) -> bool:
+        return self._locked
+    
+    async def acquire(self, priority: str):
+        if not self._locked and not self._waiters:
+            self._locked = True
+            return
+        entry = (PRIORITY_CLASSES.index(priority), time.monotonic(),
+                 asyncio.get_running_loop().create_future())
+        self._waiters.append(entry)
+        try:
+            await entry[2]
+        except asyncio.CancelledError:
+            if entry[2].done() and not entry[2].cancelled():
+                # Handed the lock just as the caller gave up
+                self.release()
+            else:
+                self._waiters.remove(entry)
+            raise
+    
+    def release(self):
+        self._locked = False
+        now = time.monotonic()
+        aging = config.PRIORITY_AGING
+        
+        def rank(entry) -> Tuple[float, float]:
+            index, enqueued, _ = entry
+            return (index - (now - enqueued) / aging if aging > 0 else index, enqueued)
+        
+        while self._waiters:
+            entry = min(self._waiters, key=rank)
+            self._waiters.remove(entry)
+            if not entry[2].done():
+                self._locked = True
+                entry[2].set_result(None)
+                return
+
+class GlobalRateLimiter:
+    """Sliding-window limit on requests per window across all routes.
+    
+    Requests waiting for a slot are let through by priority class, so once
+    the window is saturated urgent requests overtake queued bulk work.
+    """
+    
+    def __init__(self, max_requests: int, window: float):
+        self.max_requests = max_requests
+        self.window = window
+        self._sent: deque = deque()
+        self._queue = _PriorityLock()
+        self.paused_until = 0.0
+    
+    def _expire(self, now: float):
+        while self._sent and now - self._sent[0] >= self.window:
+            self._sent.popleft()
+    
+    async def acquire(self, priority: str = "read") -> float:
+        """Wait for a free slot in the window, queueing by ``priority``; return seconds waited."""
+        start = time.monotonic()
+        await self._queue.acquire(priority)
+        try:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._expire(now)
+                if len(self._sent) < self.max_requests:
+                    self._sent.append(now)
+                    break
+                await asyncio.sleep(self._sent[0] + self.window - now)
+        finally:
+            self._queue.release()
+        return time.monotonic() - start
+    
+    def try_acquire(self) -> bool:
+        """Take a slot only if the window has one free right now, without queueing."""
+        now = time.monotonic()
+        if self._queue.locked() or now < self.paused_until:
+            return False
+        self._expire(now)
+        if len(self._sent) >= self.max_requests:
+            return False
+        self._sent.append(now)
+        return True
+    
+    def pause(self, retry_after: float):
+        """Hold all requests back after Discord reported a global rate limit."""
+        self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+    
+    def status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._expire(now)
+        return {
+            "max_requests": self.max_requests,
+            "window": self.window,
+            "used": len(self._sent),
+            "paused_for": round(max(self.paused_until - now, 0.0), 3),
+            "queued": self._queue.locked()
+        }
 
-DEFAULT_HEADERS = {"Authorization": DISCORD_BOT_TOKEN, "Content-Type": "application/json"}
+class InvalidRequestTracker:
+    """Sliding-window count of 401/403/429 responses.
+    
+    Discord bans an IP that exceeds ``limit`` invalid requests per ``window``.
+    Past the slowdown threshold every request is delayed in proportion to how
+    much of the budget is used; at the limit requests wait for the window to
+    free up.
+    """
+    
+    INVALID_STATUSES = (401, 403, 429)
+    MAX_SLOWDOWN_DELAY = 1.0  # seconds, reached just below the limit
+    
+    def __init__(self, limit: int, window: float, slowdown: float):
+        self.limit = limit
+        self.window = window
+        self.slowdown = slowdown
+        self._events: deque = deque()
+    
+    def _expire(self, now: float):
+        while self._events and now - self._events[0] >= self.window:
+            self._events.popleft()
+    
+    def record(self, status: int, info: Optional[RateLimitInfo] = None):
+        """Count a response if Discord treats it as invalid."""
+        if status not in self.INVALID_STATUSES:
+            return
+        # 429s on shared resources are not counted against the invalid request limit
+        if status == 429 and info is not None and info.scope == "shared":
+            return
+        self._events.append(time.monotonic())
+    
+    def delay(self) -> float:
+        """Seconds to hold the next request back to protect the budget."""
+        now = time.monotonic()
+        self._expire(now)
+        used = len(self._events)
+        if used >= self.limit:
+            return self._events[used - self.limit] + self.window - now
+        threshold = self.limit * self.slowdown
+        if used < threshold:
+            return 0.0
+        return self.MAX_SLOWDOWN_DELAY * (used - threshold) / max(self.limit - threshold, 1)
+    
+    async def throttle(self) -> float:
+        """Sleep for the current slowdown delay; return seconds waited."""
+        delay = self.delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+    
+    def status(self) -> Dict[str, Any]:
+        delay = self.delay()
+        return {
+            "limit": self.limit,
+            "window": self.window,
+            "used": len(self._events),
+            "slowdown_threshold": int(self.limit * self.slowdown),
+            "current_delay": round(delay, 3)
+        }
+
+def _parse_retry_after(response: "httpx.Response", info: Optional[RateLimitInfo]) -> Tuple[float, bool]:
+    """Return (retry_after seconds, is_global) for a 429 response."""
+    retry_after, is_global = None, bool(info and info.is_global)
+    try:
+        body = _json_loads(response.content)
+        retry_after = float(body["retry_after"])
+        is_global = is_global or bool(body.get("global"))
+    except (ValueError, KeyError, TypeError):
+        pass
+    if retry_after is None:
+        try:
+            retry_after = float(response.headers.get("retry-after", ""))
+        except ValueError:
+            retry_after = info.reset_after if info and info.reset_after is not None else 1.0
+    return retry_after, is_global
+
+class BotProfile:
+    """A bot token served by this process, with the rate limit state Discord keeps per bot.
+    
+    Route buckets and the global limit are counted per bot token, so every
+    profile has its own; the connection pool, scheduler, circuit breakers and
+    the invalid request budget (counted per IP) are shared by all profiles.
+    """
+    
+    def __init__(self, name: str, authorization: str):
+        self.name = name
+        self.authorization = authorization
+        self.rate_limits = RateLimitManager()
+        self.global_limiter = GlobalRateLimiter(config.MAX_REQUESTS_PER_WINDOW, config.RATE_LIMIT_WINDOW)
+    
+    def auth_headers(self) -> Dict[str, str]:
+        """Headers identifying this bot: its token, or its name when requests go through the local proxy."""
+        if config.USE_DISCORD_PROXY:
+            headers = {PROXY_PROFILE_HEADER: self.name}
+            if config.PROXY_SECRET:
+                headers[PROXY_SECRET_HEADER] = config.PROXY_SECRET
+            return headers
+        return {"Authorization": self.authorization}
+    
+    def status(self) -> Dict[str, Any]:
+        return {"global": self.global_limiter.status(), "buckets": self.rate_limits.status()}
+
+# Bot profile named by the tool call being served; set by ProductionMCP
+_call_profile: ContextVar[Optional[str]] = ContextVar("discordbot_call_profile", default=None)
+
+# ---------------- DEADLINES ----------------
+# Monotonic time by which the tool call being served must finish; set by ProductionMCP
+_call_deadline: ContextVar[Optional[float]] = ContextVar("discordbot_call_deadline", default=None)
+
+class DeadlineExceededError(DiscordError):
+    """Raised when a tool call's deadline passes before Discord has answered."""
+    
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+        detail = f" of {timeout:.1f}s" if timeout is not None else ""
+        super().__init__(f"Deadline{detail} exceeded before Discord responded")
+
+def _time_remaining() -> Optional[float]:
+    """Seconds left before the current tool call's deadline, or None without one."""
+    deadline = _call_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+# ---------------- TRACING ----------------
+def _new_request_id() -> str:
+    """Random 64-bit id for a Discord API call, unique even under heavy concurrency."""
+    return f"req_{os.urandom(8).hex()}"
+
+# Span being recorded in the current task; child spans attach to it
+_current_span: ContextVar[Optional["Span"]] = ContextVar("discordbot_current_span", default=None)
+
+class Span:
+    """One timed operation of a traced tool call, in the shape of an OpenTelemetry span."""
+    
+    INTERNAL, SERVER, CLIENT = 1, 2, 3  # OTLP SpanKind values
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start_ns", "end_ns",
+                 "attributes", "error", "_trace")
+    
+    def __init__(self, name: str, parent: Optional["Span"] = None, kind: int = INTERNAL,
+                 start_ns: Optional[int] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        # Spans of the same trace share one list, exported when the root span ends
+        self._trace: List["Span"] = parent._trace if parent else []
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+    
+    def finish(self, end_ns: Optional[int] = None):
+        self.end_ns = end_ns or time.time_ns()
+        self._trace.append(self)
+        if self.parent_id is None:
+            span_exporter.export(self._trace)
+    
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 0}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def _start_span(name: str, kind: int = Span.INTERNAL, **attributes) -> Optional[Tuple[Span, Any]]:
+    """Open a span as the current one; returns None when tracing is off."""
+    if not config.TRACING_ENABLED:
+        return None
+    span = Span(name, _current_span.get(), kind, attributes=attributes)
+    return span, _current_span.set(span)
+
+def _end_span(started: Optional[Tuple[Span, Any]], error: Optional[BaseException] = None):
+    if started is None:
+        return
+    span, token = started
+    _current_span.reset(token)
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"
+    span.finish()
+
+@contextmanager
+def _span(name: str, kind: int = Span.INTERNAL, **attributes):
+    started = _start_span(name, kind, **attributes)
+    try:
+        yield
+    except BaseException as e:
+        _end_span(started, e)
+        started = None
+        raise
+    finally:
+        _end_span(started)
+
+def _record_span(name: str, start_ns: int, **attributes):
+    """Record a phase that started at ``start_ns`` and ends now under the current span."""
+    parent = _current_span.get()
+    if parent is not None:
+        Span(name, parent, start_ns=start_ns, attributes=attributes).finish()
+
+def _set_span_attributes(**attributes):
+    span = _current_span.get()
+    if span is not None:
+        span.attributes.update(attributes)
+
+class _HTTPPhaseTrace:
+    """httpx ``trace`` extension that records connect, TLS, server and body phases as spans.
+    
+    It tracks one request at a time; requests sent concurrently (a hedge and
+    its primary) each need their own.
+    """
+    
+    PHASES = {
+        "connect_tcp": "http.connect",
+        "connect_unix_socket": "http.connect",
+        "start_tls": "http.tls",
+        "receive_response_body": "http.receive_body"
+    }
+    
+    def __init__(self, **attributes):
+        self.started: Dict[str, int] = {}
+        # Added to every span recorded, e.g. to tell a hedge's phases apart
+        self.attributes = attributes
+    
+    async def __call__(self, event: str, info: Dict[str, Any]):
+        step, _, stage = event.rpartition(".")
+        step = step.rpartition(".")[2]
+        ended = stage in ("complete", "failed")
+        if step == "send_request_headers" and stage == "started":
+            # Server time runs from sending the request until its response headers arrive
+            self.started.setdefault("server", time.time_ns())
+        elif step == "receive_response_headers" and ended and "server" in self.started:
+            _record_span("http.server", self.started.pop("server"), **self.attributes)
+        elif step in self.PHASES:
+            if stage == "started":
+                self.started.setdefault(step, time.time_ns())
+            elif ended and step in self.started:
+                _record_span(self.PHASES[step], self.started.pop(step), **self.attributes)
+
+class SpanExporter:
+    """Exports finished traces as OTLP/JSON.
+    
+    Each trace is appended as one ``{"resourceSpans": [...]}`` line to
+    TRACE_EXPORT_PATH (the OpenTelemetry Collector file exporter format) and,
+    when OTLP_ENDPOINT is set, posted in batches to that OTLP/HTTP endpoint,
+    e.g. a collector's ``http://localhost:4318/v1/traces``.
+    
+    Neither blocks the event loop: file lines are queued and appended by a
+    background task in a worker thread, and posts run as background tasks.
+    """
+    
+    BATCH_SIZE = 256
+    FLUSH_INTERVAL = 5.0  # seconds
+    
+    def __init__(self, path: str, endpoint: str, service_name: str):
+        self.path = path
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._pending: List[Span] = []
+        # Encoded traces waiting for the file writer, with their span counts
+        self._lines: List[Tuple[bytes, int]] = []
+        self._writer: Optional[asyncio.Task] = None
+        self._last_flush = time.monotonic()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._posts: set = set()
+        self.exported = 0
+        self.failed = 0
+    
+    def _payload(self, spans: List[Span]) -> Dict[str, Any]:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+            "scopeSpans": [{"scope": {"name": "discordbot-mcp"}, "spans": [span.to_otlp() for span in spans]}]
+        }]}
+    
+    def export(self, spans: List[Span]):
+        if self.path:
+            self._lines.append((_json_dumps(self._payload(spans)) + b"\n", len(spans)))
+            if self._writer is None or self._writer.done():
+                try:
+                    self._writer = asyncio.get_running_loop().create_task(self._write_lines())
+                except RuntimeError:
+                    # No event loop to hand the write to
+                    lines = self._take_lines()
+                    self._count_written(lines, self._append(lines))
+        if self.endpoint:
+            self._pending.extend(spans)
+            if len(self._pending) >= self.BATCH_SIZE or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+                self.flush()
+    
+    def _take_lines(self) -> List[Tuple[bytes, int]]:
+        lines, self._lines = self._lines, []
+        return lines
+    
+    async def _write_lines(self):
+        """Append queued traces to TRACE_EXPORT_PATH in a worker thread until none are left."""
+        while self._lines:
+            lines = self._take_lines()
+            self._count_written(lines, await asyncio.to_thread(self._append, lines))
+    
+    def _append(self, lines: List[Tuple[bytes, int]]) -> Optional[OSError]:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(b"".join(line for line, _ in lines))
+        except OSError as e:
+            return e
+        return None
+    
+    def _count_written(self, lines: List[Tuple[bytes, int]], error: Optional[OSError]):
+        count = sum(spans for _, spans in lines)
+        if error is None:
+            self.exported += count
+        else:
+            self.failed += count
+            print(f"Warning: could not write traces to {self.path}: {error}", file=sys.stderr)
+    
+    def flush(self):
+        """Post the pending spans to OTLP_ENDPOINT in the background."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self._last_flush = time.monotonic()
+        try:
+            task = asyncio.get_running_loop().create_task(self._post(batch))
+        except RuntimeError:
+            self.failed += len(batch)
+            return
+        self._posts.add(task)
+        task.add_done_callback(self._posts.discard)
+    
+    async def _post(self, spans: List[Span]):
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10.0)
+        try:
+            response = await self._client.post(self.endpoint, content=_json_dumps(self._payload(spans)),
+                                               headers={"Content-Type": "application/json"})
+            response.raise_for_status()
+            self.exported += len(spans)
+        except httpx.HTTPError as e:
+            self.failed += len(spans)
+            print(f"Warning: could not export traces to {self.endpoint}: {e}", file=sys.stderr)
+    
+    async def close(self):
+        """Write and send what is still pending and close the exporter's connection."""
+        if self._writer is not None and not self._writer.done():
+            await self._writer
+        self.flush()
+        if self._posts:
+            await asyncio.gather(*self._posts, return_exceptions=True)
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+span_exporter = SpanExporter(config.TRACE_EXPORT_PATH, config.OTLP_ENDPOINT, config.TRACE_SERVICE_NAME)
+
+# ---------------- METRICS ----------------
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# name -> (type, help) of every metric the server records
+METRICS = {
+    "discordbot_tool_calls_total": ("counter", "Tool calls handled, by tool"),
+    "discordbot_tool_errors_total": ("counter", "Tool calls that failed or returned an error result, by tool and status"),
+    "discordbot_tool_duration_seconds": ("histogram", "Tool call latency, by tool"),
+    "discordbot_requests_total": ("counter", "Requests sent to Discord, by bot profile, route and status"),
+    "discordbot_request_phase_seconds": ("histogram", "Time spent per request in the queue, network and decode phases"),
+    "discordbot_rate_limit_wait_seconds": ("histogram", "Time requests waited on the route bucket, scheduler and global limit"),
+    "discordbot_rate_limited_total": ("counter", "429 responses received from Discord, by bot profile and scope"),
+    "discordbot_retries_total": ("counter", "Requests resent after a failed attempt, by failure kind"),
+    "discordbot_bytes_total": ("counter", "Request and response body bytes exchanged with Discord, by direction"),
+    "discordbot_cache_lookups_total": ("counter", "Lookups of cacheable reads, by result (memory, disk, miss, bypass, refresh)"),
+}
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+    
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by interpolating inside its bucket."""
+        if not self.count:
+            return None
+        rank, seen, lower = q * self.count, 0, 0.0
+        for upper, count in zip(LATENCY_BUCKETS, self.counts):
+            if count and seen + count >= rank:
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return LATENCY_BUCKETS[-1]
+    
+    def summary(self) -> Dict[str, Any]:
+        quantiles = {f"p{int(q * 100)}_ms": self.quantile(q) for q in (0.5, 0.95, 0.99)}
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 2) if self.count else None,
+            **{key: round(value * 1000, 2) if value is not None else None for key, value in quantiles.items()}
+        }
+
+class MetricsRegistry:
+    """In-process counters and latency histograms with Prometheus text exposition.
+    
+    Series are keyed by metric name and a tuple of (label, value) pairs, in
+    the order the call site passes them.
+    """
+    
+    def __init__(self):
+        self._counters: Dict[str, Dict[Tuple[Tuple[str, str], ...], float]] = {}
+        self._histograms: Dict[str, Dict[Tuple[Tuple[str, str], ...], _Histogram]] = {}
+    
+    def inc(self, name: str, value: float = 1, **labels):
+        if not config.METRICS_ENABLED:
+            return
+        series = self._counters.setdefault(name, {})
+        key = tuple(labels.items())
+        series[key] = series.get(key, 0) + value
+    
+    def observe(self, name: str, seconds: float, **labels):
+        if not config.METRICS_ENABLED:
+            return
+        series = self._histograms.setdefault(name, {})
+        key = tuple(labels.items())
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = _Histogram()
+        histogram.observe(seconds)
+    
+    def reset(self):
+        self._counters.clear()
+        self._histograms.clear()
+    
+    @staticmethod
+    def _labels(key: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+        pairs = []
+        for name, value in key:
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            pairs.append(f'{name}="{value}"')
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+    
+    def render_prometheus(self) -> str:
+        """All series in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            if kind == "counter" and name in self._counters:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for key, value in self._counters[name].items():
+                    lines.append(f"{name}{self._labels(key)} {value:g}")
+            elif kind == "histogram" and name in self._histograms:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for key, histogram in self._histograms[name].items():
+                    cumulative = 0
+                    for upper, count in zip(LATENCY_BUCKETS + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        bound = 'le="+Inf"' if upper == float("inf") else f'le="{upper:g}"'
+                        lines.append(f"{name}_bucket{self._labels(key, bound)} {cumulative}")
+                    lines.append(f"{name}_sum{self._labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{self._labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+    
+    def _counter_totals(self, name: str, label: str) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        for key, value in self._counters.get(name, {}).items():
+            group = dict(key).get(label, "")
+            totals[group] = totals.get(group, 0) + value
+        return totals
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-tool and per-phase summary of the recorded metrics."""
+        tools: Dict[str, Dict[str, Any]] = {}
+        for key, calls in self._counters.get("discordbot_tool_calls_total", {}).items():
+            tools[dict(key)["tool"]] = {"calls": int(calls), "errors": {}}
+        for key, count in self._counters.get("discordbot_tool_errors_total", {}).items():
+            labels = dict(key)
+            entry = tools.setdefault(labels["tool"], {"calls": 0, "errors": {}})
+            entry["errors"][labels["status"]] = int(count)
+        for key, histogram in self._histograms.get("discordbot_tool_duration_seconds", {}).items():
+            tools.setdefault(dict(key)["tool"], {"calls": 0, "errors": {}})["latency"] = histogram.summary()
+        return {
+            "enabled": config.METRICS_ENABLED,
+            "tools": dict(sorted(tools.items(), key=lambda item: -item[1]["calls"])),
+            "phases": {dict(key)["phase"]: histogram.summary()
+                       for key, histogram in self._histograms.get("discordbot_request_phase_seconds", {}).items()},
+            "rate_limit_waits": {dict(key)["limiter"]: histogram.summary()
+                                 for key, histogram in self._histograms.get("discordbot_rate_limit_wait_seconds", {}).items()},
+            "requests_by_status": self._counter_totals("discordbot_requests_total", "status"),
+            "requests_by_profile": self._counter_totals("discordbot_requests_total", "profile"),
+            "rate_limited": self._counter_totals("discordbot_rate_limited_total", "scope"),
+            "retries": self._counter_totals("discordbot_retries_total", "kind"),
+            "bytes": self._counter_totals("discordbot_bytes_total", "direction"),
+            "cache_lookups": self._counter_totals("discordbot_cache_lookups_total", "result")
+        }
+
+metrics = MetricsRegistry()
+
+async def _serve_metrics(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Answer ``GET /metrics`` on METRICS_PORT with the Prometheus exposition."""
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.split()
+        if len(parts) >= 2 and parts[0] == b"GET" and parts[1].split(b"?")[0] == b"/metrics":
+            status, body = "200 OK", metrics.render_prometheus().encode("utf-8")
+        else:
+            status, body = "404 Not Found", b"Not found\n"
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+# ---------------- RETRY POLICY ----------------
+class RetryPolicy:
+    """Classifies failed attempts and decides whether and when to retry them.
+    
+    Failures where the request never reached Discord are retried for every
+    method. Failures where Discord may already have acted on the request
+    (read timeouts, dropped connections, 5xx) are only retried for idempotent
+    methods, so a POST is never sent twice. Backoff uses decorrelated jitter
+    and all retries of a call share ``RETRY_BUDGET`` seconds.
+    """
+    
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    RETRYABLE_STATUSES = frozenset({500, 502, 503, 504})
+    
+    NOT_SENT = "not_sent"
+    CONNECTION_RESET = "connection_reset"
+    TIMEOUT = "timeout"
+    SERVER_ERROR = "server_error"
+    
+    def is_idempotent(self, method: str) -> bool:
+        return method.upper() in self.IDEMPOTENT_METHODS
+    
+    def classify_error(self, error: BaseException) -> Optional[str]:
+        """Return the failure kind of a transport error, or None if it is not retryable."""
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+            return self.NOT_SENT
+        if isinstance(error, (httpx.RemoteProtocolError, httpx.ReadError, httpx.WriteError)):
+            return self.CONNECTION_RESET
+        if isinstance(error, httpx.TimeoutException):
+            return self.TIMEOUT
+        return None
+    
+    def classify_response(self, response: httpx.Response) -> Optional[str]:
+        if response.status_code in self.RETRYABLE_STATUSES:
+            return self.SERVER_ERROR
+        return None
+    
+    def should_retry(self, kind: Optional[str], idempotent: bool) -> bool:
+        if kind is None:
+            return False
+        return kind == self.NOT_SENT or idempotent
+    
+    def next_delay(self, kind: str, attempt: int, previous: float) -> float:
+        """Decorrelated jitter: uniform between the base delay and 3x the previous one."""
+        if kind == self.CONNECTION_RESET and attempt == 0:
+            # Most likely a keep-alive connection that went stale while idle in
+            # the pool; it has been discarded, so resend at once on a fresh one.
+            return 0.0
+        base = config.RETRY_DELAY
+        return min(config.RETRY_MAX_DELAY, random.uniform(base, max(base, previous * 3)))
+
+# ---------------- CIRCUIT BREAKER ----------------
+def _route_group(route: str) -> str:
+    """Name the group of routes that share a circuit, e.g. "messages" or "guilds"."""
+    segments = route.strip("/").split("/")
+    if segments[0] == "interactions":
+        return "interactions"
+    if "webhooks" in segments:
+        return "webhooks"
+    if "messages" in segments or "pins" in segments:
+        return "messages"
+    return segments[0] or "root"
+
+class CircuitOpenError(DiscordError):
+    """Raised without contacting Discord while a route group's circuit is open."""
+    
+    def __init__(self, group: str, retry_after: float, failures: int):
+        super().__init__(f"Circuit open for '{group}' routes after {failures} consecutive failures; "
+                         f"retry in {retry_after:.1f}s")
+        self.group = group
+        self.retry_after = retry_after
+        self.failures = failures
+
+class CircuitBreaker:
+    """Stops sending requests to a route group that keeps failing.
+    
+    ``failure_threshold`` consecutive failed calls (timeouts, connection
+    errors, 5xx responses once retries are exhausted) open the circuit and calls fail at once with
+    CircuitOpenError. After ``reset_timeout`` seconds a single half-open probe
+    is let through: its success closes the circuit, its failure re-opens it.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, group: str, failure_threshold: int, reset_timeout: float):
+        self.group = group
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+        self.last_failure: Optional[str] = None
+    
+    def before_call(self) -> bool:
+        """Admit a call or raise CircuitOpenError; returns True for the half-open probe."""
+        if self.state == self.OPEN:
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.group, remaining, self.consecutive_failures)
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self.probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(self.group, 0.0, self.consecutive_failures)
+            self.probe_in_flight = True
+            return True
+        return False
+    
+    def end_probe(self):
+        """The probe call finished; if it recorded no outcome, allow another probe."""
+        self.probe_in_flight = False
+    
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.state = self.CLOSED
+    
+    def record_failure(self, kind: str):
+        self.consecutive_failures += 1
+        self.last_failure = kind
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+    
+    def status(self) -> Dict[str, Any]:
+        status = {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "times_opened": self.times_opened,
+            "rejected_calls": self.rejected,
+            "last_failure": self.last_failure
+        }
+        if self.state == self.OPEN:
+            status["probe_in"] = round(max(0.0, self.opened_at + self.reset_timeout - time.monotonic()), 3)
+        return status
+
+class CircuitBreakerRegistry:
+    """One CircuitBreaker per route group, created on first use."""
+    
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+    
+    def get(self, route: str) -> CircuitBreaker:
+        group = _route_group(route)
+        breaker = self._breakers.get(group)
+        if breaker is None:
+            breaker = self._breakers[group] = CircuitBreaker(group, config.CIRCUIT_FAILURE_THRESHOLD,
+                                                             config.CIRCUIT_RESET_TIMEOUT)
+        return breaker
+    
+    def reconfigure(self, failure_threshold: int, reset_timeout: float):
+        """Apply new thresholds to every route group's breaker without resetting its state."""
+        for breaker in self._breakers.values():
+            breaker.failure_threshold = failure_threshold
+            breaker.reset_timeout = reset_timeout
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": config.CIRCUIT_BREAKER_ENABLED,
+            "failure_threshold": config.CIRCUIT_FAILURE_THRESHOLD,
+            "reset_timeout": config.CIRCUIT_RESET_TIMEOUT,
+            "groups": {group: breaker.status() for group, breaker in sorted(self._breakers.items())}
+        }
+
+# ---------------- REQUEST HEDGING ----------------
+class LatencyTracker:
+    """Recent response latencies per route, used to decide when a GET is slow."""
+    
+    WINDOW = 200  # latest samples kept per route
+    MIN_SAMPLES = 50  # samples needed before a route is hedged
+    MIN_DELAY = 0.01  # never hedge sooner than this
+    
+    def __init__(self, percentile: float):
+        self.percentile = percentile
+        self._samples: Dict[str, deque] = {}
+    
+    def record(self, route_key: str, seconds: float):
+        samples = self._samples.get(route_key)
+        if samples is None:
+            samples = self._samples[route_key] = deque(maxlen=self.WINDOW)
+        samples.append(seconds)
+    
+    def hedge_delay(self, route_key: str) -> Optional[float]:
+        """Seconds after which a request on this route counts as slow, or None if unknown."""
+        samples = self._samples.get(route_key)
+        if samples is None or len(samples) < self.MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return max(ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))], self.MIN_DELAY)
+    
+    def status(self) -> Dict[str, Any]:
+        return {route_key: {"samples": len(samples), "hedge_after": round(self.hedge_delay(route_key) or 0.0, 4)}
+                for route_key, samples in sorted(self._samples.items())}
+
+class HedgeBudget:
+    """Caps hedged requests at ``ratio`` per request sent, with a small burst allowance."""
+    
+    BURST = 10.0
+    
+    def __init__(self, ratio: float):
+        self.ratio = ratio
+        self.tokens = self.BURST
+        self.sent = 0
+        self.won = 0
+        self.denied = 0
+    
+    def on_request(self):
+        self.tokens = min(self.BURST, self.tokens + self.ratio)
+    
+    def try_spend(self) -> bool:
+        if self.tokens < 1.0:
+            self.denied += 1
+            return False
+        self.tokens -= 1.0
+        self.sent += 1
+        return True
+    
+    def refund(self):
+        """Return a token whose hedge could not be sent."""
+        self.tokens = min(self.BURST, self.tokens + 1.0)
+        self.sent -= 1
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": config.HEDGING_ENABLED,
+            "budget_ratio": self.ratio,
+            "tokens": round(self.tokens, 2),
+            "hedges_sent": self.sent,
+            "hedges_won": self.won,
+            "denied_by_budget": self.denied
+        }
+
+# ---------------- REQUEST SCHEDULING ----------------
+# Priority classes, most urgent first
+PRIORITY_CLASSES = ("moderation", "interactive", "read", "bulk")
+
+# Tools whose calls do not get the default class: "read" for GET_/LIST_
+# tools and "interactive" for every other write.
+TOOL_PRIORITIES = {
+    # Moderation: stopping abuse must not wait behind anything else
+    "DISCORDBOT_BAN_USER_FROM_GUILD": "moderation",
+    "DISCORDBOT_BULK_BAN_USERS_FROM_GUILD": "moderation",
+    "DISCORDBOT_UNBAN_USER_FROM_GUILD": "moderation",
+    "DISCORDBOT_DELETE_GUILD_MEMBER": "moderation",
+    "DISCORDBOT_UPDATE_GUILD_MEMBER": "moderation",
+    "DISCORDBOT_ADD_GUILD_MEMBER_ROLE": "moderation",
+    "DISCORDBOT_DELETE_GUILD_MEMBER_ROLE": "moderation",
+    "DISCORDBOT_DELETE_MESSAGE": "moderation",
+    "DISCORDBOT_BULK_DELETE_MESSAGES": "moderation",
+    "DISCORDBOT_DELETE_USER_MESSAGE_REACTION": "moderation",
+    "DISCORDBOT_DELETE_ALL_MESSAGE_REACTIONS": "moderation",
+    "DISCORDBOT_DELETE_ALL_MESSAGE_REACTIONS_BY_EMOJI": "moderation",
+    "DISCORDBOT_SET_CHANNEL_PERMISSION_OVERWRITE": "moderation",
+    "DISCORDBOT_DELETE_CHANNEL_PERMISSION_OVERWRITE": "moderation",
+    "DISCORDBOT_DELETE_THREAD_MEMBER": "moderation",
+    "DISCORDBOT_CREATE_AUTO_MODERATION_RULE": "moderation",
+    "DISCORDBOT_UPDATE_AUTO_MODERATION_RULE": "moderation",
+    "DISCORDBOT_DELETE_AUTO_MODERATION_RULE": "moderation",
+    "DISCORDBOT_INVITE_REVOKE": "moderation",
+    # Bulk: large crawls, uploads and guild-wide jobs
+    "DISCORDBOT_LIST_GUILD_MEMBERS": "bulk",
+    "DISCORDBOT_LIST_GUILD_BANS": "bulk",
+    "DISCORDBOT_LIST_PUBLIC_ARCHIVED_THREADS": "bulk",
+    "DISCORDBOT_LIST_PRIVATE_ARCHIVED_THREADS": "bulk",
+    "DISCORDBOT_LIST_MY_PRIVATE_ARCHIVED_THREADS": "bulk",
+    "DISCORDBOT_PRUNE_GUILD": "bulk",
+    "DISCORDBOT_PREVIEW_PRUNE_GUILD": "bulk",
+    "DISCORDBOT_CREATE_GUILD_EMOJI": "bulk",
+    "DISCORDBOT_CREATE_GUILD_STICKER": "bulk",
+    "DISCORDBOT_CREATE_GUILD_FROM_TEMPLATE": "bulk",
+    "DISCORDBOT_CREATE_GUILD_TEMPLATE": "bulk",
+    "DISCORDBOT_SYNC_GUILD_TEMPLATE": "bulk",
+    "DISCORDBOT_PUT_GUILDS_ONBOARDING": "bulk",
+}
+
+# (priority class, flow) of the tool call being served; set by ProductionMCP
+_call_priority: ContextVar[Optional[Tuple[str, str]]] = ContextVar("discordbot_call_priority", default=None)
+
+def tool_priority(tool: str) -> str:
+    """Default priority class of a tool's requests."""
+    if tool in TOOL_PRIORITIES:
+        return TOOL_PRIORITIES[tool]
+    name = tool[len("DISCORDBOT_"):] if tool.startswith("DISCORDBOT_") else tool
+    if name.startswith(("GET_", "LIST_", "SEARCH_", "VIEW_")):
+        return "read"
+    return "interactive"
+
+def _validate_priority(priority: str) -> str:
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"priority must be one of {', '.join(PRIORITY_CLASSES)}")
+    return priority
+
+class RequestScheduler:
+    """Admits outbound requests by priority class once ``max_concurrency`` are in flight.
+    
+    Within a class, waiting flows (one per tool) are served round-robin so a
+    single busy tool cannot monopolise its class. A waiting request is raised
+    one class for every PRIORITY_AGING seconds it has queued, so bulk work
+    still makes progress under a steady stream of urgent calls.
+    """
+    
+    def __init__(self, max_concurrency: int, aging: float):
+        self.max_concurrency = max(1, max_concurrency)
+        self.aging = aging
+        self.active = 0
+        # Per class: flow -> FIFO of (enqueued at, future); dict order is the round-robin turn
+        self._queues: List["OrderedDict[str, deque]"] = [OrderedDict() for _ in PRIORITY_CLASSES]
+        self.admitted = {name: 0 for name in PRIORITY_CLASSES}
+        self.queued = {name: 0 for name in PRIORITY_CLASSES}
+        self.aged = 0
+    
+    def _waiting(self) -> int:
+        return sum(len(waiters) for flows in self._queues for waiters in flows.values())
+    
+    async def acquire(self, priority: str, flow: str) -> float:
+        """Take a request slot, queueing by priority when none is free. Returns seconds waited."""
+        index = PRIORITY_CLASSES.index(priority)
+        if self.active < self.max_concurrency and not self._waiting():
+            self.active += 1
+            self.admitted[priority] += 1
+            return 0.0
+        
+        started = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (started, waiter)
+        self._queues[index].setdefault(flow, deque()).append(entry)
+        self.queued[priority] += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as the caller gave up
+                self.release()
+            else:
+                waiters = self._queues[index].get(flow)
+                if waiters is not None and entry in waiters:
+                    waiters.remove(entry)
+                    if not waiters:
+                        del self._queues[index][flow]
+            raise
+        self.admitted[priority] += 1
+        return time.monotonic() - started
+    
+    def release(self):
+        self.active -= 1
+        self._dispatch()
+    
+    def _dispatch(self):
+        now = time.monotonic()
+        while self.active < self.max_concurrency:
+            best, best_rank = None, None
+            for index, flows in enumerate(self._queues):
+                if not flows:
+                    continue
+                oldest = min(waiters[0][0] for waiters in flows.values())
+                rank = index - (now - oldest) / self.aging if self.aging > 0 else index
+                if best_rank is None or rank < best_rank:
+                    best, best_rank = index, rank
+            if best is None:
+                return
+            if any(self._queues[:best]):
+                # Served ahead of a more urgent class because it waited longer
+                self.aged += 1
+            flows = self._queues[best]
+            flow, waiters = next(iter(flows.items()))
+            _, waiter = waiters.popleft()
+            if waiters:
+                flows.move_to_end(flow)
+            else:
+                del flows[flow]
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": config.SCHEDULER_ENABLED,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.active,
+            "aging_seconds": self.aging,
+            "waiting": {name: sum(len(w) for w in self._queues[i].values())
+                        for i, name in enumerate(PRIORITY_CLASSES)},
+            "admitted": dict(self.admitted),
+            "queued": dict(self.queued),
+            "promoted_by_aging": self.aged
+        }
 
 # ---------------- PRODUCTION HTTP CLIENT ----------------
 class ProductionHTTPClient:
-    """Production-ready HTTP client with connection pooling and retry logic."""
+    """Production-ready HTTP client with connection pooling, rate limiting and retry logic."""
+    
+    # Settings baked into the httpx client; changing one builds a new connection pool
+    POOL_SETTINGS = ("CONNECTION_POOL_SIZE", "MAX_KEEPALIVE_CONNECTIONS", "KEEPALIVE_EXPIRY",
+                     "REQUEST_TIMEOUT", "HTTP2_ENABLED", "HTTP2_PRIOR_KNOWLEDGE")
     
     def __init__(self):
         self.client: Optional[httpx.AsyncClient] = None
         self._lock = asyncio.Lock()
+        # Requests using each client; a client replaced by rebuild_pool() is closed when its count drops to 0
+        self._leases: Dict[httpx.AsyncClient, int] = {}
+        self._retired: set = set()
+        self._closing: set = set()
+        self.pools_built = 0
+        self.profiles = {name: BotProfile(name, authorization) for name, authorization in BOT_TOKENS.items()}
+        self.retry_policy = RetryPolicy()
+        self.circuits = CircuitBreakerRegistry()
+        self.latencies = LatencyTracker(config.HEDGE_PERCENTILE)
+        self.hedge_budget = HedgeBudget(config.HEDGE_BUDGET)
+        self.scheduler = RequestScheduler(self._scheduler_concurrency(), config.PRIORITY_AGING)
+        self.invalid_requests = InvalidRequestTracker(config.INVALID_REQUEST_LIMIT,
+                                                      config.INVALID_REQUEST_WINDOW,
+                                                      config.INVALID_REQUEST_SLOWDOWN)
     
     async def __aenter__(self):
         await self._ensure_client()
@@ -107,13 +1861,14 @@ class ProductionHTTPClient:
         await self.close()
     
     async def _ensure_client(self):
-        """Ensure HTTP client is initialized."""
-        if self.client is None:
+        """Ensure HTTP client is initialized (or re-opened after a close)."""
+        if self.client is None or self.client.is_closed:
             async with self._lock:
-                if self.client is None:
+                if self.client is None or self.client.is_closed:
                     limits = httpx.Limits(
                         max_keepalive_connections=config.MAX_KEEPALIVE_CONNECTIONS,
-                        max_connections=config.CONNECTION_POOL_SIZE
+                        max_connections=config.CONNECTION_POOL_SIZE,
+                        keepalive_expiry=config.KEEPALIVE_EXPIRY
                     )
                     
                     timeout = httpx.Timeout(
@@ -123,43 +1878,1553 @@ class ProductionHTTPClient:
                         pool=5.0
                     )
                     
+                    http2 = self._http2_available()
+                    http1 = not (http2 and config.HTTP2_PRIOR_KNOWLEDGE)
+                    transport = None
+                    if config.DISCORD_API_SOCKET:
+                        transport = httpx.AsyncHTTPTransport(uds=config.DISCORD_API_SOCKET, limits=limits,
+                                                             http1=http1, http2=http2)
+                    self.pools_built += 1
                     self.client = httpx.AsyncClient(
                         limits=limits,
                         timeout=timeout,
                         headers=DEFAULT_HEADERS,
-                        follow_redirects=True
+                        follow_redirects=True,
+                        http1=http1,
+                        http2=http2,
+                        transport=transport
                     )
     
-    async def request_with_retry(self, method: str, url: str, **kwargs) -> httpx.Response:
-        """Make HTTP request with retry logic."""
+    def _lease(self) -> httpx.AsyncClient:
+        """Borrow the current client for one call; hand it back with _return_lease()."""
+        client = self.client
+        self._leases[client] = self._leases.get(client, 0) + 1
+        return client
+    
+    def _return_lease(self, client: httpx.AsyncClient):
+        self._leases[client] -= 1
+        if not self._leases[client]:
+            del self._leases[client]
+            if client in self._retired:
+                self._retire(client)
+    
+    def _retire(self, client: httpx.AsyncClient):
+        """Close a replaced client once no call is using it any more."""
+        if self._leases.get(client):
+            self._retired.add(client)
+            return
+        self._retired.discard(client)
+        task = asyncio.get_running_loop().create_task(client.aclose())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+    
+    async def rebuild_pool(self):
+        """Replace the connection pool with one built from the current config.
+        
+        New calls use the new pool right away; calls already in flight keep
+        their connections (including for retries and hedges) and the old pool
+        is closed when the last of them finishes.
+        """
+        async with self._lock:
+            old, self.client = self.client, None
+        if old is not None and not old.is_closed:
+            self._retire(old)
         await self._ensure_client()
+    
+    async def reconfigure(self, changed: List[str]) -> List[str]:
+        """Apply changed config settings to the live limiters, scheduler and pool.
+        
+        Limits are updated in place, so queued and in-flight requests keep their
+        place; retry settings are read from config on every call and need
+        nothing. Returns the names of the components that were updated.
+        """
+        changed = set(changed)
+        updated = []
+        if changed & {"MAX_REQUESTS_PER_WINDOW", "RATE_LIMIT_WINDOW"}:
+            for profile in self.profiles.values():
+                profile.global_limiter.max_requests = config.MAX_REQUESTS_PER_WINDOW
+                profile.global_limiter.window = config.RATE_LIMIT_WINDOW
+            updated.append("global_rate_limit")
+        if changed & {"INVALID_REQUEST_LIMIT", "INVALID_REQUEST_WINDOW", "INVALID_REQUEST_SLOWDOWN"}:
+            self.invalid_requests.limit = config.INVALID_REQUEST_LIMIT
+            self.invalid_requests.window = config.INVALID_REQUEST_WINDOW
+            self.invalid_requests.slowdown = config.INVALID_REQUEST_SLOWDOWN
+            updated.append("invalid_request_budget")
+        if changed & {"SCHEDULER_MAX_CONCURRENCY", "PRIORITY_AGING", "CONNECTION_POOL_SIZE"}:
+            self.scheduler.max_concurrency = self._scheduler_concurrency()
+            self.scheduler.aging = config.PRIORITY_AGING
+            # Admit waiters into any slots a higher limit has opened
+            self.scheduler._dispatch()
+            updated.append("scheduler")
+        if changed & {"CIRCUIT_FAILURE_THRESHOLD", "CIRCUIT_RESET_TIMEOUT"}:
+            self.circuits.reconfigure(config.CIRCUIT_FAILURE_THRESHOLD, config.CIRCUIT_RESET_TIMEOUT)
+            updated.append("circuit_breakers")
+        if changed & {"HEDGE_PERCENTILE", "HEDGE_BUDGET"}:
+            self.latencies.percentile = config.HEDGE_PERCENTILE
+            self.hedge_budget.ratio = config.HEDGE_BUDGET
+            updated.append("hedging")
+        if changed & set(self.POOL_SETTINGS):
+            await self.rebuild_pool()
+            updated.append("connection_pool")
+        return updated
+    
+    @staticmethod
+    def _scheduler_concurrency() -> int:
+        """Scheduler slots: by default as many as the pool has connections, so it only queues when the pool would."""
+        return config.SCHEDULER_MAX_CONCURRENCY or config.CONNECTION_POOL_SIZE
+    
+    @staticmethod
+    def _http2_available() -> bool:
+        """Whether HTTP/2 is enabled and httpx's optional 'h2' dependency is installed.
+        
+        Over TLS httpx negotiates HTTP/2 through ALPN and falls back to HTTP/1.1
+        per connection when the server does not offer it.
+        """
+        if not config.HTTP2_ENABLED:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            print("Warning: HTTP2_ENABLED is set but 'h2' is not installed, using HTTP/1.1. "
+                  "Install with: pip install httpx[http2]", file=sys.stderr)
+            return False
+        return True
+    
+    async def _send(self, client: httpx.AsyncClient, profile: BotProfile, bucket: RateLimitBucket,
+                    deadline: float, priority: Tuple[str, str], method: str, url: str,
+                    **kwargs) -> httpx.Response:
+        """Send one request through the rate limiters, waiting out 429 responses.
+        
+        ``bucket`` and the global limit are those of the bot ``profile`` whose
+        token the request carries. Once the route bucket has room, the request queues in the scheduler
+        under its ``(priority class, flow)`` for one of the shared slots in
+        front of the global limit, which again lets waiters through by class.
         
-        last_exception = None
-        for attempt in range(config.MAX_RETRIES + 1):
+        A 429 pauses the route bucket (or every route, for a global limit) for
+        ``retry_after`` and the request is queued again, as long as that fits
+        before ``deadline``; otherwise DiscordRateLimitError is raised.
+        
+        The httpx timeout is cut to what is left of the tool call's deadline;
+        running out of it raises DeadlineExceededError.
+        """
+        timeout = kwargs.get("timeout")
+        traced = _current_span.get() is not None
+        if traced:
+            kwargs["extensions"] = {**kwargs.get("extensions", {}), "trace": _HTTPPhaseTrace()}
+        while True:
+            waited = time.time_ns()
+            bucket_wait = await bucket.acquire()
+            metrics.observe("discordbot_rate_limit_wait_seconds", bucket_wait, limiter="bucket")
+            if traced:
+                _record_span("ratelimit.bucket_wait", waited, **{"discord.bucket": bucket.key})
+            scheduled = False
             try:
-                response = await self.client.request(method, url, **kwargs)
+                queue_wait = 0.0
+                if config.SCHEDULER_ENABLED:
+                    waited = time.time_ns()
+                    queue_wait = await self.scheduler.acquire(*priority)
+                    scheduled = True
+                    metrics.observe("discordbot_rate_limit_wait_seconds", queue_wait, limiter="scheduler")
+                    if traced:
+                        _record_span("scheduler.queue_wait", waited, **{"discord.priority": priority[0]})
+                waited = time.time_ns()
+                global_wait = await self.invalid_requests.throttle() + await profile.global_limiter.acquire(priority[0])
+                metrics.observe("discordbot_rate_limit_wait_seconds", global_wait, limiter="global")
+                metrics.observe("discordbot_request_phase_seconds", bucket_wait + queue_wait + global_wait,
+                                phase="queue")
+                if traced:
+                    _record_span("ratelimit.global_wait", waited)
+                remaining = _time_remaining()
+                if remaining is not None:
+                    if remaining <= 0:
+                        raise DeadlineExceededError()
+                    kwargs["timeout"] = min(timeout, remaining) if timeout else remaining
+                    if config.USE_DISCORD_PROXY:
+                        # Lets the proxy drop the request once this call has given up on it
+                        kwargs["headers"] = {**kwargs["headers"], PROXY_TIMEOUT_HEADER: f"{remaining:.3f}"}
+                try:
+                    sent = time.monotonic()
+                    response = await self._request(client, profile, bucket, method, url, **kwargs)
+                    metrics.observe("discordbot_request_phase_seconds", time.monotonic() - sent, phase="network")
+                except httpx.TimeoutException as e:
+                    if remaining is not None and kwargs["timeout"] == remaining:
+                        raise DeadlineExceededError() from e
+                    raise
+            except BaseException:
+                bucket.release()
+                raise
+            finally:
+                if scheduled:
+                    self.scheduler.release()
+            info = RateLimitInfo.from_headers(response.headers)
+            profile.rate_limits.update(bucket, info)
+            self.invalid_requests.record(response.status_code, info)
+            metrics.inc("discordbot_requests_total", profile=profile.name, route=bucket.route_key,
+                        status=response.status_code)
+            metrics.inc("discordbot_bytes_total", int(response.request.headers.get("Content-Length", 0)),
+                        direction="out")
+            metrics.inc("discordbot_bytes_total", len(response.content), direction="in")
+            if response.status_code != 429:
                 return response
+            
+            retry_after, is_global = _parse_retry_after(response, info)
+            metrics.inc("discordbot_rate_limited_total", profile=profile.name,
+                        scope="global" if is_global else (info.scope if info and info.scope else "user"))
+            if is_global:
+                profile.global_limiter.pause(retry_after)
+            else:
+                bucket.exhaust(retry_after)
+            if time.monotonic() + retry_after > deadline:
+                raise DiscordRateLimitError(retry_after, is_global, info.scope if info else None, bucket.key)
+    
+    async def _request(self, client: httpx.AsyncClient, profile: BotProfile, bucket: RateLimitBucket,
+                       method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request that already holds a slot on ``bucket``, hedging slow GETs.
+        
+        When a GET has not answered within its route's HEDGE_PERCENTILE latency,
+        a second copy is sent on another pooled connection if the hedge budget,
+        the bucket and the global limit all have room right now; the first
+        successful response wins and the other request is cancelled.
+        """
+        if not config.HEDGING_ENABLED or method.upper() != "GET":
+            return await client.request(method, url, **kwargs)
+        
+        started = time.monotonic()
+        self.hedge_budget.on_request()
+        delay = self.latencies.hedge_delay(bucket.route_key)
+        primary = asyncio.ensure_future(client.request(method, url, **kwargs))
+        hedge = None
+        try:
+            if delay is not None:
+                await asyncio.wait({primary}, timeout=delay)
+            if not primary.done() and delay is not None and self._take_hedge_slot(profile, bucket):
+                extensions = kwargs.get("extensions", {})
+                if "trace" in extensions:
+                    # The hedge runs alongside the primary, so it records its phases on its own trace
+                    trace = _HTTPPhaseTrace(**{"discord.hedge": True})
+                    kwargs = {**kwargs, "extensions": {**extensions, "trace": trace}}
+                hedge = asyncio.ensure_future(client.request(method, url, **kwargs))
+                try:
+                    winner = await self._first_success(primary, hedge)
+                finally:
+                    # The losing request's slot; the winner's is released by the caller
+                    bucket.release()
+                if winner is hedge:
+                    self.hedge_budget.won += 1
+                response = winner.result()
+            else:
+                response = await primary
+            self.latencies.record(bucket.route_key, time.monotonic() - started)
+            return response
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+    
+    def _take_hedge_slot(self, profile: BotProfile, bucket: RateLimitBucket) -> bool:
+        """Reserve budget, bucket and global capacity for a hedge without waiting."""
+        if not self.hedge_budget.try_spend():
+            return False
+        if bucket.try_acquire():
+            if profile.global_limiter.try_acquire():
+                return True
+            bucket.release()
+        self.hedge_budget.refund()
+        return False
+    
+    @staticmethod
+    async def _first_success(primary: "asyncio.Future", hedge: "asyncio.Future") -> "asyncio.Future":
+        """Wait for the first of two requests to succeed; raise the primary's error if both fail."""
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None:
+                    return task
+        return primary
+    
+    async def request_with_retry(self, method: str, url: str, idempotent: Optional[bool] = None,
+                                 priority: Optional[str] = None, profile: Optional[str] = None,
+                                 **kwargs) -> httpx.Response:
+        """Make HTTP request with per-route rate limiting and retry logic.
+        
+        The request is sent with the token of bot ``profile`` (the tool call's
+        profile, or DEFAULT_BOT_PROFILE) and counts against that bot's route
+        buckets and global limit.
+        
+        ``idempotent`` overrides the method-based default, e.g. for a POST that
+        Discord deduplicates by nonce and is therefore safe to resend.
+        
+        ``priority`` overrides the scheduling class of the tool call being
+        served (see TOOL_PRIORITIES); outside a tool call GETs are "read" and
+        other methods "interactive".
+        
+        Raises CircuitOpenError without sending anything while the circuit of
+        the route's group is open.
+        
+        Retries and backoff sleeps stop at the deadline of the tool call being
+        served, raising DeadlineExceededError; a cancelled call aborts its
+        queued, sleeping or in-flight request right away.
+        """
+        bot = self.profile(profile or _call_profile.get())
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), **bot.auth_headers()}
+        await self._ensure_client()
+        path = httpx.URL(url).path
+        bucket = bot.rate_limits.get_bucket(method, path)
+        breaker = self.circuits.get(_parse_route(path)[0]) if config.CIRCUIT_BREAKER_ENABLED else None
+        probe = breaker.before_call() if breaker else False
+        started = time.monotonic()
+        deadline = started + config.RATE_LIMIT_MAX_WAIT
+        call_deadline = _call_deadline.get()
+        if call_deadline is not None:
+            deadline = min(deadline, call_deadline)
+        if idempotent is None:
+            idempotent = self.retry_policy.is_idempotent(method)
+        call_class, flow = _call_priority.get() or (None, method.upper())
+        # Bots take turns too: a flow is one tool of one bot
+        priority = (_validate_priority(priority or call_class or
+                                       ("read" if method.upper() == "GET" else "interactive")), f"{bot.name}/{flow}")
+        if config.USE_DISCORD_PROXY:
+            # The proxy schedules requests from every MCP server it serves by this class
+            kwargs["headers"][PROXY_PRIORITY_HEADER] = priority[0]
+        
+        delay = 0.0
+        attempt = 0
+        # Kind of the last failed attempt; the breaker gets one outcome per call, not per attempt
+        failure = None
+        recorded = False
+        client = self._lease()
+        try:
+            while True:
+                response, error = None, None
+                try:
+                    with _span("attempt", **{"http.request.resend_count": attempt}):
+                        response = await self._send(client, bot, bucket, deadline, priority, method, url, **kwargs)
+                        _set_span_attributes(**{"http.response.status_code": response.status_code})
+                    kind = self.retry_policy.classify_response(response)
+                except (DiscordRateLimitError, DeadlineExceededError):
+                    raise
+                except Exception as e:
+                    error = e
+                    kind = self.retry_policy.classify_error(e)
                 
-            except Exception as e:
-                last_exception = e
+                retry = attempt < config.MAX_RETRIES and self.retry_policy.should_retry(kind, idempotent)
+                if retry:
+                    delay = self.retry_policy.next_delay(kind, attempt, delay)
+                    retry = time.monotonic() - started + delay <= config.RETRY_BUDGET
+                    # No point sleeping past the caller's deadline
+                    retry = retry and (call_deadline is None or time.monotonic() + delay < call_deadline)
+                    # Stop retrying into a circuit that has just opened
+                    retry = retry and (breaker is None or breaker.state == CircuitBreaker.CLOSED)
+                if not retry:
+                    if breaker is not None:
+                        recorded = True
+                        if kind is not None:
+                            breaker.record_failure(kind)
+                        elif error is None:
+                            breaker.record_success()
+                    if error is not None:
+                        raise error
+                    return response
                 
-                if attempt < config.MAX_RETRIES:
-                    delay = config.RETRY_DELAY * (2 ** attempt)  # Exponential backoff
-                    await asyncio.sleep(delay)
+                failure = kind
+                metrics.inc("discordbot_retries_total", kind=kind)
+                waited = time.time_ns()
+                await asyncio.sleep(delay)
+                _record_span("retry.backoff", waited, **{"retry.kind": kind})
+                attempt += 1
+        finally:
+            if breaker is not None and not recorded and failure is not None:
+                # Gave up on the retries (deadline, rate limit, cancellation) after a failed attempt
+                breaker.record_failure(failure)
+            self._return_lease(client)
+            if probe:
+                breaker.end_probe()
+    
+    async def warm(self, count: int, path: str, timeout: float) -> List[float]:
+        """Send ``count`` concurrent GETs of ``path`` so that many pooled connections are open and live.
+        
+        Sending them at once makes the pool use (or open) that many
+        connections; idle connections the server has dropped are discarded
+        and replaced along the way. The probes are sent without a token, except
+        through the local proxy, which only serves requests naming a profile and
+        carrying its secret; they go as the default bot there. They respect the
+        default bot's global limit but skip route buckets, which would serialise
+        them. Returns each probe's latency in seconds and raises the first failure.
+        """
+        default = self.profiles.get(config.DEFAULT_BOT_PROFILE) or next(iter(self.profiles.values()))
+        limiter = default.global_limiter
+        headers = default.auth_headers() if config.USE_DISCORD_PROXY else {}
+        await self._ensure_client()
+        client = self._lease()
+        url = f"{config.DISCORD_API_BASE}{path}"
+        
+        async def probe() -> float:
+            await limiter.acquire()
+            started = time.monotonic()
+            response = await client.get(url, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            return time.monotonic() - started
         
-        raise last_exception
+        try:
+            return list(await asyncio.gather(*(probe() for _ in range(max(1, count)))))
+        finally:
+            self._return_lease(client)
+    
+    def pool_status(self) -> Dict[str, int]:
+        """Open and idle connections in the pool, as far as httpcore exposes them."""
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", None) or [])
+        return {
+            "max_connections": config.CONNECTION_POOL_SIZE,
+            "open": len(connections),
+            "idle": sum(1 for connection in connections if connection.is_idle()),
+            "pools_built": self.pools_built,
+            "retired_pools_draining": len(self._retired)
+        }
+    
+    def profile(self, name: Optional[str] = None) -> BotProfile:
+        """Bot profile ``name`` (DEFAULT_BOT_PROFILE if None); raises ValueError for an unknown profile."""
+        name = (name or config.DEFAULT_BOT_PROFILE).lower()
+        if name not in self.profiles and config.USE_DISCORD_PROXY and re.fullmatch(r"[a-z0-9_-]{1,64}", name):
+            # Tokens live in the proxy, which rejects profiles it does not know
+            self.profiles[name] = BotProfile(name, "")
+        if name not in self.profiles:
+            raise ValueError(f"Unknown bot profile '{name}'; configured profiles: {', '.join(sorted(self.profiles))}")
+        return self.profiles[name]
+    
+    def rate_limit_status(self) -> Dict[str, Any]:
+        """Snapshot of each bot's global limiter and route buckets and the shared invalid request budget."""
+        return {
+            "profiles": {name: profile.status() for name, profile in sorted(self.profiles.items())},
+            "invalid_requests": self.invalid_requests.status(),
+            "hedging": {**self.hedge_budget.status(), "routes": self.latencies.status()},
+            "scheduler": self.scheduler.status()
+        }
     
     async def close(self):
-        """Close HTTP client."""
+        """Close HTTP client, including replaced pools that are still draining."""
         if self.client:
-            await self.client.aclose()
-            self.client = None
-
-# Global HTTP client instance
+            client, self.client = self.client, None
+            await client.aclose()
+        for client in list(self._retired):
+            self._retired.discard(client)
+            await client.aclose()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+# Global HTTP client instance, shared by every tool call for the server's lifetime
 http_client = ProductionHTTPClient()
 
+# ---------------- HEALTH CHECK ----------------
+class HealthMonitor:
+    """Background task that keeps the connection pool warm and probes Discord's API.
+    
+    At startup PREWARM_CONNECTIONS connections are opened with concurrent
+    GET /gateway probes, so the first tool call does not pay for DNS, TCP
+    and TLS setup. Every HEALTH_CHECK_INTERVAL seconds the probes are sent
+    again: they replace connections that died while idle before a real call
+    picks them up, and their outcome is the reported health. Keep the
+    interval below KEEPALIVE_EXPIRY for idle connections to stay open.
+    """
+    
+    PROBE_PATH = "/gateway"
+    PROBE_TIMEOUT = 5.0  # seconds
+    UNHEALTHY_AFTER = 3  # consecutive failed checks
+    
+    def __init__(self, client: ProductionHTTPClient):
+        self.client = client
+        self._task: Optional[asyncio.Task] = None
+        self.checks = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_check: Optional[float] = None
+        self.last_latency: Optional[float] = None
+        self.last_error: Optional[str] = None
+    
+    @property
+    def state(self) -> str:
+        if self.last_check is None:
+            return "unknown"
+        if self.consecutive_failures >= self.UNHEALTHY_AFTER:
+            return "unhealthy"
+        return "degraded" if self.consecutive_failures else "healthy"
+    
+    def start(self):
+        if config.HEALTH_CHECK_ENABLED and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    
+    async def _run(self):
+        while True:
+            await self.check(config.PREWARM_CONNECTIONS)
+            if config.HEALTH_CHECK_INTERVAL <= 0:
+                return
+            await asyncio.sleep(config.HEALTH_CHECK_INTERVAL)
+    
+    async def check(self, connections: int = 1) -> Dict[str, Any]:
+        """Probe Discord over ``connections`` pooled connections and record the outcome."""
+        self.checks += 1
+        try:
+            latencies = await self.client.warm(connections, self.PROBE_PATH, self.PROBE_TIMEOUT)
+        except Exception as e:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+        else:
+            self.consecutive_failures = 0
+            self.last_latency = min(latencies)
+        self.last_check = time.time()
+        return self.status()
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": config.HEALTH_CHECK_ENABLED,
+            "state": self.state,
+            "interval": config.HEALTH_CHECK_INTERVAL,
+            "last_check": datetime.fromtimestamp(self.last_check).isoformat() if self.last_check else None,
+            "last_latency_ms": round(self.last_latency * 1000, 1) if self.last_latency is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "checks": self.checks,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "pool": self.client.pool_status()
+        }
+
+health_monitor = HealthMonitor(http_client)
+
+@asynccontextmanager
+async def _server_lifespan(server: "FastMCP"):
+    """Open the shared HTTP connection pool at startup and close it on shutdown."""
+    metrics_server = None
+    if config.METRICS_PORT:
+        metrics_server = await asyncio.start_server(_serve_metrics, config.METRICS_HOST, config.METRICS_PORT)
+    if config.PERSISTENT_CACHE_ENABLED:
+        await persistent_cache.open()
+    async with http_client:
+        health_monitor.start()
+        try:
+            yield {"http_client": http_client}
+        finally:
+            await health_monitor.stop()
+            if metrics_server is not None:
+                metrics_server.close()
+                await metrics_server.wait_closed()
+            await persistent_cache.close()
+            await span_exporter.close()
+
+# ---------------- REQUEST COALESCING & CACHING ----------------
+def _request_key(method: str, url: str, params: Optional[Dict[str, Any]], headers: Dict[str, str]) -> str:
+    """Identity of a request for coalescing: method, URL, params and credentials."""
+    query = urlencode(sorted((k, str(v)) for k, v in (params or {}).items()))
+    credentials = headers.get("Authorization") or headers.get(PROXY_PROFILE_HEADER, "")
+    auth = hashlib.sha256(credentials.encode()).hexdigest()[:16]
+    return f"{auth} {method.upper()} {url}?{query}"
+
+class SingleFlight:
+    """Lets concurrent identical requests share a single in-flight call.
+    
+    The first caller for a key starts the call; callers arriving while it is
+    running wait for the same result. The shared call is only cancelled once
+    every caller waiting on it has been cancelled, and runs under the
+    deadline of the caller that started it.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[str, List[Any]] = {}
+        self.executed = 0
+        self.coalesced = 0
+    
+    async def do(self, key: str, fn):
+        entry = self._calls.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(fn())
+            entry = self._calls[key] = [task, 0]
+            task.add_done_callback(functools.partial(self._finished, key, entry))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+        
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                task.cancel()
+    
+    def _finished(self, key: str, entry: List[Any], task: asyncio.Future):
+        if self._calls.get(key) is entry:
+            del self._calls[key]
+    
+    def status(self) -> Dict[str, Any]:
+        total = self.executed + self.coalesced
+        return {
+            "enabled": config.SINGLE_FLIGHT_ENABLED,
+            "in_flight": len(self._calls),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "coalesce_ratio": round(self.coalesced / total, 4) if total else 0.0
+        }
+
+single_flight = SingleFlight()
+
+# Seconds a successful GET response stays cached, by route template.
+# Routes not listed here are never cached. Writes made through this server
+# evict or refresh the affected entries (see CACHE_INVALIDATION_RULES), so the
+# TTL only bounds staleness from changes made outside of it.
+CACHE_TTL_POLICIES: Dict[str, float] = {
+    "/guilds/{guild_id}": 300.0,
+    "/guilds/{guild_id}/channels": 300.0,
+    "/guilds/{guild_id}/roles": 300.0,
+    "/guilds/{guild_id}/regions": 3600.0,
+    "/guilds/{guild_id}/members/{user_id}": 120.0,
+    "/guilds/{guild_id}/emojis": 600.0,
+    "/guilds/{guild_id}/emojis/{emoji_id}": 600.0,
+    "/guilds/{guild_id}/stickers": 600.0,
+    "/guilds/{guild_id}/stickers/{sticker_id}": 600.0,
+    "/guilds/{guild_id}/webhooks": 600.0,
+    "/guilds/{guild_id}/auto-moderation/rules": 600.0,
+    "/guilds/{guild_id}/auto-moderation/rules/{rule_id}": 600.0,
+    "/guilds/{guild_id}/templates": 600.0,
+    "/guilds/{guild_id}/welcome-screen": 600.0,
+    "/guilds/{guild_id}/widget": 600.0,
+    "/guilds/{guild_id}/onboarding": 600.0,
+    "/channels/{channel_id}": 300.0,
+    "/channels/{channel_id}/webhooks": 600.0,
+    "/webhooks/{webhook_id}": 600.0,
+    "/applications/@me": 600.0,
+    "/applications/{application_id}": 600.0,
+    "/applications/{application_id}/commands": 600.0,
+    "/applications/{application_id}/commands/{command_id}": 600.0,
+    "/applications/{application_id}/guilds/{guild_id}/commands": 600.0,
+    "/applications/{application_id}/guilds/{guild_id}/commands/{command_id}": 600.0,
+    "/users/{user_id}": 300.0,
+    "/stickers/{sticker_id}": 3600.0,
+    "/voice/regions": 3600.0,
+    "/sticker-packs": 3600.0,
+}
+
+# Cached GET routes made stale by a successful write, keyed by (method, route).
+# Placeholders are filled from the write's path parameters, then from fields of
+# its JSON response (e.g. the guild_id of an updated channel); any placeholder
+# left unresolved matches every value. "*" evicts every cached route that
+# shares the write's path parameters.
+_CHANNEL_READS = ("/channels/{channel_id}", "/guilds/{guild_id}/channels")
+_WEBHOOK_READS = ("/webhooks/{webhook_id}", "/channels/{channel_id}/webhooks",
+                  "/guilds/{guild_id}/webhooks")
+_ROLE_READS = ("/guilds/{guild_id}/roles", "/guilds/{guild_id}",
+               "/guilds/{guild_id}/members/{user_id}")
+_EMOJI_READS = ("/guilds/{guild_id}/emojis/{emoji_id}", "/guilds/{guild_id}/emojis",
+                "/guilds/{guild_id}")
+_STICKER_READS = ("/guilds/{guild_id}/stickers/{sticker_id}", "/guilds/{guild_id}/stickers",
+                  "/stickers/{sticker_id}", "/guilds/{guild_id}")
+_AUTOMOD_READS = ("/guilds/{guild_id}/auto-moderation/rules/{rule_id}",
+                  "/guilds/{guild_id}/auto-moderation/rules")
+_COMMAND_READS = ("/applications/{application_id}/commands/{command_id}",
+                  "/applications/{application_id}/commands")
+_GUILD_COMMAND_READS = ("/applications/{application_id}/guilds/{guild_id}/commands/{command_id}",
+                        "/applications/{application_id}/guilds/{guild_id}/commands")
+_APPLICATION_READS = ("/applications/{application_id}", "/applications/@me")
+_MEMBER_READS = ("/guilds/{guild_id}/members/{user_id}",)
+_TEMPLATE_READS = ("/guilds/{guild_id}/templates",)
+
+CACHE_INVALIDATION_RULES: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    # DISCORDBOT_UPDATE_CHANNEL, DISCORDBOT_DELETE_CHANNEL, DISCORDBOT_CREATE_GUILD_CHANNEL
+    ("PATCH", "/channels/{channel_id}"): _CHANNEL_READS,
+    ("DELETE", "/channels/{channel_id}"): _CHANNEL_READS,
+    ("POST", "/guilds/{guild_id}/channels"): ("/guilds/{guild_id}/channels",),
+    ("PATCH", "/guilds/{guild_id}/channels"): ("/guilds/{guild_id}/channels",),
+    # DISCORDBOT_SET_CHANNEL_PERMISSION_OVERWRITE, DISCORDBOT_DELETE_CHANNEL_PERMISSION
+    ("PUT", "/channels/{channel_id}/permissions/{overwrite_id}"): _CHANNEL_READS,
+    ("DELETE", "/channels/{channel_id}/permissions/{overwrite_id}"): _CHANNEL_READS,
+    # Webhooks
+    ("POST", "/channels/{channel_id}/webhooks"): _WEBHOOK_READS[1:],
+    ("PATCH", "/webhooks/{webhook_id}"): _WEBHOOK_READS,
+    ("DELETE", "/webhooks/{webhook_id}"): _WEBHOOK_READS,
+    ("PATCH", "/webhooks/{webhook_id}/{webhook_token}"): _WEBHOOK_READS,
+    ("DELETE", "/webhooks/{webhook_id}/{webhook_token}"): _WEBHOOK_READS,
+    # Guilds
+    ("PATCH", "/guilds/{guild_id}"): ("/guilds/{guild_id}",),
+    ("DELETE", "/guilds/{guild_id}"): ("*",),
+    ("DELETE", "/users/@me/guilds/{guild_id}"): ("*",),
+    ("PATCH", "/guilds/{guild_id}/widget"): ("/guilds/{guild_id}/widget",),
+    ("PATCH", "/guilds/{guild_id}/welcome-screen"): ("/guilds/{guild_id}/welcome-screen",),
+    ("PUT", "/guilds/{guild_id}/onboarding"): ("/guilds/{guild_id}/onboarding",),
+    # Roles; a deleted or edited role also changes guild and member objects
+    ("POST", "/guilds/{guild_id}/roles"): _ROLE_READS[:2],
+    ("PATCH", "/guilds/{guild_id}/roles"): _ROLE_READS[:2],
+    ("PATCH", "/guilds/{guild_id}/roles/{role_id}"): _ROLE_READS[:2],
+    ("DELETE", "/guilds/{guild_id}/roles/{role_id}"): _ROLE_READS,
+    # Members: DISCORDBOT_ADD_GUILD_MEMBER_ROLE, DISCORDBOT_REMOVE_GUILD_MEMBER_ROLE, bans, kicks
+    ("PUT", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}"): _MEMBER_READS,
+    ("DELETE", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}"): _MEMBER_READS,
+    ("PUT", "/guilds/{guild_id}/members/{user_id}"): _MEMBER_READS,
+    ("PATCH", "/guilds/{guild_id}/members/{user_id}"): _MEMBER_READS,
+    ("DELETE", "/guilds/{guild_id}/members/{user_id}"): _MEMBER_READS,
+    ("PATCH", "/guilds/{guild_id}/members/@me"): _MEMBER_READS,
+    ("PUT", "/guilds/{guild_id}/bans/{user_id}"): _MEMBER_READS,
+    ("PATCH", "/users/@me"): ("/users/{user_id}",),
+    # Emojis and stickers
+    ("POST", "/guilds/{guild_id}/emojis"): _EMOJI_READS[1:],
+    ("PATCH", "/guilds/{guild_id}/emojis/{emoji_id}"): _EMOJI_READS,
+    ("DELETE", "/guilds/{guild_id}/emojis/{emoji_id}"): _EMOJI_READS,
+    ("POST", "/guilds/{guild_id}/stickers"): _STICKER_READS[1:2] + _STICKER_READS[3:],
+    ("PATCH", "/guilds/{guild_id}/stickers/{sticker_id}"): _STICKER_READS,
+    ("DELETE", "/guilds/{guild_id}/stickers/{sticker_id}"): _STICKER_READS,
+    # Auto-moderation
+    ("POST", "/guilds/{guild_id}/auto-moderation/rules"): _AUTOMOD_READS[1:],
+    ("PATCH", "/guilds/{guild_id}/auto-moderation/rules/{rule_id}"): _AUTOMOD_READS,
+    ("DELETE", "/guilds/{guild_id}/auto-moderation/rules/{rule_id}"): _AUTOMOD_READS,
+    # Templates
+    ("POST", "/guilds/{guild_id}/templates"): _TEMPLATE_READS,
+    ("PUT", "/guilds/{guild_id}/templates/{template_code}"): _TEMPLATE_READS,
+    ("PATCH", "/guilds/{guild_id}/templates/{template_code}"): _TEMPLATE_READS,
+    ("DELETE", "/guilds/{guild_id}/templates/{template_code}"): _TEMPLATE_READS,
+    # Applications and commands
+    ("PATCH", "/applications/@me"): _APPLICATION_READS,
+    ("PUT", "/applications/{application_id}"): _APPLICATION_READS,
+    ("POST", "/applications/{application_id}/commands"): _COMMAND_READS[1:],
+    ("PUT", "/applications/{application_id}/commands"): _COMMAND_READS,
+    ("PATCH", "/applications/{application_id}/commands/{command_id}"): _COMMAND_READS,
+    ("DELETE", "/applications/{application_id}/commands/{command_id}"): _COMMAND_READS,
+    ("POST", "/applications/{application_id}/guilds/{guild_id}/commands"): _GUILD_COMMAND_READS[1:],
+    ("PUT", "/applications/{application_id}/guilds/{guild_id}/commands"): _GUILD_COMMAND_READS,
+    ("PATCH", "/applications/{application_id}/guilds/{guild_id}/commands/{command_id}"): _GUILD_COMMAND_READS,
+    ("DELETE", "/applications/{application_id}/guilds/{guild_id}/commands/{command_id}"): _GUILD_COMMAND_READS,
+}
+
+# Writes whose JSON response is the new state of a cached GET route; the
+# response is stored under that route instead of waiting for the next read.
+# A placeholder missing from the write's path is taken from the response
+# field of the same name, or from the response "id" for the last one.
+CACHE_WRITE_THROUGH: Dict[Tuple[str, str], str] = {
+    ("PATCH", "/channels/{channel_id}"): "/channels/{channel_id}",
+    ("POST", "/guilds/{guild_id}/channels"): "/channels/{channel_id}",
+    ("PATCH", "/guilds/{guild_id}"): "/guilds/{guild_id}",
+    ("PATCH", "/guilds/{guild_id}/members/{user_id}"): "/guilds/{guild_id}/members/{user_id}",
+    ("PATCH", "/guilds/{guild_id}/widget"): "/guilds/{guild_id}/widget",
+    ("PATCH", "/guilds/{guild_id}/welcome-screen"): "/guilds/{guild_id}/welcome-screen",
+    ("PUT", "/guilds/{guild_id}/onboarding"): "/guilds/{guild_id}/onboarding",
+    ("POST", "/channels/{channel_id}/webhooks"): "/webhooks/{webhook_id}",
+    ("PATCH", "/webhooks/{webhook_id}"): "/webhooks/{webhook_id}",
+    ("POST", "/guilds/{guild_id}/emojis"): "/guilds/{guild_id}/emojis/{emoji_id}",
+    ("PATCH", "/guilds/{guild_id}/emojis/{emoji_id}"): "/guilds/{guild_id}/emojis/{emoji_id}",
+    ("POST", "/guilds/{guild_id}/stickers"): "/guilds/{guild_id}/stickers/{sticker_id}",
+    ("PATCH", "/guilds/{guild_id}/stickers/{sticker_id}"): "/guilds/{guild_id}/stickers/{sticker_id}",
+    ("POST", "/guilds/{guild_id}/auto-moderation/rules"): "/guilds/{guild_id}/auto-moderation/rules/{rule_id}",
+    ("PATCH", "/guilds/{guild_id}/auto-moderation/rules/{rule_id}"): "/guilds/{guild_id}/auto-moderation/rules/{rule_id}",
+    ("PATCH", "/applications/@me"): "/applications/@me",
+    ("POST", "/applications/{application_id}/commands"): "/applications/{application_id}/commands/{command_id}",
+    ("PATCH", "/applications/{application_id}/commands/{command_id}"): "/applications/{application_id}/commands/{command_id}",
+    ("POST", "/applications/{application_id}/guilds/{guild_id}/commands"):
+        "/applications/{application_id}/guilds/{guild_id}/commands/{command_id}",
+    ("PATCH", "/applications/{application_id}/guilds/{guild_id}/commands/{command_id}"):
+        "/applications/{application_id}/guilds/{guild_id}/commands/{command_id}",
+}
+
+_ROUTE_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+# GET routes whose responses are also kept on disk so they survive restarts,
+# with their TTL in seconds. Their data rarely changes, and writes made
+# through this server invalidate them like the in-memory entries.
+PERSISTENT_CACHE_POLICIES: Dict[str, float] = {
+    "/sticker-packs": 86400.0,
+    "/stickers/{sticker_id}": 86400.0,
+    "/voice/regions": 86400.0,
+    "/guilds/{guild_id}/regions": 86400.0,
+    "/applications/@me": 3600.0,
+    "/applications/{application_id}": 3600.0,
+    "/applications/{application_id}/commands": 3600.0,
+    "/applications/{application_id}/guilds/{guild_id}/commands": 3600.0,
+}
+
+# Valid values for the ``cache_mode`` argument of discord_request and the cached tools
+CACHE_MODES = ("default", "bypass", "refresh")
+
+@dataclass
+class CachedResponse:
+    """A response body held by the ResponseCache."""
+    route: str
+    status_code: int
+    content: bytes
+    content_type: str
+    expires_at: float
+    size: int
+    path_params: Dict[str, str] = field(default_factory=dict)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    
+    def to_response(self) -> httpx.Response:
+        headers = {"Content-Type": self.content_type}
+        if self.etag:
+            headers["ETag"] = self.etag
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+        return httpx.Response(self.status_code, content=self.content, headers=headers)
+
+class ResponseCache:
+    """In-memory TTL + LRU cache of GET responses, bounded by total size in bytes."""
+    
+    # Approximate bookkeeping cost of one entry on top of its key and body
+    ENTRY_OVERHEAD = 200
+    
+    def __init__(self, max_bytes: int, persistent: Optional["PersistentResponseCache"] = None):
+        self.max_bytes = max_bytes
+        self.persistent = persistent
+        self.size = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._by_route: Dict[str, set] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.refreshes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.write_throughs = 0
+    
+    @staticmethod
+    def ttl_for(method: str, route: str) -> Optional[float]:
+        if method.upper() != "GET":
+            return None
+        return CACHE_TTL_POLICIES.get(route)
+    
+    def get(self, key: str) -> Optional[httpx.Response]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.to_response()
+    
+    def put(self, key: str, route: str, response: httpx.Response, ttl: float,
+            path_params: Optional[Dict[str, str]] = None):
+        content = response.content
+        size = len(content) + len(key) + self.ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = CachedResponse(route, response.status_code, content,
+                                            response.headers.get("Content-Type", "application/json"),
+                                            time.monotonic() + ttl, size, path_params or {})
+        self._by_route.setdefault(route, set()).add(key)
+        self.size += size
+        self._shrink()
+    
+    def _shrink(self):
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+    
+    def resize(self, max_bytes: int):
+        """Change the memory bound, evicting least recently used entries that no longer fit."""
+        self.max_bytes = max_bytes
+        self._shrink()
+    
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+            keys = self._by_route.get(entry.route)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_route[entry.route]
+    
+    async def invalidate(self, route: str, path_params: Dict[str, str]) -> int:
+        """Evict cached entries of ``route`` whose path parameters match ``path_params``.
+        
+        Parameters absent from ``path_params`` match any value; the route "*"
+        matches every cached route. Matching persistent entries are evicted too.
+        """
+        if self.persistent is not None:
+            await self.persistent.invalidate(route, path_params)
+        routes = list(self._by_route) if route == "*" else [route]
+        removed = 0
+        for name in routes:
+            for key in list(self._by_route.get(name, ())):
+                entry = self._entries[key]
+                if all(entry.path_params.get(param, value) == value
+                       for param, value in path_params.items()):
+                    self._remove(key)
+                    removed += 1
+        self.invalidations += removed
+        return removed
+    
+    async def apply_write(self, method: str, route: str, path_params: Dict[str, str],
+                          response: Optional[httpx.Response], headers: Dict[str, str]):
+        """Evict and refresh cached reads after a write to ``route``.
+        
+        ``response`` is None when the outcome of the write is unknown (the
+        request failed in transit); only invalidation is done then.
+        """
+        method = method.upper()
+        rule = (method, route)
+        if rule not in CACHE_INVALIDATION_RULES and rule not in CACHE_WRITE_THROUGH:
+            return
+        body: Dict[str, Any] = {}
+        if response is not None and rule in CACHE_WRITE_THROUGH:
+            try:
+                decoded = _json_loads(response.content)
+                if isinstance(decoded, dict):
+                    body = decoded
+            except ValueError:
+                pass
+        
+        def resolve(template: str, fill_id: bool) -> Dict[str, str]:
+            names = _ROUTE_PLACEHOLDER.findall(template)
+            resolved = {}
+            for i, name in enumerate(names):
+                if name in path_params:
+                    resolved[name] = path_params[name]
+                elif body.get(name) is not None:
+                    resolved[name] = str(body[name])
+                elif fill_id and i == len(names) - 1 and body.get("id") is not None:
+                    resolved[name] = str(body["id"])
+            return resolved
+        
+        for target in CACHE_INVALIDATION_RULES.get(rule, ()):
+            if target == "*":
+                await self.invalidate("*", path_params)
+            else:
+                await self.invalidate(target, resolve(target, False))
+        
+        target = CACHE_WRITE_THROUGH.get(rule)
+        if target is None or not body or response.status_code not in (200, 201):
+            return
+        params = resolve(target, True)
+        if len(params) != len(_ROUTE_PLACEHOLDER.findall(target)):
+            return
+        path = _ROUTE_PLACEHOLDER.sub(lambda m: params[m.group(1)], target)
+        key = _request_key("GET", f"{config.DISCORD_API_BASE}{path}", None, headers)
+        # The body is already decoded, so transfer headers such as Content-Encoding
+        # must not be carried over; keep only what CachedResponse replays.
+        stored_headers = {"Content-Type": response.headers.get("Content-Type", "application/json")}
+        for name in ("ETag", "Last-Modified"):
+            if name in response.headers:
+                stored_headers[name] = response.headers[name]
+        stored = httpx.Response(200, content=response.content, headers=stored_headers)
+        ttl = CACHE_TTL_POLICIES.get(target)
+        if ttl is not None:
+            self.put(key, target, stored, ttl, params)
+        disk_ttl = self.persistent.ttl_for("GET", target) if self.persistent is not None else None
+        if disk_ttl is not None:
+            await self.persistent.put(key, target, stored, disk_ttl, params)
+        if ttl is not None or disk_ttl is not None:
+            self.write_throughs += 1
+    
+    def clear(self):
+        self._entries.clear()
+        self._by_route.clear()
+        self.size = 0
+    
+    def status(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": config.RESPONSE_CACHE_ENABLED,
+            "entries": len(self._entries),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "bypasses": self.bypasses,
+            "refreshes": self.refreshes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "write_throughs": self.write_throughs
+        }
+
+class PersistentResponseCache:
+    """SQLite-backed cache of GET responses that survives server restarts.
+    
+    Expired entries are kept while space allows: when the stored response
+    carried an ETag or Last-Modified header, the next read revalidates it with
+    a conditional request and a 304 reply renews it without a download. The
+    file is bounded by ``max_bytes`` (least recently used entries go first)
+    and compacted when it is opened.
+    
+    The database is opened by open() at server startup and only used from a
+    dedicated worker thread, so disk I/O never blocks the event loop; until
+    then (or if it cannot be opened) every lookup is a miss.
+    """
+    
+    SCHEMA_VERSION = 1
+    # VACUUM the file on open once free pages make up this share of it
+    COMPACT_FREE_RATIO = 0.25
+    
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._failed = False
+        # One worker: SQLite calls run in order, off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="discordbot-cache")
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self.compactions = 0
+    
+    @staticmethod
+    def ttl_for(method: str, route: str) -> Optional[float]:
+        if method.upper() != "GET":
+            return None
+        return PERSISTENT_CACHE_POLICIES.get(route)
+    
+    async def _run(self, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+    
+    async def open(self):
+        """Open (creating if needed) and compact the database file."""
+        await self._run(self._open)
+    
+    def _open(self):
+        if self._db is not None or self._failed:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS responses")
+                db.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+            db.execute("""CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                route TEXT NOT NULL,
+                path_params TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                content BLOB NOT NULL,
+                content_type TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                size INTEGER NOT NULL
+            )""")
+            db.execute("CREATE INDEX IF NOT EXISTS responses_route ON responses (route)")
+            db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            self._db = db
+            self._compact()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: persistent cache disabled, cannot open {self.path}: {e}", file=sys.stderr)
+            self._failed = True
+            self._db = None
+    
+    def _count(self, db: sqlite3.Connection):
+        self.entries, self.size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+    
+    async def lookup(self, key: str) -> Tuple[Optional[httpx.Response], float, Dict[str, str]]:
+        """Return (fresh response, seconds it stays fresh, conditional request headers).
+        
+        The response is None on a miss or when the entry has expired; the
+        headers then hold the validators of an expired entry, if any.
+        """
+        return await self._run(self._lookup, key)
+    
+    def _lookup(self, key: str) -> Tuple[Optional[httpx.Response], float, Dict[str, str]]:
+        db = self._db
+        row = db.execute("SELECT route, status_code, content, content_type, etag, last_modified, expires_at "
+                         "FROM responses WHERE key = ?", (key,)).fetchone() if db else None
+        if row is None:
+            self.misses += 1
+            return None, 0.0, {}
+        route, status_code, content, content_type, etag, last_modified, expires_at = row
+        now = time.time()
+        if expires_at <= now:
+            self.misses += 1
+            validators = {}
+            if etag:
+                validators["If-None-Match"] = etag
+            if last_modified:
+                validators["If-Modified-Since"] = last_modified
+            if validators:
+                self.revalidations += 1
+            return None, 0.0, validators
+        db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        entry = CachedResponse(route, status_code, content, content_type, expires_at, 0,
+                               etag=etag, last_modified=last_modified)
+        return entry.to_response(), expires_at - now, {}
+    
+    async def renew(self, key: str, ttl: float) -> Optional[httpx.Response]:
+        """Extend an entry after Discord answered its conditional request with 304."""
+        return await self._run(self._renew, key, ttl)
+    
+    def _renew(self, key: str, ttl: float) -> Optional[httpx.Response]:
+        db = self._db
+        if db is None:
+            return None
+        now = time.time()
+        db.execute("UPDATE responses SET expires_at = ?, last_used = ? WHERE key = ?", (now + ttl, now, key))
+        row = db.execute("SELECT route, status_code, content, content_type, etag, last_modified "
+                         "FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.not_modified += 1
+        route, status_code, content, content_type, etag, last_modified = row
+        return CachedResponse(route, status_code, content, content_type, now + ttl, 0,
+                              etag=etag, last_modified=last_modified).to_response()
+    
+    async def put(self, key: str, route: str, response: httpx.Response, ttl: float,
+                  path_params: Optional[Dict[str, str]] = None):
+        await self._run(self._put, key, route, response, ttl, path_params)
+    
+    def _put(self, key: str, route: str, response: httpx.Response, ttl: float,
+             path_params: Optional[Dict[str, str]]):
+        db = self._db
+        if db is None:
+            return
+        content = response.content
+        size = len(content) + len(key)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                   (key, route, json.dumps(path_params or {}, sort_keys=True), response.status_code,
+                    content, response.headers.get("Content-Type", "application/json"),
+                    response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                    now + ttl, now, size))
+        self._count(db)
+        if self.size > self.max_bytes:
+            self._evict(db)
+    
+    def _evict(self, db: sqlite3.Connection):
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        # Keep the newest entries whose running total still fits
+        removed = db.execute("""DELETE FROM responses WHERE key IN (
+            SELECT key FROM (
+                SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS total FROM responses
+            ) WHERE total > ?
+        )""", (self.max_bytes,)).rowcount
+        self.evictions += removed
+        self._count(db)
+    
+    async def invalidate(self, route: str, path_params: Dict[str, str]) -> int:
+        """Delete entries of ``route`` ("*" for any) whose path parameters match ``path_params``."""
+        return await self._run(self._invalidate, route, path_params)
+    
+    def _invalidate(self, route: str, path_params: Dict[str, str]) -> int:
+        db = self._db
+        if db is None:
+            return 0
+        if route == "*":
+            rows = db.execute("SELECT key, path_params FROM responses").fetchall()
+        else:
+            rows = db.execute("SELECT key, path_params FROM responses WHERE route = ?", (route,)).fetchall()
+        keys = []
+        for key, stored in rows:
+            stored = json.loads(stored)
+            if all(stored.get(param, value) == value for param, value in path_params.items()):
+                keys.append((key,))
+        if keys:
+            db.executemany("DELETE FROM responses WHERE key = ?", keys)
+            self._count(db)
+        return len(keys)
+    
+    async def compact(self):
+        """Drop expired entries that cannot be revalidated and reclaim free space."""
+        await self._run(self._compact)
+    
+    def _compact(self):
+        db = self._db
+        if db is None:
+            return
+        db.execute("DELETE FROM responses WHERE expires_at <= ? AND etag IS NULL AND last_modified IS NULL",
+                   (time.time(),))
+        self._count(db)
+        if self.size > self.max_bytes:
+            self._evict(db)
+        pages = db.execute("PRAGMA page_count").fetchone()[0]
+        free = db.execute("PRAGMA freelist_count").fetchone()[0]
+        if pages and free / pages >= self.COMPACT_FREE_RATIO:
+            db.execute("VACUUM")
+            self.compactions += 1
+    
+    async def clear(self):
+        await self._run(self._clear)
+    
+    def _clear(self):
+        if self._db is not None:
+            self._db.execute("DELETE FROM responses")
+            self.entries = self.size = 0
+    
+    async def close(self):
+        await self._run(self._close)
+    
+    def _close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+    
+    def status(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": config.PERSISTENT_CACHE_ENABLED and not self._failed,
+            "path": self.path,
+            "entries": self.entries,
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+            "compactions": self.compactions
+        }
+
+persistent_cache = PersistentResponseCache(config.PERSISTENT_CACHE_PATH, config.PERSISTENT_CACHE_MAX_BYTES)
+response_cache = ResponseCache(config.RESPONSE_CACHE_MAX_BYTES,
+                               persistent_cache if config.PERSISTENT_CACHE_ENABLED else None)
+
+# ---------------- FIELD PROJECTION ----------------
+# Named field sets for the ``fields`` argument of read tools, by the kind of
+# object a route returns. "full" (or no fields) keeps the whole object.
+_MESSAGE_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "channel_id", "author.id", "author.username", "content", "timestamp",
+                "edited_timestamp", "type", "attachments.url", "referenced_message.id")
+}
+_USER_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "username", "global_name", "bot")
+}
+_MEMBER_FIELDS = {
+    "ids": ("user.id",),
+    "summary": ("user.id", "user.username", "user.global_name", "user.bot", "nick", "roles", "joined_at")
+}
+_BAN_FIELDS = {
+    "ids": ("user.id",),
+    "summary": ("user.id", "user.username", "reason")
+}
+_THREAD_MEMBER_FIELDS = {
+    "ids": ("user_id",),
+    "summary": ("user_id", "join_timestamp", "flags")
+}
+_THREAD_LIST_FIELDS = {
+    "ids": ("threads.id",),
+    "summary": ("threads.id", "threads.name", "threads.parent_id", "threads.owner_id",
+                "threads.thread_metadata.archived", "has_more")
+}
+_CHANNEL_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "type", "name", "guild_id", "parent_id", "position", "topic")
+}
+_GUILD_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "name", "icon", "owner_id", "description", "approximate_member_count")
+}
+_ROLE_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "name", "color", "position", "permissions", "managed")
+}
+_WEBHOOK_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "type", "name", "channel_id", "guild_id")
+}
+_EMOJI_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "name", "animated", "available")
+}
+_STICKER_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "name", "format_type", "guild_id", "pack_id")
+}
+_COMMAND_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "name", "type", "description", "guild_id")
+}
+_COMMAND_PERMISSION_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "application_id", "guild_id", "permissions")
+}
+_APPLICATION_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "name", "description", "bot_public", "owner.id", "approximate_guild_count")
+}
+_INVITE_FIELDS = {
+    "ids": ("code",),
+    "summary": ("code", "guild.id", "channel.id", "inviter.id", "uses", "max_uses", "expires_at")
+}
+_TEMPLATE_FIELDS = {
+    "ids": ("code",),
+    "summary": ("code", "name", "description", "usage_count", "updated_at")
+}
+_SCHEDULED_EVENT_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "name", "status", "scheduled_start_time", "channel_id", "user_count")
+}
+_REGION_FIELDS = {
+    "ids": ("id",),
+    "summary": ("id", "name", "optimal", "deprecated")
+}
+
+# Presets of every route whose tools take ``fields``, by route template (see _parse_route)
+FIELD_PRESETS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    # Applications and commands
+    "/applications/@me": _APPLICATION_FIELDS,
+    "/applications/{application_id}": _APPLICATION_FIELDS,
+    "/oauth2/applications/@me": _APPLICATION_FIELDS,
+    "/applications/{application_id}/commands": _COMMAND_FIELDS,
+    "/applications/{application_id}/commands/{command_id}": _COMMAND_FIELDS,
+    "/applications/{application_id}/guilds/{guild_id}/commands": _COMMAND_FIELDS,
+    "/applications/{application_id}/guilds/{guild_id}/commands/{command_id}": _COMMAND_FIELDS,
+    "/applications/{application_id}/guilds/{guild_id}/commands/permissions": _COMMAND_PERMISSION_FIELDS,
+    "/applications/{application_id}/guilds/{guild_id}/commands/{command_id}/permissions": _COMMAND_PERMISSION_FIELDS,
+    "/applications/{application_id}/role-connections/metadata": {
+        "ids": ("key",),
+        "summary": ("key", "name", "type", "description")
+    },
+    "/users/@me/applications/{application_id}/role-connection": {
+        "summary": ("platform_name", "platform_username")
+    },
+    # Channels and threads
+    "/channels/{channel_id}": _CHANNEL_FIELDS,
+    "/guilds/{guild_id}/channels": _CHANNEL_FIELDS,
+    "/channels/{channel_id}/thread-members": _THREAD_MEMBER_FIELDS,
+    "/channels/{channel_id}/thread-members/{user_id}": _THREAD_MEMBER_FIELDS,
+    "/channels/{channel_id}/threads/archived/public": _THREAD_LIST_FIELDS,
+    "/channels/{channel_id}/threads/archived/private": _THREAD_LIST_FIELDS,
+    "/channels/{channel_id}/users/@me/threads/archived/private": _THREAD_LIST_FIELDS,
+    "/guilds/{guild_id}/threads/active": _THREAD_LIST_FIELDS,
+    "/stage-instances/{id}": {
+        "ids": ("id",),
+        "summary": ("id", "channel_id", "topic", "privacy_level", "guild_scheduled_event_id")
+    },
+    # Gateway and OAuth2
+    "/gateway": {
+        "summary": ("url",)
+    },
+    "/gateway/bot": {
+        "summary": ("url", "shards", "session_start_limit.remaining", "session_start_limit.reset_after")
+    },
+    "/oauth2/keys": {
+        "ids": ("keys.kid",),
+        "summary": ("keys.kid", "keys.kty", "keys.alg", "keys.use")
+    },
+    # Messages and reactions
+    "/channels/{channel_id}/messages": _MESSAGE_FIELDS,
+    "/channels/{channel_id}/messages/{message_id}": _MESSAGE_FIELDS,
+    "/channels/{channel_id}/pins": _MESSAGE_FIELDS,
+    "/webhooks/{webhook_id}/{webhook_token}/messages/{message_id}": _MESSAGE_FIELDS,
+    "/webhooks/{webhook_id}/{webhook_token}/messages/@original": _MESSAGE_FIELDS,
+    "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}": _USER_FIELDS,
+    # Moderation
+    "/guilds/{guild_id}/auto-moderation/rules": {
+        "ids": ("id",),
+        "summary": ("id", "name", "event_type", "trigger_type", "enabled")
+    },
+    "/guilds/{guild_id}/auto-moderation/rules/{rule_id}": {
+        "ids": ("id",),
+        "summary": ("id", "name", "event_type", "trigger_type", "enabled")
+    },
+    "/guilds/{guild_id}/bans": _BAN_FIELDS,
+    "/guilds/{guild_id}/bans/{user_id}": _BAN_FIELDS,
+    # Users and members
+    "/users/{user_id}": _USER_FIELDS,
+    "/guilds/{guild_id}/members": _MEMBER_FIELDS,
+    "/guilds/{guild_id}/members/search": _MEMBER_FIELDS,
+    "/guilds/{guild_id}/members/{user_id}": _MEMBER_FIELDS,
+    # Emojis and stickers
+    "/guilds/{guild_id}/emojis": _EMOJI_FIELDS,
+    "/guilds/{guild_id}/emojis/{emoji_id}": _EMOJI_FIELDS,
+    "/guilds/{guild_id}/stickers": _STICKER_FIELDS,
+    "/guilds/{guild_id}/stickers/{sticker_id}": _STICKER_FIELDS,
+    "/stickers/{sticker_id}": _STICKER_FIELDS,
+    "/sticker-packs": {
+        "ids": ("sticker_packs.id",),
+        "summary": ("sticker_packs.id", "sticker_packs.name", "sticker_packs.description")
+    },
+    # Webhooks
+    "/webhooks/{webhook_id}": _WEBHOOK_FIELDS,
+    "/webhooks/{webhook_id}/{webhook_token}": _WEBHOOK_FIELDS,
+    "/channels/{channel_id}/webhooks": _WEBHOOK_FIELDS,
+    "/guilds/{guild_id}/webhooks": _WEBHOOK_FIELDS,
+    # Guilds
+    "/guilds/{guild_id}": _GUILD_FIELDS,
+    "/guilds/{guild_id}/preview": {
+        "ids": ("id",),
+        "summary": ("id", "name", "icon", "description", "approximate_member_count", "approximate_presence_count")
+    },
+    "/guilds/{guild_id}/roles": _ROLE_FIELDS,
+    "/guilds/{guild_id}/onboarding": {
+        "ids": ("prompts.id",),
+        "summary": ("guild_id", "enabled", "mode", "default_channel_ids", "prompts.id", "prompts.title")
+    },
+    "/guilds/{guild_id}/widget.json": {
+        "summary": ("id", "name", "instant_invite", "presence_count")
+    },
+    "/guilds/{guild_id}/widget": {
+        "summary": ("enabled", "channel_id")
+    },
+    "/guilds/{guild_id}/welcome-screen": {
+        "ids": ("welcome_channels.channel_id",),
+        "summary": ("description", "welcome_channels.channel_id", "welcome_channels.description")
+    },
+    "/guilds/{guild_id}/vanity-url": {
+        "summary": ("code", "uses")
+    },
+    "/guilds/{guild_id}/scheduled-events": _SCHEDULED_EVENT_FIELDS,
+    "/guilds/{guild_id}/scheduled-events/{event_id}": _SCHEDULED_EVENT_FIELDS,
+    "/guilds/{guild_id}/scheduled-events/{event_id}/users": {
+        "ids": ("user.id",),
+        "summary": ("user.id", "user.username", "user.global_name", "member.nick")
+    },
+    "/guilds/{guild_id}/regions": _REGION_FIELDS,
+    "/voice/regions": _REGION_FIELDS,
+    "/guilds/{guild_id}/integrations": {
+        "ids": ("id",),
+        "summary": ("id", "name", "type", "enabled", "account.name")
+    },
+    # Invites and templates
+    "/channels/{channel_id}/invites": _INVITE_FIELDS,
+    "/guilds/{guild_id}/invites": _INVITE_FIELDS,
+    "/invites/{invite_code}": _INVITE_FIELDS,
+    "/guilds/{guild_id}/templates": _TEMPLATE_FIELDS,
+    "/guilds/templates/{template_code}": _TEMPLATE_FIELDS,
+}
+
+# Every preset name some route defines; such a name is never read as a field path
+FIELD_PRESET_NAMES = {"full"} | {name for presets in FIELD_PRESETS.values() for name in presets}
+
+# One segment of a dotted field path; Discord object keys are snake_case identifiers
+_FIELD_PATH_PART = re.compile(r"^[A-Za-z0-9_]+$")
+
+def _field_selection(fields: str, route: str) -> Optional[Dict[str, Any]]:
+    """Resolve a ``fields`` argument to the tree of paths to keep (see _field_tree).
+    
+    ``fields`` is a comma-separated list of dotted paths and/or names of the
+    presets FIELD_PRESETS defines for ``route``. It is validated here, before
+    the request is sent: a preset ``route`` does not have or a malformed path
+    raises ValueError. Returns None when the whole object is wanted.
+    """
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    if not names or "full" in names:
+        return None
+    presets = FIELD_PRESETS.get(route, {})
+    paths: List[str] = []
+    for name in names:
+        if name in FIELD_PRESET_NAMES:
+            if name not in presets:
+                available = ", ".join([*presets, "full"])
+                raise ValueError(f"No '{name}' fields preset for {route}; presets: {available}")
+            paths.extend(presets[name])
+        else:
+            if not all(_FIELD_PATH_PART.match(part) for part in name.split(".")):
+                raise ValueError(f"Invalid field path: {name!r}")
+            paths.append(name)
+    return _field_tree(paths)
+
+def _field_tree(paths: List[str]) -> Dict[str, Any]:
+    """Nested dict of the dotted ``paths`` to keep."""
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        for part in path.split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+def _project(value: Any, tree: Dict[str, Any]) -> Any:
+    """Keep only the paths in ``tree``; lists are projected item by item.
+    
+    Many fields are optional, so a path an object lacks is left out of its
+    projection rather than treated as an error.
+    """
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: _project(value[key], subtree) for key, subtree in tree.items() if key in value}
+    return value
+
 # ---------------- PRODUCTION MCP ----------------
-mcp = FastMCP("discordbot-mcp-production")
+class ProductionMCP(FastMCP):
+    """FastMCP server that schedules each tool call's Discord requests by priority.
+    
+    A call runs under its tool's class from TOOL_PRIORITIES; clients can
+    override it per call with a ``priority`` entry in the request's ``_meta``.
+    
+    Every call also gets a deadline of TOOL_CALL_TIMEOUT seconds, or the
+    ``timeout`` entry of ``_meta``. It bounds the call's retries and httpx
+    timeouts, and once it passes the call is cancelled with whatever it is
+    still waiting on and fails with DeadlineExceededError.
+    
+    With TRACING_ENABLED each call is the root span of a trace that times
+    its requests' queue, rate limit, connect, TLS, server and decode phases.
+    
+    A ``profile`` entry in ``_meta`` picks the bot the call acts as (see
+    BotProfile); calls without one use DEFAULT_BOT_PROFILE.
+    """
+    
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        priority = tool_priority(name)
+        timeout = config.TOOL_CALL_TIMEOUT
+        profile = config.DEFAULT_BOT_PROFILE
+        try:
+            meta = self.get_context().request_context.meta
+        except ValueError:
+            meta = None
+        if meta is not None:
+            requested = getattr(meta, "priority", None)
+            if requested:
+                priority = _validate_priority(str(requested).lower())
+            requested = getattr(meta, "timeout", None)
+            if requested is not None:
+                timeout = float(requested)
+            requested = getattr(meta, "profile", None)
+            if requested:
+                profile = http_client.profile(str(requested)).name
+        
+        started = time.monotonic()
+        token = _call_priority.set((priority, name))
+        profile_token = _call_profile.set(profile)
+        deadline_token = _call_deadline.set(time.monotonic() + timeout if timeout > 0 else None)
+        try:
+            with _span(f"tools/call {name}", Span.SERVER, **{"mcp.tool.name": name, "discord.priority": priority,
+                                                              "discord.profile": profile}):
+                try:
+                    async with asyncio.timeout(timeout if timeout > 0 else None):
+                        return await super().call_tool(name, arguments)
+                except TimeoutError:
+                    raise DeadlineExceededError(timeout) from None
+        except Exception as e:
+            # FastMCP reports tool exceptions as a ToolError raised from the original
+            _record_tool_error(e.__cause__ or e)
+            raise
+        finally:
+            metrics.inc("discordbot_tool_calls_total", tool=name)
+            metrics.observe("discordbot_tool_duration_seconds", time.monotonic() - started, tool=name)
+            _call_deadline.reset(deadline_token)
+            _call_profile.reset(profile_token)
+            _call_priority.reset(token)
+
+mcp = ProductionMCP("discordbot-mcp-production", lifespan=_server_lifespan)
 
 # ---------------- HELPERS ----------------
 def _safe_str(s: Optional[str]) -> Optional[str]:
@@ -188,6 +3453,13 @@ def _filter_none(d: Dict[str, Any]) -> Dict[str, Any]:
     """Remove None values from dict, but keep False values."""
     return {k: v for k, v in d.items() if v is not None}
 
+DISCORD_EPOCH = 1420070400000
+
+def _generate_nonce() -> int:
+    """Generate a snowflake-shaped message nonce that is unique per send."""
+    timestamp = int(time.time() * 1000) - DISCORD_EPOCH
+    return (timestamp << 22) | random.getrandbits(22)
+
 def _encode_emoji(emoji: Optional[str]) -> Optional[str]:
     """Encode emoji for URL use."""
     if not emoji:
@@ -220,47 +3492,96 @@ def _validate_message_id(message_id: str) -> str:
     """Validate message ID."""
     return _validate_snowflake(message_id, "Message ID")
 
+def _record_tool_error(error: BaseException):
+    """Count a failed tool call in discordbot_tool_errors_total by its status."""
+    call = _call_priority.get()
+    if call is None:
+        return
+    if isinstance(error, DiscordHTTPError):
+        status = str(error.status)
+    elif isinstance(error, DeadlineExceededError):
+        status = "504"
+    elif isinstance(error, CircuitOpenError):
+        status = "503"
+    else:
+        status = type(error).__name__
+    metrics.inc("discordbot_tool_errors_total", tool=call[1], status=status)
+
 def _handle_discord_error(error: Exception, context: str = "", **kwargs) -> Dict[str, Any]:
     """Standardized error handling for Discord API errors."""
-    error_str = str(error)
+    _record_tool_error(error)
+    if isinstance(error, DiscordRateLimitError):
+        return {
+            "error": "Rate limited",
+            "message": f"Too many requests for {context}",
+            "suggestion": f"Wait {error.retry_after:.2f}s before retrying {context}",
+            "status": 429,
+            "retry_after": error.retry_after,
+            "global": error.is_global,
+            **error.details(),
+            **kwargs
+        }
+    
+    if isinstance(error, DeadlineExceededError):
+        return {
+            "error": "Deadline exceeded",
+            "message": f"Discord did not answer {context} in time",
+            "suggestion": f"Retry {context} with a longer timeout",
+            "status": 504,
+            **kwargs
+        }
     
-    # Common Discord error patterns
-    if "404" in error_str:
+    if isinstance(error, CircuitOpenError):
+        return {
+            "error": "Discord unavailable",
+            "message": f"Requests to {error.group} routes are failing; {context} was not sent",
+            "suggestion": f"Retry {context} in {error.retry_after:.0f}s or check Discord's status page",
+            "status": 503,
+            "retry_after": error.retry_after,
+            **kwargs
+        }
+    
+    if isinstance(error, DiscordNotFoundError):
         return {
             "error": "Resource not found",
             "message": f"The requested {context} was not found",
             "suggestion": f"Verify that the {context} exists and is accessible",
             "status": 404,
+            **error.details(),
             **kwargs
         }
-    elif "403" in error_str:
+    elif isinstance(error, DiscordForbiddenError):
         return {
             "error": "Access forbidden",
             "message": f"Insufficient permissions to access {context}",
             "suggestion": f"Check bot permissions for {context}",
             "status": 403,
+            **error.details(),
             **kwargs
         }
-    elif "400" in error_str:
+    elif isinstance(error, DiscordBadRequestError):
         return {
             "error": "Bad request",
             "message": f"Invalid request parameters for {context}",
-            "suggestion": f"Verify request parameters for {context}",
+            "suggestion": f"Fix the fields listed in field_errors for {context}" if error.errors
+                          else f"Verify request parameters for {context}",
             "status": 400,
+            **error.details(),
             **kwargs
         }
-    elif "429" in error_str:
+    elif isinstance(error, DiscordHTTPError):
         return {
-            "error": "Rate limited",
-            "message": f"Too many requests for {context}",
-            "suggestion": f"Wait before retrying {context}",
-            "status": 429,
+            "error": "Discord API error",
+            "message": f"Discord rejected {context}: {error.message or error.status}",
+            "suggestion": f"Check Discord API status and retry {context}",
+            "status": error.status,
+            **error.details(),
             **kwargs
         }
     else:
         return {
             "error": "Discord API error",
-            "message": f"Unexpected error occurred: {error_str}",
+            "message": f"Unexpected error occurred: {error}",
             "suggestion": f"Check Discord API status and retry {context}",
             "status": "unknown",
             **kwargs
@@ -269,71 +3590,170 @@ def _handle_discord_error(error: Exception, context: str = "", **kwargs) -> Dict
 async def discord_request(method: str, endpoint: str, params: Optional[Dict[str, Any]] = None,
                           json: Optional[Any] = None, data: Optional[Any] = None,
                           files: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
-                          timeout: Optional[float] = None) -> Any:
-    """Make a Discord API request with production-ready error handling."""
-    request_id = f"req_{int(time.time() * 1000)}"
+                          timeout: Optional[float] = None, idempotent: Optional[bool] = None,
+                          cache_mode: str = "default", passthrough: bool = False,
+                          fields: str = "", priority: Optional[str] = None) -> Any:
+    """Make a Discord API request with production-ready error handling.
+    
+    Pass ``idempotent=True`` for non-idempotent methods that are nevertheless
+    safe to resend (for example a message POST with an enforced nonce).
+    
+    GET responses of routes in CACHE_TTL_POLICIES are cached. ``cache_mode``
+    is "default" (serve from cache when fresh), "bypass" (skip the cache
+    entirely) or "refresh" (always fetch and store the fresh response).
+    Writes evict and refresh the cached reads they affect according to
+    CACHE_INVALIDATION_RULES and CACHE_WRITE_THROUGH. Routes in
+    PERSISTENT_CACHE_POLICIES are also kept on disk across restarts.
+    
+    Tools that return the response unchanged pass ``passthrough=True``; when
+    RAW_JSON_PASSTHROUGH is enabled a successful JSON body is then returned as
+    MCP text content as-is, without decoding it into Python objects.
+    
+    ``fields`` projects a successful response down to the given dotted paths
+    or presets of the route ("ids", "summary", "full"; see FIELD_PRESETS)
+    before it is returned, so the MCP result only carries what the caller
+    asked for. A preset the route does not have or a malformed path raises
+    ValueError before the request is sent; paths missing from the response
+    are left out of the result.
+    
+    ``priority`` overrides the scheduling class (see PRIORITY_CLASSES) of the
+    tool call this request is made for.
+    
+    The request carries the token of the tool call's bot profile, and its
+    cached responses are keyed by that token so bots never share them.
+    """
+    if cache_mode not in CACHE_MODES:
+        raise ValueError(f"cache_mode must be one of {', '.join(CACHE_MODES)}")
+    profile = http_client.profile(_call_profile.get())
+    field_selection = _field_selection(fields, _parse_route(endpoint)[0]) if fields else None
+    request_id = _new_request_id()
     
     if not endpoint.startswith("/"):
         endpoint = "/" + endpoint
     url = f"{config.DISCORD_API_BASE}{endpoint}"
+    span = _start_span(f"{method.upper()} {_parse_route(endpoint)[0]}", Span.CLIENT,
+                       **{"http.request.method": method.upper(), "discord.request_id": request_id})
     
     req_headers = DEFAULT_HEADERS.copy()
     if headers:
         req_headers.update(headers)
+    req_headers.update(profile.auth_headers())
     if files:
         req_headers.pop("Content-Type", None)
 
 
     try:
-        # Use production HTTP client with retry logic
-        async with http_client:
-            # For DELETE requests without JSON, don't pass json parameter at all
-            request_kwargs = {
-                "method": method,
-                "url": url,
-                "headers": req_headers,
-                "params": params,
-                "data": data,
-                "files": files,
-                "timeout": timeout or config.REQUEST_TIMEOUT
-            }
-            
-            # Only add json parameter if it's not None
-            if json is not None:
-                request_kwargs["json"] = json
-            
-            resp = await http_client.request_with_retry(**request_kwargs)
+        # Use the shared production HTTP client (pool lives for the server lifespan)
+        # For DELETE requests without JSON, don't pass json parameter at all
+        request_kwargs = {
+            "method": method,
+            "url": url,
+            "headers": req_headers,
+            "params": params,
+            "data": data,
+            "files": files,
+            "timeout": timeout or config.REQUEST_TIMEOUT,
+            "idempotent": idempotent,
+            "priority": priority,
+            "profile": profile.name
+        }
+        
+        # Only send a body if there is one; encoded with the configured JSON codec
+        if json is not None:
+            request_kwargs["content"] = _json_dumps(json)
+        
+        resp = None
+        key = None
+        route, path_params = _parse_route(endpoint)
+        ttl = response_cache.ttl_for(method, route) if config.RESPONSE_CACHE_ENABLED else None
+        disk_ttl = persistent_cache.ttl_for(method, route) if config.PERSISTENT_CACHE_ENABLED else None
+        if ttl is not None or disk_ttl is not None:
+            key = _request_key(method, url, params, req_headers)
+            if cache_mode == "bypass":
+                response_cache.bypasses += 1
+                ttl = disk_ttl = None
+                metrics.inc("discordbot_cache_lookups_total", result="bypass")
+            elif cache_mode == "refresh":
+                response_cache.refreshes += 1
+                metrics.inc("discordbot_cache_lookups_total", result="refresh")
+            else:
+                resp = response_cache.get(key) if ttl is not None else None
+                lookup = "memory"
+                if resp is None and disk_ttl is not None:
+                    resp, fresh_for, validators = await persistent_cache.lookup(key)
+                    lookup = "disk"
+                    if resp is not None and ttl is not None:
+                        response_cache.put(key, route, resp, min(ttl, fresh_for), path_params)
+                    elif validators:
+                        request_kwargs["headers"] = {**req_headers, **validators}
+                metrics.inc("discordbot_cache_lookups_total", result=lookup if resp is not None else "miss")
+        
+        async def fetch() -> httpx.Response:
+            response = await http_client.request_with_retry(**request_kwargs)
+            if response.status_code == 304 and disk_ttl is not None:
+                # The expired copy on disk is still current
+                response = await persistent_cache.renew(key, disk_ttl) or response
+            elif disk_ttl is not None and response.status_code == 200:
+                await persistent_cache.put(key, route, response, disk_ttl, path_params)
+            if ttl is not None and response.status_code == 200:
+                response_cache.put(key, route, response, ttl, path_params)
+            return response
+        
+        is_write = method.upper() != "GET" and (config.RESPONSE_CACHE_ENABLED or config.PERSISTENT_CACHE_ENABLED)
+        _set_span_attributes(**{"discord.cache_hit": resp is not None})
+        if resp is None:
+            if method.upper() == "GET" and config.SINGLE_FLIGHT_ENABLED:
+                # Identical concurrent reads share one request to Discord
+                key = key or _request_key(method, url, params, req_headers)
+                resp = await single_flight.do(key, fetch)
+            elif is_write:
+                try:
+                    resp = await fetch()
+                except Exception:
+                    # The write may still have been applied
+                    await response_cache.apply_write(method, route, path_params, None, req_headers)
+                    raise
+            else:
+                resp = await fetch()
         
         status = resp.status_code
+        _set_span_attributes(**{"http.response.status_code": status})
+        
+        # A rejected write changed nothing; anything else may have
+        if is_write and not 400 <= status < 500:
+            await response_cache.apply_write(method, route, path_params,
+                                             resp if status < 300 else None, req_headers)
         
 
         # Handle successful responses
         if status in (200, 201):
+            if passthrough and field_selection is None and config.RAW_JSON_PASSTHROUGH and \
+                    resp.headers.get("Content-Type", "").startswith("application/json"):
+                return TextContent(type="text", text=resp.content.decode("utf-8"))
             try:
-                result = resp.json()
-                return result
+                decode_started = time.time_ns()
+                result = _json_loads(resp.content)
+                metrics.observe("discordbot_request_phase_seconds", (time.time_ns() - decode_started) / 1e9,
+                                phase="decode")
+                _record_span("decode", decode_started, **{"http.response.body.size": len(resp.content)})
             except Exception as e:
                 return {"status": status, "text": resp.text, "request_id": request_id}
+            return _project(result, field_selection) if field_selection else result
         
         if status == 204:
             return {"status": 204, "detail": "No content", "request_id": request_id}
 
         # Handle error responses
-        try:
-            error_data = resp.json()
-            
-            # Handle rate limiting
-            if status == 429:
-                retry_after = error_data.get("retry_after", 1)
-                raise RuntimeError(f"Rate limited: retry after {retry_after}s")
-            
-            raise RuntimeError(f"Discord API Error {status}: {error_data}")
-            
-        except ValueError:
-            raise RuntimeError(f"Discord API Error {status}: {resp.text}")
+        raise DiscordHTTPError.from_response(resp, request_id)
 
     except Exception as e:
+        if isinstance(e, DiscordHTTPError) and e.request_id is None:
+            e.request_id = request_id
+        _end_span(span, e)
+        span = None
         raise
+    finally:
+        _end_span(span)
 
 async def _handle_file_upload(files: Optional[List[Union[str, BinaryIO]]],
                               payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -395,7 +3815,7 @@ async def _handle_file_upload(files: Optional[List[Union[str, BinaryIO]]],
 
         # Convert payload to JSON string for multipart
         if payload:
-            multipart["payload_json"] = (None, json.dumps(payload))
+            multipart["payload_json"] = (None, _json_dumps(payload))
 
         return multipart
         
@@ -610,7 +4030,8 @@ async def DISCORDBOT_UPDATE_APPLICATION_COMMAND(application_id: str, command_id:
     return await discord_request("PATCH", f"/applications/{application_id}/commands/{command_id}", json=payload)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_APPLICATION_COMMANDS(application_id: str, with_localizations: Optional[bool] = None) -> Any:
+async def DISCORDBOT_LIST_APPLICATION_COMMANDS(application_id: str, with_localizations: Optional[bool] = None,
+                                              cache_mode: str = "default", fields: str = "") -> Any:
     """Fetch all global commands for an application.
     
     This tool retrieves a list of all global slash commands registered for your Discord application.
@@ -621,6 +4042,10 @@ async def DISCORDBOT_LIST_APPLICATION_COMMANDS(application_id: str, with_localiz
     - with_localizations (bool): Whether to include localization data in the response (optional)
         * True: Include localized names and descriptions
         * False/None: Return only default language data
+    - cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+      "refresh" fetches and re-caches (default: "default")
+    - fields (str): Comma-separated dotted paths to keep (e.g. "id,name,options.name") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - list: Array of application command objects, each containing:
@@ -660,10 +4085,11 @@ async def DISCORDBOT_LIST_APPLICATION_COMMANDS(application_id: str, with_localiz
     params = _filter_none({
         "with_localizations": with_localizations
     })
-    return await discord_request("GET", f"/applications/{application_id}/commands", params=params)
+    return await discord_request("GET", f"/applications/{application_id}/commands", params=params, cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_GET_APPLICATION_COMMAND(application_id: str, command_id: str) -> Any:
+async def DISCORDBOT_GET_APPLICATION_COMMAND(application_id: str, command_id: str,
+                                             cache_mode: str = "default", fields: str = "") -> Any:
     """Fetch a specific global application command by its ID.
     
     This tool retrieves detailed information about a single global slash command.
@@ -672,6 +4098,10 @@ async def DISCORDBOT_GET_APPLICATION_COMMAND(application_id: str, command_id: st
     Parameters:
     - application_id (str): The unique identifier of your Discord application/bot (required)
     - command_id (str): The unique identifier of the command to fetch (required)
+    - cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+      "refresh" fetches and re-caches (default: "default")
+    - fields (str): Comma-separated dotted paths to keep (e.g. "name,options.name") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - dict: Application command object on success containing:
@@ -705,7 +4135,7 @@ async def DISCORDBOT_GET_APPLICATION_COMMAND(application_id: str, command_id: st
     """
     application_id = _validate_snowflake(application_id, "Application ID")
     command_id = _validate_snowflake(command_id, "Command ID")
-    return await discord_request("GET", f"/applications/{application_id}/commands/{command_id}")
+    return await discord_request("GET", f"/applications/{application_id}/commands/{command_id}", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_CREATE_GUILD_APPLICATION_COMMAND(application_id: str, guild_id: str, name: str, description: str,
@@ -923,7 +4353,8 @@ async def DISCORDBOT_UPDATE_GUILD_APPLICATION_COMMAND(application_id: str, guild
     return await discord_request("PATCH", f"/applications/{application_id}/guilds/{guild_id}/commands/{command_id}", json=payload)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_APPLICATION_COMMAND(application_id: str, guild_id: str, command_id: str) -> Any:
+async def DISCORDBOT_GET_GUILD_APPLICATION_COMMAND(application_id: str, guild_id: str, command_id: str,
+                                                   cache_mode: str = "default", fields: str = "") -> Any:
     """Fetch a specific guild application command by its ID.
     
     This tool retrieves detailed information about a single guild-specific slash command.
@@ -933,6 +4364,10 @@ async def DISCORDBOT_GET_GUILD_APPLICATION_COMMAND(application_id: str, guild_id
     - application_id (str): The unique identifier of your Discord application/bot (required)
     - guild_id (str): The unique identifier of the Discord server where the command exists (required)
     - command_id (str): The unique identifier of the command to fetch (required)
+    - cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+      "refresh" fetches and re-caches (default: "default")
+    - fields (str): Comma-separated dotted paths to keep (e.g. "name,default_member_permissions") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - dict: Guild application command object on success containing:
@@ -970,10 +4405,11 @@ async def DISCORDBOT_GET_GUILD_APPLICATION_COMMAND(application_id: str, guild_id
     application_id = _validate_snowflake(application_id, "Application ID")
     guild_id = _validate_guild_id(guild_id)
     command_id = _validate_snowflake(command_id, "Command ID")
-    return await discord_request("GET", f"/applications/{application_id}/guilds/{guild_id}/commands/{command_id}")
+    return await discord_request("GET", f"/applications/{application_id}/guilds/{guild_id}/commands/{command_id}", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_GUILD_APPLICATION_COMMANDS(application_id: str, guild_id: str, with_localizations: bool = False) -> Any:
+async def DISCORDBOT_LIST_GUILD_APPLICATION_COMMANDS(application_id: str, guild_id: str, with_localizations: bool = False,
+                                                    cache_mode: str = "default", fields: str = "") -> Any:
     """Fetch all guild-specific commands for an application.
     
     This tool retrieves a list of all guild-specific slash commands registered for your Discord application
@@ -985,6 +4421,10 @@ async def DISCORDBOT_LIST_GUILD_APPLICATION_COMMANDS(application_id: str, guild_
     - with_localizations (bool): Whether to include localization data in the response (default: false)
         * True: Include localized names and descriptions
         * False: Return only default language data
+    - cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+      "refresh" fetches and re-caches (default: "default")
+    - fields (str): Comma-separated dotted paths to keep (e.g. "id,name") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - list: Array of guild application command objects, each containing:
@@ -1028,10 +4468,11 @@ async def DISCORDBOT_LIST_GUILD_APPLICATION_COMMANDS(application_id: str, guild_
     params = _filter_none({
         "with_localizations": with_localizations if with_localizations else None
     })
-    return await discord_request("GET", f"/applications/{application_id}/guilds/{guild_id}/commands", params=params)
+    return await discord_request("GET", f"/applications/{application_id}/guilds/{guild_id}/commands", params=params, cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_APPLICATION_COMMAND_PERMISSIONS(application_id: str, guild_id: str, command_id: str) -> Any:
+async def DISCORDBOT_GET_GUILD_APPLICATION_COMMAND_PERMISSIONS(application_id: str, guild_id: str, command_id: str,
+                                                               fields: str = "") -> Any:
     """Get permissions for a specific command in a guild.
     
     This tool retrieves the permission settings for a guild-specific slash command.
@@ -1041,6 +4482,8 @@ async def DISCORDBOT_GET_GUILD_APPLICATION_COMMAND_PERMISSIONS(application_id: s
     - application_id (str): The unique identifier of your Discord application/bot (required)
     - guild_id (str): The unique identifier of the Discord server where the command exists (required)
     - command_id (str): The unique identifier of the command to get permissions for (required)
+    - fields (str): Comma-separated dotted paths to keep (e.g. "permissions.id,permissions.permission") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - dict: Command permissions object on success containing:
@@ -1077,12 +4520,13 @@ async def DISCORDBOT_GET_GUILD_APPLICATION_COMMAND_PERMISSIONS(application_id: s
     command_id = _validate_snowflake(command_id, "Command ID")
     
     try:
-        return await discord_request("GET", f"/applications/{application_id}/guilds/{guild_id}/commands/{command_id}/permissions")
+        return await discord_request("GET", f"/applications/{application_id}/guilds/{guild_id}/commands/{command_id}/permissions", fields=fields, passthrough=True)
     except Exception as e:
         return _handle_discord_error(e, "command permissions", command_id=command_id, guild_id=guild_id)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_GUILD_APPLICATION_COMMAND_PERMISSIONS(application_id: str, guild_id: str) -> Any:
+async def DISCORDBOT_LIST_GUILD_APPLICATION_COMMAND_PERMISSIONS(application_id: str, guild_id: str,
+                                                                fields: str = "") -> Any:
     """Get all permissions for all commands in a guild.
     
     This tool retrieves the permission settings for all guild-specific slash commands in a server.
@@ -1091,6 +4535,8 @@ async def DISCORDBOT_LIST_GUILD_APPLICATION_COMMAND_PERMISSIONS(application_id:
     Parameters:
     - application_id (str): The unique identifier of your Discord application/bot (required)
     - guild_id (str): The unique identifier of the Discord server to get permissions from (required)
+    - fields (str): Comma-separated dotted paths to keep (e.g. "id,permissions.id") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - list: Array of command permissions objects, each containing:
@@ -1124,12 +4570,12 @@ async def DISCORDBOT_LIST_GUILD_APPLICATION_COMMAND_PERMISSIONS(application_id:
     application_id = _validate_snowflake(application_id, "Application ID")
     guild_id = _validate_guild_id(guild_id)
     try:
-     return await discord_request("GET", f"/applications/{application_id}/guilds/{guild_id}/commands/permissions")
+     return await discord_request("GET", f"/applications/{application_id}/guilds/{guild_id}/commands/permissions", fields=fields, passthrough=True)
     except Exception as e:
         return _handle_discord_error(e, "guild command permissions", guild_id=guild_id)
 
 @mcp.tool()
-async def DISCORDBOT_GET_APPLICATION(application_id: str) -> Any:
+async def DISCORDBOT_GET_APPLICATION(application_id: str, cache_mode: str = "default", fields: str = "") -> Any:
     """Get information about a Discord application.
     
     This tool retrieves detailed information about a Discord application, including its name,
@@ -1137,6 +4583,10 @@ async def DISCORDBOT_GET_APPLICATION(application_id: str) -> Any:
     
     Parameters:
     - application_id (str): The unique identifier of the Discord application to fetch (required)
+    - cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+      "refresh" fetches and re-caches (default: "default")
+    - fields (str): Comma-separated dotted paths to keep (e.g. "name,owner.username") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - dict: Application object on success containing:
@@ -1178,7 +4628,7 @@ async def DISCORDBOT_GET_APPLICATION(application_id: str) -> Any:
     """
     application_id = _validate_snowflake(application_id, "Application ID")
     try:
-        return await discord_request("GET", f"/applications/{application_id}")
+        return await discord_request("GET", f"/applications/{application_id}", cache_mode=cache_mode, fields=fields, passthrough=True)
     except Exception as e:
         return _handle_discord_error(e, "application", application_id=application_id)
 
@@ -1266,13 +4716,19 @@ async def DISCORDBOT_UPDATE_APPLICATION(application_id: str, name: str = "", des
         return _handle_discord_error(e, "application update", application_id=application_id)
 
 @mcp.tool()
-async def DISCORDBOT_GET_MY_APPLICATION() -> Any:
+async def DISCORDBOT_GET_MY_APPLICATION(cache_mode: str = "default", fields: str = "") -> Any:
     """Get information about the current authenticated application.
     
     This tool retrieves detailed information about your own Discord application (the one associated
     with the bot token being used). Useful for getting your application's details, validating settings,
     or checking application metadata.
     
+    Parameters:
+    - cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+      "refresh" fetches and re-caches (default: "default")
+    - fields (str): Comma-separated dotted paths to keep (e.g. "name,approximate_guild_count") or a
+      preset: "ids", "summary" or "full" (default: the full object)
+    
     Returns:
     - dict: Application object on success containing:
         * id: Application ID
@@ -1311,7 +4767,7 @@ async def DISCORDBOT_GET_MY_APPLICATION() -> Any:
     ```
     """
     try:
-        return await discord_request("GET", "/applications/@me")
+        return await discord_request("GET", "/applications/@me", cache_mode=cache_mode, fields=fields, passthrough=True)
     except Exception as e:
         return _handle_discord_error(e, "my application")
 
@@ -1361,19 +4817,19 @@ async def DISCORDBOT_UPDATE_MY_APPLICATION(name: str = "", description: str = ""
         return _handle_discord_error(e, "my application update")
 
 @mcp.tool()
-async def DISCORDBOT_GET_MY_OAUTH2_APPLICATION() -> Any:
+async def DISCORDBOT_GET_MY_OAUTH2_APPLICATION(fields: str = "") -> Any:
     """Get information about the current OAuth2 application."""
     try:
-     return await discord_request("GET", "/oauth2/applications/@me")
+     return await discord_request("GET", "/oauth2/applications/@me", fields=fields, passthrough=True)
     except Exception as e:
         return _handle_discord_error(e, "OAuth2 application")
 
 @mcp.tool()
-async def DISCORDBOT_GET_APPLICATION_ROLE_CONNECTIONS_METADATA(application_id: str) -> Any:
+async def DISCORDBOT_GET_APPLICATION_ROLE_CONNECTIONS_METADATA(application_id: str, fields: str = "") -> Any:
     """Get role connection metadata records for an application."""
     application_id = _validate_snowflake(application_id, "Application ID")
     try:
-     return await discord_request("GET", f"/applications/{application_id}/role-connections/metadata")
+     return await discord_request("GET", f"/applications/{application_id}/role-connections/metadata", fields=fields, passthrough=True)
     except Exception as e:
         return _handle_discord_error(e, "role connections metadata", application_id=application_id)
 
@@ -1415,7 +4871,7 @@ async def DISCORDBOT_UPDATE_APPLICATION_USER_ROLE_CONNECTION(application_id: str
         return _handle_discord_error(e, "user role connection", application_id=application_id)
 
 @mcp.tool()
-async def DISCORDBOT_GET_APPLICATION_USER_ROLE_CONNECTION(application_id: str) -> Any:
+async def DISCORDBOT_GET_APPLICATION_USER_ROLE_CONNECTION(application_id: str, fields: str = "") -> Any:
     """Get the current user's role connection metadata.
     
     Note: This endpoint requires OAuth2 application authentication, not bot token.
@@ -1423,9 +4879,10 @@ async def DISCORDBOT_GET_APPLICATION_USER_ROLE_CONNECTION(application_id: str) -
     """
     application_id = _validate_snowflake(application_id, "Application ID")
     try:
-        return await discord_request("GET", f"/users/@me/applications/{application_id}/role-connection")
+        return await discord_request("GET", f"/users/@me/applications/{application_id}/role-connection", fields=fields, passthrough=True)
     except Exception as e:
-        if "403" in str(e) or "Bots cannot use this endpoint" in str(e):
+        # 20001: Bots cannot use this endpoint
+        if isinstance(e, DiscordForbiddenError) or (isinstance(e, DiscordHTTPError) and e.code == 20001):
             return {
                 "error": "This endpoint requires OAuth2 application authentication",
                 "message": "The /users/@me/applications/{application_id}/role-connection endpoint is not accessible with bot tokens",
@@ -1436,7 +4893,7 @@ async def DISCORDBOT_GET_APPLICATION_USER_ROLE_CONNECTION(application_id: str) -
 
 # ---------------- CHANNEL & THREAD MANAGEMENT (26 tools) ----------------
 @mcp.tool()
-async def DISCORDBOT_GET_CHANNEL(channel_id: str) -> Any:
+async def DISCORDBOT_GET_CHANNEL(channel_id: str, cache_mode: str = "default", fields: str = "") -> Any:
     """Get detailed information about a Discord channel.
     
     This tool retrieves comprehensive information about a Discord channel including its type,
@@ -1444,6 +4901,10 @@ async def DISCORDBOT_GET_CHANNEL(channel_id: str) -> Any:
     
     Parameters:
     - channel_id (str): The unique identifier of the channel to retrieve (required)
+    - cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+      "refresh" fetches and re-caches (default: "default")
+    - fields (str): Comma-separated dotted paths to keep (e.g. "name,topic,permission_overwrites.id") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - dict: Channel object on success containing:
@@ -1507,7 +4968,7 @@ async def DISCORDBOT_GET_CHANNEL(channel_id: str) -> Any:
     ```
     """
     channel_id = _validate_channel_id(channel_id)
-    return await discord_request("GET", f"/channels/{channel_id}")
+    return await discord_request("GET", f"/channels/{channel_id}", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_CREATE_GUILD_CHANNEL(guild_id: str, name: str, type: int = 0,
@@ -1770,7 +5231,7 @@ async def DISCORDBOT_DELETE_CHANNEL(channel_id: str) -> Any:
     try:
         return await discord_request("DELETE", f"/channels/{channel_id}", headers=headers)
     except Exception as e:
-        if "404" in str(e) or "Unknown channel" in str(e):
+        if isinstance(e, DiscordNotFoundError):
             return {
                 "error": "Channel not found",
                 "message": "The channel either doesn't exist or has already been deleted",
@@ -1781,7 +5242,7 @@ async def DISCORDBOT_DELETE_CHANNEL(channel_id: str) -> Any:
         raise
 
 @mcp.tool()
-async def DISCORDBOT_LIST_GUILD_CHANNELS(guild_id: str) -> Any:
+async def DISCORDBOT_LIST_GUILD_CHANNELS(guild_id: str, cache_mode: str = "default", fields: str = "") -> Any:
     """Get a list of all channels in a Discord server.
     
     This tool retrieves all channels in a Discord server including text channels, voice channels,
@@ -1789,6 +5250,10 @@ async def DISCORDBOT_LIST_GUILD_CHANNELS(guild_id: str) -> Any:
     
     Parameters:
     - guild_id (str): The unique identifier of the Discord server to list channels from (required)
+    - cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+      "refresh" fetches and re-caches (default: "default")
+    - fields (str): Comma-separated dotted paths to keep (e.g. "id,name,parent_id") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - list: Array of channel objects, each containing:
@@ -1836,7 +5301,7 @@ async def DISCORDBOT_LIST_GUILD_CHANNELS(guild_id: str) -> Any:
     ```
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/channels")
+    return await discord_request("GET", f"/guilds/{guild_id}/channels", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_CREATE_CHANNEL_INVITE(channel_id: str, max_age: int = 0, max_uses: int = 0,
@@ -1880,7 +5345,7 @@ async def DISCORDBOT_CREATE_CHANNEL_INVITE(channel_id: str, max_age: int = 0, ma
     return await discord_request("POST", f"/channels/{channel_id}/invites", json=payload, headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_CHANNEL_INVITES(channel_id: str) -> Any:
+async def DISCORDBOT_LIST_CHANNEL_INVITES(channel_id: str, fields: str = "") -> Any:
     """
     Retrieves a list of all invite links for a Discord channel.
 
@@ -1888,12 +5353,14 @@ async def DISCORDBOT_LIST_CHANNEL_INVITES(channel_id: str) -> Any:
 
     Args:
         channel_id (str): The ID of the channel to list invites for.
+        fields (str): Comma-separated dotted paths to keep (e.g. "code,inviter.username") or a
+            preset: "ids", "summary" or "full" (default: the full object).
 
     Returns:
         dict: List of invite objects containing invite details.
     """
     channel_id = _validate_channel_id(channel_id)
-    return await discord_request("GET", f"/channels/{channel_id}/invites")
+    return await discord_request("GET", f"/channels/{channel_id}/invites", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_SET_CHANNEL_PERMISSION_OVERWRITE(channel_id: str, overwrite_id: str, allow: str = "",
@@ -1950,7 +5417,7 @@ async def DISCORDBOT_DELETE_CHANNEL_PERMISSION_OVERWRITE(channel_id: str, overwr
     try:
         return await discord_request("DELETE", f"/channels/{channel_id}/permissions/{overwrite_id}", headers=headers)
     except Exception as e:
-        if "404" in str(e) or "Unknown channel permission overwrite" in str(e):
+        if isinstance(e, DiscordNotFoundError):
             return {
                 "error": "Channel permission overwrite not found",
                 "message": "The overwrite either doesn't exist or has already been deleted",
@@ -2083,11 +5550,11 @@ async def DISCORDBOT_LEAVE_THREAD(channel_id: str) -> Any:
     return await discord_request("DELETE", f"/channels/{channel_id}/thread-members/@me")
 
 @mcp.tool()
-async def DISCORDBOT_GET_THREAD_MEMBER(channel_id: str, user_id: str) -> Any:
+async def DISCORDBOT_GET_THREAD_MEMBER(channel_id: str, user_id: str, fields: str = "") -> Any:
     """Returns a thread member object for the specified user."""
     channel_id = _validate_channel_id(channel_id)
     user_id = _validate_user_id(user_id)
-    return await discord_request("GET", f"/channels/{channel_id}/thread-members/{user_id}")
+    return await discord_request("GET", f"/channels/{channel_id}/thread-members/{user_id}", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_DELETE_THREAD_MEMBER(channel_id: str, user_id: str) -> Any:
@@ -2098,7 +5565,7 @@ async def DISCORDBOT_DELETE_THREAD_MEMBER(channel_id: str, user_id: str) -> Any:
 
 @mcp.tool()
 async def DISCORDBOT_LIST_THREAD_MEMBERS(channel_id: str, with_member: bool = False,
-                                         after: str = "", limit: int = 0) -> Any:
+                                         after: str = "", limit: int = 0, fields: str = "") -> Any:
     """Returns array of thread members objects that are members of the thread.
     
     Parameters:
@@ -2106,6 +5573,8 @@ async def DISCORDBOT_LIST_THREAD_MEMBERS(channel_id: str, with_member: bool = Fa
     - with_member: Whether to include the guild member object for each thread member
     - after: Get thread members after this user ID
     - limit: Maximum number of thread members to return (0 = default)
+    - fields (str): Comma-separated dotted paths to keep (e.g. "user_id,member.nick") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     """
     channel_id = _validate_channel_id(channel_id)
     params = _filter_none({
@@ -2113,64 +5582,70 @@ async def DISCORDBOT_LIST_THREAD_MEMBERS(channel_id: str, with_member: bool = Fa
         "after": after if after else None,
         "limit": limit if limit > 0 else None
     })
-    return await discord_request("GET", f"/channels/{channel_id}/thread-members", params=params)
+    return await discord_request("GET", f"/channels/{channel_id}/thread-members", params=params, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_LIST_PUBLIC_ARCHIVED_THREADS(channel_id: str, before: str = "",
-                                                  limit: int = 0) -> Any:
+                                                  limit: int = 0, fields: str = "") -> Any:
     """Returns archived threads in the channel that are public.
     
     Parameters:
     - channel_id: ID of the channel (required)
     - before: Get threads before this thread ID
     - limit: Maximum number of threads to return (0 = default)
+    - fields (str): Comma-separated dotted paths to keep (e.g. "threads.name,has_more") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     """
     channel_id = _validate_channel_id(channel_id)
     params = _filter_none({
         "before": before if before else None,
         "limit": limit if limit > 0 else None
     })
-    return await discord_request("GET", f"/channels/{channel_id}/threads/archived/public", params=params)
+    return await discord_request("GET", f"/channels/{channel_id}/threads/archived/public", params=params, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_LIST_PRIVATE_ARCHIVED_THREADS(channel_id: str, before: str = "",
-                                                   limit: int = 0) -> Any:
+                                                   limit: int = 0, fields: str = "") -> Any:
     """Returns archived threads in the channel that are of type GUILD_PRIVATE_THREAD.
     
     Parameters:
     - channel_id: ID of the channel (required)
     - before: Get threads before this thread ID
     - limit: Maximum number of threads to return (0 = default)
+    - fields (str): Comma-separated dotted paths to keep (e.g. "threads.name,has_more") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     """
     channel_id = _validate_channel_id(channel_id)
     params = _filter_none({
         "before": before if before else None,
         "limit": limit if limit > 0 else None
     })
-    return await discord_request("GET", f"/channels/{channel_id}/threads/archived/private", params=params)
+    return await discord_request("GET", f"/channels/{channel_id}/threads/archived/private", params=params, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_LIST_MY_PRIVATE_ARCHIVED_THREADS(channel_id: str, before: str = "",
-                                                      limit: int = 0) -> Any:
+                                                      limit: int = 0, fields: str = "") -> Any:
     """Returns archived threads in the channel that are of type GUILD_PRIVATE_THREAD.
     
     Parameters:
     - channel_id: ID of the channel (required)
     - before: Get threads before this thread ID
     - limit: Maximum number of threads to return (0 = default)
+    - fields (str): Comma-separated dotted paths to keep (e.g. "threads.name,has_more") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     """
     channel_id = _validate_channel_id(channel_id)
     params = _filter_none({
         "before": before if before else None,
         "limit": limit if limit > 0 else None
     })
-    return await discord_request("GET", f"/channels/{channel_id}/users/@me/threads/archived/private", params=params)
+    return await discord_request("GET", f"/channels/{channel_id}/users/@me/threads/archived/private", params=params, fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_GET_ACTIVE_GUILD_THREADS(guild_id: str) -> Any:
+async def DISCORDBOT_GET_ACTIVE_GUILD_THREADS(guild_id: str, fields: str = "") -> Any:
     """Returns all active threads in the guild."""
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/threads/active")
+    return await discord_request("GET", f"/guilds/{guild_id}/threads/active", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_CREATE_STAGE_INSTANCE(channel_id: str, topic: str, privacy_level: int = 1,
@@ -2197,10 +5672,10 @@ async def DISCORDBOT_CREATE_STAGE_INSTANCE(channel_id: str, topic: str, privacy_
     return await discord_request("POST", f"/stage-instances", json=payload, headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_GET_STAGE_INSTANCE(channel_id: str) -> Any:
+async def DISCORDBOT_GET_STAGE_INSTANCE(channel_id: str, fields: str = "") -> Any:
     """Gets the stage instance associated with a stage channel."""
     channel_id = _validate_channel_id(channel_id)
-    return await discord_request("GET", f"/stage-instances/{channel_id}")
+    return await discord_request("GET", f"/stage-instances/{channel_id}", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_STAGE_INSTANCE(channel_id: str, topic: str = "",
@@ -2261,7 +5736,7 @@ async def DISCORDBOT_UPDATE_SELF_VOICE_STATE(guild_id: str, channel_id: str = ""
     try:
         return await discord_request("PATCH", f"/guilds/{guild_id}/voice-states/@me", json=payload, headers=headers)
     except Exception as e:
-        if "404" in str(e) and "Unknown Voice State" in str(e):
+        if isinstance(e, DiscordNotFoundError) and e.code == 10065:  # Unknown Voice State
             return {
                 "error": "Bot not in voice channel",
                 "message": "The bot must be connected to a voice channel to update its voice state",
@@ -2297,7 +5772,7 @@ async def DISCORDBOT_UPDATE_VOICE_STATE(guild_id: str, user_id: str, channel_id:
     try:
         return await discord_request("PATCH", f"/guilds/{guild_id}/voice-states/{user_id}", json=payload, headers=headers)
     except Exception as e:
-        if "404" in str(e) and "Unknown Voice State" in str(e):
+        if isinstance(e, DiscordNotFoundError) and e.code == 10065:  # Unknown Voice State
             return {
                 "error": "User not in voice channel",
                 "message": "The user must be connected to a voice channel to update their voice state",
@@ -2308,12 +5783,16 @@ async def DISCORDBOT_UPDATE_VOICE_STATE(guild_id: str, user_id: str, channel_id:
 
 # ---------------- GATEWAY & CONNECTION (3 tools) ----------------
 @mcp.tool()
-async def DISCORDBOT_GET_GATEWAY() -> Any:
+async def DISCORDBOT_GET_GATEWAY(fields: str = "") -> Any:
     """Get the Discord gateway URL and recommended shard count.
     
     This tool retrieves the WebSocket gateway URL and recommended number of shards
     for connecting to Discord's gateway. Essential for bot development and gateway connections.
     
+    Parameters:
+    - fields (str): Comma-separated dotted paths to keep (e.g. "url") or a
+      preset: "summary" or "full" (default: the full object)
+    
     Returns:
     - dict: Gateway information containing:
         * url: WebSocket gateway URL
@@ -2332,15 +5811,19 @@ async def DISCORDBOT_GET_GATEWAY() -> Any:
         print(f"Error: {gateway['error']}")
     ```
     """
-    return await discord_request("GET", "/gateway")
+    return await discord_request("GET", "/gateway", fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_GET_BOT_GATEWAY() -> Any:
+async def DISCORDBOT_GET_BOT_GATEWAY(fields: str = "") -> Any:
     """Get the Discord gateway URL and recommended shard count for bots.
     
     This tool retrieves the WebSocket gateway URL and recommended number of shards
     specifically for bot connections. Includes additional bot-specific information.
     
+    Parameters:
+    - fields (str): Comma-separated dotted paths to keep (e.g. "shards,session_start_limit.remaining") or a
+      preset: "summary" or "full" (default: the full object)
+    
     Returns:
     - dict: Bot gateway information containing:
         * url: WebSocket gateway URL
@@ -2361,19 +5844,20 @@ async def DISCORDBOT_GET_BOT_GATEWAY() -> Any:
         print(f"Error: {bot_gateway['error']}")
     ```
     """
-    return await discord_request("GET", "/gateway/bot")
+    return await discord_request("GET", "/gateway/bot", fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_GET_PUBLIC_KEYS() -> Any:
+async def DISCORDBOT_GET_PUBLIC_KEYS(fields: str = "") -> Any:
     """Get public keys for verifying interaction payloads."""
-    return await discord_request("GET", "/oauth2/keys")
+    return await discord_request("GET", "/oauth2/keys", fields=fields, passthrough=True)
 
 # ---------------- MESSAGE MANAGEMENT (16 tools) ----------------
 @mcp.tool()
 async def DISCORDBOT_CREATE_MESSAGE(channel_id: str, content: str = "", nonce: int = 0,
                                    tts: bool = False, embeds: str = "", allowed_mentions: str = "",
                                    message_reference: str = "", components: str = "", sticker_ids: str = "",
-                                   files: str = "", attachments: str = "", flags: int = 0, poll: str = "") -> Any:
+                                   files: str = "", attachments: str = "", flags: int = 0, poll: str = "",
+                                   enforce_nonce: bool = True) -> Any:
     """Send a message to a Discord channel.
     
     This tool sends a message to a Discord channel with support for text, embeds, files, components,
@@ -2382,7 +5866,8 @@ async def DISCORDBOT_CREATE_MESSAGE(channel_id: str, content: str = "", nonce: i
     Parameters:
     - channel_id (str): The unique identifier of the target channel (required)
     - content (str): Message text content (max 2000 characters, optional)
-    - nonce (int): Unique integer to confirm message sending (optional)
+    - nonce (int): Unique integer to confirm message sending (optional). When omitted and
+      AUTO_MESSAGE_NONCE is enabled, a nonce is generated for this send
     - tts (bool): Send as text-to-speech message (optional)
     - embeds (str): JSON string of embed objects (max 10, 6000 chars total, optional)
     - allowed_mentions (str): JSON string for mention controls (optional)
@@ -2393,6 +5878,9 @@ async def DISCORDBOT_CREATE_MESSAGE(channel_id: str, content: str = "", nonce: i
     - attachments (str): JSON string of attachment objects (optional)
     - flags (int): Bitwise value for message flags (optional)
     - poll (str): JSON string of poll object (optional)
+    - enforce_nonce (bool): Ask Discord to deduplicate by nonce (default: true). Retries and
+      repeated sends with the same nonce within a few minutes return the original message
+      instead of posting a new one, which lets timed-out sends be retried safely
     
     Returns:
     - dict: Message object on success containing:
@@ -2474,9 +5962,13 @@ async def DISCORDBOT_CREATE_MESSAGE(channel_id: str, content: str = "", nonce: i
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON for {param_name}: {e}")
     
+    if nonce <= 0 and config.AUTO_MESSAGE_NONCE:
+        nonce = _generate_nonce()
+    
     payload = _filter_none({
         "content": _safe_str(content) if content else None,
         "nonce": nonce if nonce > 0 else None,
+        "enforce_nonce": True if nonce > 0 and enforce_nonce else None,
         "tts": tts if tts else None,
         "embeds": parse_json_param(embeds, "embeds"),
         "allowed_mentions": parse_json_param(allowed_mentions, "allowed_mentions"),
@@ -2494,10 +5986,12 @@ async def DISCORDBOT_CREATE_MESSAGE(channel_id: str, content: str = "", nonce: i
         multipart_data = await _handle_file_upload(files_list, payload)
         return await discord_request("POST", f"/channels/{channel_id}/messages", data=multipart_data)
     else:
-        return await discord_request("POST", f"/channels/{channel_id}/messages", json=payload)
+        # With an enforced nonce Discord deduplicates resends, so timeouts can be retried
+        return await discord_request("POST", f"/channels/{channel_id}/messages", json=payload,
+                                     idempotent=True if "enforce_nonce" in payload else None)
 
 @mcp.tool()
-async def DISCORDBOT_GET_MESSAGE(channel_id: str, message_id: str) -> Any:
+async def DISCORDBOT_GET_MESSAGE(channel_id: str, message_id: str, fields: str = "") -> Any:
     """Get a specific message from a Discord channel.
     
     This tool retrieves a single message by its ID from a Discord channel.
@@ -2506,6 +6000,8 @@ async def DISCORDBOT_GET_MESSAGE(channel_id: str, message_id: str) -> Any:
     Parameters:
     - channel_id (str): The unique identifier of the channel containing the message (required)
     - message_id (str): The unique identifier of the message to retrieve (required)
+    - fields (str): Comma-separated dotted paths to keep (e.g. "content,author.username") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - dict: Message object on success containing:
@@ -2563,7 +6059,7 @@ async def DISCORDBOT_GET_MESSAGE(channel_id: str, message_id: str) -> Any:
     """
     channel_id = _validate_channel_id(channel_id)
     message_id = _validate_message_id(message_id)
-    return await discord_request("GET", f"/channels/{channel_id}/messages/{message_id}")
+    return await discord_request("GET", f"/channels/{channel_id}/messages/{message_id}", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_MESSAGE(channel_id: str, message_id: str, content: str = "",
@@ -2680,7 +6176,7 @@ async def DISCORDBOT_DELETE_MESSAGE(channel_id: str, message_id: str) -> Any:
 
 @mcp.tool()
 async def DISCORDBOT_LIST_MESSAGES(channel_id: str, around: str = "", before: str = "",
-                                  after: str = "", limit: int = 50) -> Any:
+                                  after: str = "", limit: int = 50, fields: str = "") -> Any:
     """Get a list of messages from a Discord channel.
     
     This tool retrieves messages from a Discord channel with various filtering options.
@@ -2692,6 +6188,8 @@ async def DISCORDBOT_LIST_MESSAGES(channel_id: str, around: str = "", before: st
     - before (str): Get messages before this message ID (optional)
     - after (str): Get messages after this message ID (optional)
     - limit (int): Maximum number of messages to return (0-100, default: 50)
+    - fields (str): Comma-separated dotted paths to keep (e.g. "id,author.username") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - list: Array of message objects, each containing:
@@ -2749,7 +6247,7 @@ async def DISCORDBOT_LIST_MESSAGES(channel_id: str, around: str = "", before: st
         "after": after if after else None,
         "limit": limit if limit > 0 else None
     })
-    return await discord_request("GET", f"/channels/{channel_id}/messages", params=params)
+    return await discord_request("GET", f"/channels/{channel_id}/messages", params=params, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_PIN_MESSAGE(channel_id: str, message_id: str) -> Any:
@@ -2802,7 +6300,7 @@ async def DISCORDBOT_UNPIN_MESSAGE(channel_id: str, message_id: str) -> Any:
     return await discord_request("DELETE", f"/channels/{channel_id}/pins/{message_id}", headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_PINNED_MESSAGES(channel_id: str) -> Any:
+async def DISCORDBOT_LIST_PINNED_MESSAGES(channel_id: str, fields: str = "") -> Any:
     """Get all pinned messages from a Discord channel.
     
     This tool retrieves all pinned messages from a Discord channel. Pinned messages
@@ -2810,6 +6308,8 @@ async def DISCORDBOT_LIST_PINNED_MESSAGES(channel_id: str) -> Any:
     
     Parameters:
     - channel_id (str): The unique identifier of the channel to get pinned messages from (required)
+    - fields (str): Comma-separated dotted paths to keep (e.g. "id,content") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - list: Array of pinned message objects, each containing:
@@ -2849,7 +6349,7 @@ async def DISCORDBOT_LIST_PINNED_MESSAGES(channel_id: str) -> Any:
     ```
     """
     channel_id = _validate_channel_id(channel_id)
-    return await discord_request("GET", f"/channels/{channel_id}/pins")
+    return await discord_request("GET", f"/channels/{channel_id}/pins", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_ADD_MY_MESSAGE_REACTION(channel_id: str, message_id: str, emoji: str) -> Any:
@@ -2938,7 +6438,7 @@ async def DISCORDBOT_DELETE_ALL_MESSAGE_REACTIONS_BY_EMOJI(channel_id: str, mess
 
 @mcp.tool()
 async def DISCORDBOT_LIST_MESSAGE_REACTIONS_BY_EMOJI(channel_id: str, message_id: str, emoji: str,
-                                                    after: str = "", limit: int = 25) -> Any:
+                                                    after: str = "", limit: int = 25, fields: str = "") -> Any:
     """Get a list of users that reacted with this emoji.
     
     Parameters:
@@ -2947,6 +6447,8 @@ async def DISCORDBOT_LIST_MESSAGE_REACTIONS_BY_EMOJI(channel_id: str, message_id
     - emoji: Emoji to get reactions for (unicode emoji or custom emoji format)
     - after: Get users after this user ID
     - limit: Max number of users to return (1-100, default: 25)
+    - fields (str): Comma-separated dotted paths to keep (e.g. "id,username") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - list: List of user objects who reacted, or error information if failed
@@ -2958,7 +6460,7 @@ async def DISCORDBOT_LIST_MESSAGE_REACTIONS_BY_EMOJI(channel_id: str, message_id
         "after": after if after else None,  
         "limit": limit if limit > 0 else None
     })
-    return await discord_request("GET", f"/channels/{channel_id}/messages/{message_id}/reactions/{emoji}", params=params)
+    return await discord_request("GET", f"/channels/{channel_id}/messages/{message_id}/reactions/{emoji}", params=params, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_BULK_DELETE_MESSAGES(channel_id: str, messages: List[str]) -> Any:
@@ -3065,17 +6567,19 @@ async def DISCORDBOT_CREATE_AUTO_MODERATION_RULE(guild_id: str, name: str, event
     return await discord_request("POST", f"/guilds/{guild_id}/auto-moderation/rules", json=payload, headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_GET_AUTO_MODERATION_RULE(guild_id: str, rule_id: str) -> Any:
+async def DISCORDBOT_GET_AUTO_MODERATION_RULE(guild_id: str, rule_id: str,
+                                              cache_mode: str = "default", fields: str = "") -> Any:
     """Get a single auto moderation rule."""
     guild_id = _validate_guild_id(guild_id)
     rule_id = _validate_snowflake(rule_id, "Rule ID")
-    return await discord_request("GET", f"/guilds/{guild_id}/auto-moderation/rules/{rule_id}")
+    return await discord_request("GET", f"/guilds/{guild_id}/auto-moderation/rules/{rule_id}", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_AUTO_MODERATION_RULES(guild_id: str) -> Any:
+async def DISCORDBOT_LIST_AUTO_MODERATION_RULES(guild_id: str,
+                                                cache_mode: str = "default", fields: str = "") -> Any:
     """Get all auto moderation rules for a guild."""
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/auto-moderation/rules")
+    return await discord_request("GET", f"/guilds/{guild_id}/auto-moderation/rules", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_AUTO_MODERATION_RULE(guild_id: str, rule_id: str, name: str = "",
@@ -3176,7 +6680,8 @@ async def DISCORDBOT_BULK_BAN_USERS_FROM_GUILD(guild_id: str, user_ids: List[str
             errors.append({
                 "user_id": user_id,
                 "status": "error",
-                "error": str(e)
+                "error": str(e),
+                **({"http_status": e.status, **e.details()} if isinstance(e, DiscordHTTPError) else {})
             })
     
     return {
@@ -3282,7 +6787,7 @@ async def DISCORDBOT_UNBAN_USER_FROM_GUILD(guild_id: str, user_id: str, reason:
 
 # ---------------- USER & MEMBER MANAGEMENT (12 tools) ----------------
 @mcp.tool()
-async def DISCORDBOT_GET_USER(user_id: str) -> Any:
+async def DISCORDBOT_GET_USER(user_id: str, cache_mode: str = "default", fields: str = "") -> Any:
     """Get information about a Discord user.
     
     This tool retrieves detailed information about a Discord user including their username,
@@ -3290,6 +6795,10 @@ async def DISCORDBOT_GET_USER(user_id: str) -> Any:
     
     Parameters:
     - user_id (str): The unique identifier of the user to retrieve (required)
+    - cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+      "refresh" fetches and re-caches (default: "default")
+    - fields (str): Comma-separated dotted paths to keep (e.g. "username,global_name") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - dict: User object on success containing:
@@ -3329,7 +6838,7 @@ async def DISCORDBOT_GET_USER(user_id: str) -> Any:
     ```
     """
     user_id = _validate_user_id(user_id)
-    return await discord_request("GET", f"/users/{user_id}")
+    return await discord_request("GET", f"/users/{user_id}", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_MY_USER(username: str, avatar: str = "") -> Any:
@@ -3478,7 +6987,8 @@ async def DISCORDBOT_DELETE_GROUP_DM_USER(channel_id: str, user_id: str) -> Any:
     return await discord_request("DELETE", f"/channels/{channel_id}/recipients/{user_id}")
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_MEMBER(guild_id: str, user_id: str) -> Any:
+async def DISCORDBOT_GET_GUILD_MEMBER(guild_id: str, user_id: str, cache_mode: str = "default",
+                                      fields: str = "") -> Any:
     """Get information about a guild member.
     
     This tool retrieves detailed information about a user's membership in a specific Discord server,
@@ -3487,6 +6997,10 @@ async def DISCORDBOT_GET_GUILD_MEMBER(guild_id: str, user_id: str) -> Any:
     Parameters:
     - guild_id (str): The unique identifier of the Discord server (required)
     - user_id (str): The unique identifier of the user (required)
+    - cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+      "refresh" fetches and re-caches (default: "default")
+    - fields (str): Comma-separated dotted paths to keep (e.g. "nick,roles,user.username") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     
     Returns:
     - dict: Guild member object on success containing:
@@ -3524,23 +7038,25 @@ async def DISCORDBOT_GET_GUILD_MEMBER(guild_id: str, user_id: str) -> Any:
     """
     guild_id = _validate_guild_id(guild_id)
     user_id = _validate_user_id(user_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/members/{user_id}")
+    return await discord_request("GET", f"/guilds/{guild_id}/members/{user_id}", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_SEARCH_GUILD_MEMBERS(guild_id: str, query: str = "", limit: int = 0) -> Any:
+async def DISCORDBOT_SEARCH_GUILD_MEMBERS(guild_id: str, query: str = "", limit: int = 0, fields: str = "") -> Any:
     """Search for guild members based on query string.
     
     Parameters:
     - guild_id: ID of the guild (required)
     - query: Search query string (empty string = no filter)
     - limit: Maximum number of results (0 = default limit)
+    - fields (str): Comma-separated dotted paths to keep (e.g. "user.id,nick") or a
+      preset: "ids", "summary" or "full" (default: the full object)
     """
     guild_id = _validate_guild_id(guild_id)
     params = _filter_none({
         "query": _safe_str(query) if query else None,
         "limit": limit if limit > 0 else None
     })
-    return await discord_request("GET", f"/guilds/{guild_id}/members/search", params=params)
+    return await discord_request("GET", f"/guilds/{guild_id}/members/search", params=params, fields=fields, passthrough=True)
 
 # ---------------- EMOJI & STICKER MANAGEMENT (12 tools) ----------------
 @mcp.tool()
@@ -3593,18 +7109,23 @@ async def DISCORDBOT_CREATE_GUILD_EMOJI(guild_id: str, name: str, file_path: str
     return await discord_request("POST", f"/guilds/{guild_id}/emojis", json=payload, headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_EMOJI(guild_id: str, emoji_id: str) -> Any:
+async def DISCORDBOT_GET_GUILD_EMOJI(guild_id: str, emoji_id: str,
+                                     cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves a specific custom emoji from a Discord guild.
     Args:
         guild_id: The Discord guild (server) ID.
         emoji_id: The ID of the emoji to fetch.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "name,user.username") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     Returns:
         A dictionary containing emoji details.
     """
     guild_id = _validate_guild_id(guild_id)
     emoji_id = _validate_snowflake(emoji_id, "Emoji ID")
-    return await discord_request("GET", f"/guilds/{guild_id}/emojis/{emoji_id}")
+    return await discord_request("GET", f"/guilds/{guild_id}/emojis/{emoji_id}", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_GUILD_EMOJI(guild_id: str, emoji_id: str, name: Optional[str] = None,
@@ -3655,16 +7176,20 @@ async def DISCORDBOT_DELETE_GUILD_EMOJI(guild_id: str, emoji_id: str, reason: Op
     return await discord_request("DELETE", f"/guilds/{guild_id}/emojis/{emoji_id}", headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_GUILD_EMOJIS(guild_id: str) -> Any:
+async def DISCORDBOT_LIST_GUILD_EMOJIS(guild_id: str, cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves all custom emojis for a specified Discord guild.
     Args:
         guild_id: The Discord guild (server) ID.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "id,name") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     Returns:
         A dictionary containing a list of emojis and their details.
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/emojis")
+    return await discord_request("GET", f"/guilds/{guild_id}/emojis", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_CREATE_GUILD_STICKER(guild_id: str, name: str, description: str, tags: str,
@@ -3726,13 +7251,18 @@ async def DISCORDBOT_CREATE_GUILD_STICKER(guild_id: str, name: str, description:
     return await discord_request("POST", f"/guilds/{guild_id}/stickers", data=form_data, files=files, headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_STICKER(guild_id: str, sticker_id: str) -> Any:
+async def DISCORDBOT_GET_GUILD_STICKER(guild_id: str, sticker_id: str,
+                                       cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves a Discord sticker from a specified guild.
 
     Args:
         guild_id: The ID of the guild (server) where the sticker exists.
         sticker_id: The ID of the sticker to retrieve.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "name,tags") or a
+            preset: "ids", "summary" or "full" (default: the full object).
 
     Returns:
         dict containing:
@@ -3742,7 +7272,7 @@ async def DISCORDBOT_GET_GUILD_STICKER(guild_id: str, sticker_id: str) -> Any:
     """
     guild_id = _validate_guild_id(guild_id)
     sticker_id = _validate_snowflake(sticker_id, "Sticker ID")
-    return await discord_request("GET", f"/guilds/{guild_id}/stickers/{sticker_id}")
+    return await discord_request("GET", f"/guilds/{guild_id}/stickers/{sticker_id}", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_GUILD_STICKER(guild_id: str, sticker_id: str, name: Optional[str] = None,
@@ -3805,12 +7335,16 @@ async def DISCORDBOT_DELETE_GUILD_STICKER(guild_id: str, sticker_id: str, reason
     return await discord_request("DELETE", f"/guilds/{guild_id}/stickers/{sticker_id}", headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_GUILD_STICKERS(guild_id: str) -> Any:
+async def DISCORDBOT_LIST_GUILD_STICKERS(guild_id: str, cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves a list of all custom stickers in the specified Discord guild.
 
     Args:
         guild_id: ID of the Discord guild.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "id,name") or a
+            preset: "ids", "summary" or "full" (default: the full object).
 
     Returns:
         dict containing:
@@ -3819,28 +7353,38 @@ async def DISCORDBOT_LIST_GUILD_STICKERS(guild_id: str) -> Any:
             - error: error message if any
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/stickers")
+    return await discord_request("GET", f"/guilds/{guild_id}/stickers", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_STICKER_PACKS() -> Any:
+async def DISCORDBOT_LIST_STICKER_PACKS(cache_mode: str = "default", fields: str = "") -> Any:
     """
     Lists all standard sticker packs available to Nitro subscribers.
     
+    Args:
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the
+                          cache, "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "sticker_packs.name,sticker_packs.stickers.id") or a
+            preset: "ids", "summary" or "full" (default: the full object).
+    
     Returns:
         dict containing:
             - data: an object with a list of sticker packs and their stickers
             - successful: bool
             - error: error message if any
     """
-    return await discord_request("GET", "/sticker-packs")
+    return await discord_request("GET", "/sticker-packs", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_GET_STICKER(sticker_id: str) -> Any:
+async def DISCORDBOT_GET_STICKER(sticker_id: str, cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves a specific Discord sticker by its ID.
 
     Args:
         sticker_id: The unique ID of the sticker to retrieve.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "name,pack_id") or a
+            preset: "ids", "summary" or "full" (default: the full object).
 
     Returns:
         dict containing:
@@ -3849,7 +7393,7 @@ async def DISCORDBOT_GET_STICKER(sticker_id: str) -> Any:
             - error: error message if any
     """
     sticker_id = _validate_snowflake(sticker_id, "Sticker ID")
-    return await discord_request("GET", f"/stickers/{sticker_id}")
+    return await discord_request("GET", f"/stickers/{sticker_id}", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 # ---------------- WEBHOOK MANAGEMENT (17 tools) ----------------
 @mcp.tool()
@@ -3879,18 +7423,22 @@ async def DISCORDBOT_CREATE_WEBHOOK(channel_id: str, name: str, avatar: Optional
     return await discord_request("POST", f"/channels/{channel_id}/webhooks", json=payload, headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_GET_WEBHOOK(webhook_id: str) -> Any:
+async def DISCORDBOT_GET_WEBHOOK(webhook_id: str, cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves a webhook by its ID.
 
     Args:
         webhook_id (str): The ID of the webhook to retrieve.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "name,channel_id") or a
+            preset: "ids", "summary" or "full" (default: the full object).
 
     Returns:
         dict: Webhook object containing webhook details.
     """
     webhook_id = _validate_snowflake(webhook_id, "Webhook ID")
-    return await discord_request("GET", f"/webhooks/{webhook_id}")
+    return await discord_request("GET", f"/webhooks/{webhook_id}", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_WEBHOOK(webhook_id: str, name: Optional[str] = None, avatar: Optional[str] = None,
@@ -3942,19 +7490,21 @@ async def DISCORDBOT_DELETE_WEBHOOK(webhook_id: str, reason: Optional[str] = Non
     return await discord_request("DELETE", f"/webhooks/{webhook_id}", headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_GET_WEBHOOK_BY_TOKEN(webhook_id: str, webhook_token: str) -> Any:
+async def DISCORDBOT_GET_WEBHOOK_BY_TOKEN(webhook_id: str, webhook_token: str, fields: str = "") -> Any:
     """
     Retrieves a webhook by its ID and token.
 
     Args:
         webhook_id (str): The ID of the webhook to retrieve.
         webhook_token (str): The token of the webhook.
+        fields (str): Comma-separated dotted paths to keep (e.g. "name,channel_id") or a
+            preset: "ids", "summary" or "full" (default: the full object).
 
     Returns:
         dict: Webhook object containing webhook details.
     """
     webhook_id = _validate_snowflake(webhook_id, "Webhook ID")
-    return await discord_request("GET", f"/webhooks/{webhook_id}/{webhook_token}")
+    return await discord_request("GET", f"/webhooks/{webhook_id}/{webhook_token}", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_WEBHOOK_BY_TOKEN(webhook_id: str, webhook_token: str, name: Optional[str] = None,
@@ -4099,7 +7649,8 @@ async def DISCORDBOT_EXECUTE_GITHUB_COMPATIBLE_WEBHOOK(webhook_id: str, webhook_
     return await discord_request("POST", f"/webhooks/{webhook_id}/{webhook_token}/github", json=payload, params=params)
 
 @mcp.tool()
-async def DISCORDBOT_GET_WEBHOOK_MESSAGE(webhook_id: str, webhook_token: str, message_id: str, thread_id: Optional[str] = None) -> Any:
+async def DISCORDBOT_GET_WEBHOOK_MESSAGE(webhook_id: str, webhook_token: str, message_id: str, thread_id: Optional[str] = None,
+                                         fields: str = "") -> Any:
     """
     Retrieves a previously-sent webhook message.
 
@@ -4108,6 +7659,8 @@ async def DISCORDBOT_GET_WEBHOOK_MESSAGE(webhook_id: str, webhook_token: str, me
         webhook_token (str): The token of the webhook.
         message_id (str): The ID of the message to retrieve.
         thread_id (Optional[str]): The thread ID if the message is in a thread.
+        fields (str): Comma-separated dotted paths to keep (e.g. "content,embeds.title") or a
+            preset: "ids", "summary" or "full" (default: the full object).
 
     Returns:
         dict: The webhook message object.
@@ -4117,7 +7670,7 @@ async def DISCORDBOT_GET_WEBHOOK_MESSAGE(webhook_id: str, webhook_token: str, me
     params = _filter_none({
         "thread_id": thread_id
     })
-    return await discord_request("GET", f"/webhooks/{webhook_id}/{webhook_token}/messages/{message_id}", params=params)
+    return await discord_request("GET", f"/webhooks/{webhook_id}/{webhook_token}/messages/{message_id}", params=params, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_WEBHOOK_MESSAGE(webhook_id: str, webhook_token: str, message_id: str,
@@ -4184,7 +7737,8 @@ async def DISCORDBOT_DELETE_WEBHOOK_MESSAGE(webhook_id: str, webhook_token: str,
     return await discord_request("DELETE", f"/webhooks/{webhook_id}/{webhook_token}/messages/{message_id}", params=params)
 
 @mcp.tool()
-async def DISCORDBOT_GET_ORIGINAL_WEBHOOK_MESSAGE(webhook_id: str, webhook_token: str, thread_id: Optional[str] = None) -> Any:
+async def DISCORDBOT_GET_ORIGINAL_WEBHOOK_MESSAGE(webhook_id: str, webhook_token: str, thread_id: Optional[str] = None,
+                                                  fields: str = "") -> Any:
     """
     Retrieves the original message that was created by the webhook.
 
@@ -4192,6 +7746,8 @@ async def DISCORDBOT_GET_ORIGINAL_WEBHOOK_MESSAGE(webhook_id: str, webhook_token
         webhook_id (str): The ID of the webhook.
         webhook_token (str): The token of the webhook.
         thread_id (Optional[str]): The thread ID if the message is in a thread.
+        fields (str): Comma-separated dotted paths to keep (e.g. "content,components") or a
+            preset: "ids", "summary" or "full" (default: the full object).
 
     Returns:
         dict: The original webhook message object.
@@ -4200,7 +7756,7 @@ async def DISCORDBOT_GET_ORIGINAL_WEBHOOK_MESSAGE(webhook_id: str, webhook_token
     params = _filter_none({
         "thread_id": thread_id
     })
-    return await discord_request("GET", f"/webhooks/{webhook_id}/{webhook_token}/messages/@original", params=params)
+    return await discord_request("GET", f"/webhooks/{webhook_id}/{webhook_token}/messages/@original", params=params, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_ORIGINAL_WEBHOOK_MESSAGE(webhook_id: str, webhook_token: str,
@@ -4263,7 +7819,8 @@ async def DISCORDBOT_DELETE_ORIGINAL_WEBHOOK_MESSAGE(webhook_id: str, webhook_to
     return await discord_request("DELETE", f"/webhooks/{webhook_id}/{webhook_token}/messages/@original", params=params)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_CHANNEL_WEBHOOKS(channel_id: str) -> Any:
+async def DISCORDBOT_LIST_CHANNEL_WEBHOOKS(channel_id: str,
+                                           cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves a list of webhooks for a channel.
 
@@ -4271,15 +7828,19 @@ async def DISCORDBOT_LIST_CHANNEL_WEBHOOKS(channel_id: str) -> Any:
 
     Args:
         channel_id (str): The ID of the channel to retrieve webhooks from.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "id,name") or a
+            preset: "ids", "summary" or "full" (default: the full object).
 
     Returns:
         dict: List of webhook objects.
     """
     channel_id = _validate_channel_id(channel_id)
-    return await discord_request("GET", f"/channels/{channel_id}/webhooks")
+    return await discord_request("GET", f"/channels/{channel_id}/webhooks", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_WEBHOOKS(guild_id: str) -> Any:
+async def DISCORDBOT_GET_GUILD_WEBHOOKS(guild_id: str, cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves a list of webhooks for a guild.
 
@@ -4287,12 +7848,16 @@ async def DISCORDBOT_GET_GUILD_WEBHOOKS(guild_id: str) -> Any:
 
     Args:
         guild_id (str): The ID of the guild to retrieve webhooks from.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "id,name,channel_id") or a
+            preset: "ids", "summary" or "full" (default: the full object).
 
     Returns:
         dict: List of webhook objects.
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/webhooks")
+    return await discord_request("GET", f"/guilds/{guild_id}/webhooks", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 # ---------------- GUILD MANAGEMENT (46 tools) ----------------
 @mcp.tool()
@@ -4353,7 +7918,8 @@ async def DISCORDBOT_UPDATE_GUILD(guild_id: str, **kwargs) -> Any:
     return await discord_request("PATCH", f"/guilds/{guild_id}", json=payload, headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD(guild_id: str, with_counts: Optional[bool] = None) -> Any:
+async def DISCORDBOT_GET_GUILD(guild_id: str, with_counts: Optional[bool] = None, cache_mode: str = "default",
+                               fields: str = "") -> Any:
     """
     Retrieves detailed information about a specific guild (server).
 
@@ -4363,17 +7929,22 @@ async def DISCORDBOT_GET_GUILD(guild_id: str, with_counts: Optional[bool] = None
         guild_id (str): The ID of the guild to retrieve.
         with_counts (Optional[bool]): When true, includes approximate member 
                                       and presence counts.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the
+                          cache, "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "name,owner_id,roles.name") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
     
     # Add the with_counts parameter to the URL if requested
     if with_counts:
-        return await discord_request("GET", f"/guilds/{guild_id}?with_counts=true")
+        return await discord_request("GET", f"/guilds/{guild_id}?with_counts=true", cache_mode=cache_mode, fields=fields, passthrough=True)
     else:
-        return await discord_request("GET", f"/guilds/{guild_id}")
+        return await discord_request("GET", f"/guilds/{guild_id}", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_GUILD_MEMBERS(guild_id: str, limit: Optional[int] = None, after: Optional[str] = None) -> Any:
+async def DISCORDBOT_LIST_GUILD_MEMBERS(guild_id: str, limit: Optional[int] = None, after: Optional[str] = None,
+                                        fields: str = "") -> Any:
     """
     Retrieves a list of members from a specific guild (server).
 
@@ -4384,6 +7955,8 @@ async def DISCORDBOT_LIST_GUILD_MEMBERS(guild_id: str, limit: Optional[int] = No
         guild_id (str): The ID of the guild to retrieve members from.
         limit (Optional[int]): Max number of members to return (1-1000).
         after (Optional[str]): The user ID to start fetching members after.
+        fields (str): Comma-separated dotted paths to keep (e.g. "user.id,user.username,roles") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
     
@@ -4395,9 +7968,9 @@ async def DISCORDBOT_LIST_GUILD_MEMBERS(guild_id: str, limit: Optional[int] = No
         
     if params:
         query_string = urlencode(params)
-        return await discord_request("GET", f"/guilds/{guild_id}/members?{query_string}")
+        return await discord_request("GET", f"/guilds/{guild_id}/members?{query_string}", fields=fields, passthrough=True)
     else:
-        return await discord_request("GET", f"/guilds/{guild_id}/members")
+        return await discord_request("GET", f"/guilds/{guild_id}/members", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_GUILD_MEMBER(guild_id: str, user_id: str, **kwargs) -> Any:
@@ -4433,7 +8006,7 @@ async def DISCORDBOT_UPDATE_GUILD_MEMBER(guild_id: str, user_id: str, **kwargs)
 
 @mcp.tool()
 async def DISCORDBOT_LIST_GUILD_BANS(guild_id: str, limit: Optional[int] = None, before: Optional[str] = None,
-                                     after: Optional[str] = None) -> Any:
+                                     after: Optional[str] = None, fields: str = "") -> Any:
     """
     Retrieves a list of banned users from a specific guild (server).
 
@@ -4444,6 +8017,8 @@ async def DISCORDBOT_LIST_GUILD_BANS(guild_id: str, limit: Optional[int] = None,
         limit (Optional[int]): Max number of bans to return (1-1000).
         before (Optional[str]): The user ID to get bans before.
         after (Optional[str]): The user ID to get bans after.
+        fields (str): Comma-separated dotted paths to keep (e.g. "user.id,reason") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
     
@@ -4457,12 +8032,12 @@ async def DISCORDBOT_LIST_GUILD_BANS(guild_id: str, limit: Optional[int] = None,
         
     if params:
         query_string = urlencode(params)
-        return await discord_request("GET", f"/guilds/{guild_id}/bans?{query_string}")
+        return await discord_request("GET", f"/guilds/{guild_id}/bans?{query_string}", fields=fields, passthrough=True)
     else:
-        return await discord_request("GET", f"/guilds/{guild_id}/bans")
+        return await discord_request("GET", f"/guilds/{guild_id}/bans", fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_BAN(guild_id: str, user_id: str) -> Any:
+async def DISCORDBOT_GET_GUILD_BAN(guild_id: str, user_id: str, fields: str = "") -> Any:
     """
     Retrieves the ban information for a specific user in a guild.
 
@@ -4471,10 +8046,12 @@ async def DISCORDBOT_GET_GUILD_BAN(guild_id: str, user_id: str) -> Any:
     Args:
         guild_id (str): The ID of the guild.
         user_id (str): The ID of the user to check for a ban.
+        fields (str): Comma-separated dotted paths to keep (e.g. "user.username,reason") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
     user_id = _validate_user_id(user_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/bans/{user_id}")
+    return await discord_request("GET", f"/guilds/{guild_id}/bans/{user_id}", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_PRUNE_GUILD(guild_id: str, days: Optional[int] = None, compute_prune_count: Optional[bool] = None,
@@ -4534,12 +8111,12 @@ async def DISCORDBOT_PREVIEW_PRUNE_GUILD(guild_id: str, days: Optional[int] = No
         
     if params:
         query_string = urlencode(params, doseq=True)
-        return await discord_request("GET", f"/guilds/{guild_id}/prune?{query_string}")
+        return await discord_request("GET", f"/guilds/{guild_id}/prune?{query_string}", passthrough=True)
     else:
-        return await discord_request("GET", f"/guilds/{guild_id}/prune")
+        return await discord_request("GET", f"/guilds/{guild_id}/prune", passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_GUILD_ROLES(guild_id: str) -> Any:
+async def DISCORDBOT_LIST_GUILD_ROLES(guild_id: str, cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves a list of all roles in a specific guild (server).
 
@@ -4547,9 +8124,13 @@ async def DISCORDBOT_LIST_GUILD_ROLES(guild_id: str) -> Any:
 
     Args:
         guild_id (str): The ID of the guild to retrieve roles from.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the
+                          cache, "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "id,name,permissions") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/roles")
+    return await discord_request("GET", f"/guilds/{guild_id}/roles", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_CREATE_GUILD_ROLE(guild_id: str, **kwargs) -> Any:
@@ -4629,7 +8210,7 @@ async def DISCORDBOT_LEAVE_GUILD(guild_id: str) -> Any:
     return await discord_request("DELETE", f"/users/@me/guilds/{guild_id}")
 
 @mcp.tool()
-async def DISCORDBOT_LIST_GUILD_INVITES(guild_id: str) -> Any:
+async def DISCORDBOT_LIST_GUILD_INVITES(guild_id: str, fields: str = "") -> Any:
     """
     Retrieves a list of all active invite links for a specific guild.
 
@@ -4637,9 +8218,11 @@ async def DISCORDBOT_LIST_GUILD_INVITES(guild_id: str) -> Any:
 
     Args:
         guild_id (str): The ID of the guild to retrieve invites from.
+        fields (str): Comma-separated dotted paths to keep (e.g. "code,uses,inviter.username") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/invites")
+    return await discord_request("GET", f"/guilds/{guild_id}/invites", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_CREATE_GUILD_FROM_TEMPLATE(code: str, name: str, icon: Optional[str] = None) -> Any:
@@ -4674,14 +8257,16 @@ async def DISCORDBOT_SYNC_GUILD_TEMPLATE(guild_id: str, code: str) -> Any:
     return await discord_request("PUT", f"/guilds/{guild_id}/templates/{code}")
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_TEMPLATE(code: str) -> Any:
+async def DISCORDBOT_GET_GUILD_TEMPLATE(code: str, fields: str = "") -> Any:
     """
     Retrieves information about a guild template.
 
     Args:
         code (str): The unique code of the guild template.
+        fields (str): Comma-separated dotted paths to keep (e.g. "name,serialized_source_guild.name") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
-    return await discord_request("GET", f"/guilds/templates/{code}")
+    return await discord_request("GET", f"/guilds/templates/{code}", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_GUILD_TEMPLATE(guild_id: str, code: str, name: str, description: str) -> Any:
@@ -4746,7 +8331,8 @@ async def DISCORDBOT_CREATE_GUILD_TEMPLATE(guild_id: str, name: str, description
     return await discord_request("POST", f"/guilds/{guild_id}/templates", json=payload)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_GUILD_TEMPLATES(guild_id: str) -> Any:
+async def DISCORDBOT_LIST_GUILD_TEMPLATES(guild_id: str,
+                                          cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves a list of all guild templates for a specific guild.
 
@@ -4754,12 +8340,16 @@ async def DISCORDBOT_LIST_GUILD_TEMPLATES(guild_id: str) -> Any:
 
     Args:
         guild_id (str): The ID of the guild to retrieve templates from.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "code,name") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/templates")
+    return await discord_request("GET", f"/guilds/{guild_id}/templates", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_PREVIEW(guild_id: str) -> Any:
+async def DISCORDBOT_GET_GUILD_PREVIEW(guild_id: str, fields: str = "") -> Any:
     """
     Retrieves a public preview of a guild.
 
@@ -4768,12 +8358,15 @@ async def DISCORDBOT_GET_GUILD_PREVIEW(guild_id: str) -> Any:
 
     Args:
         guild_id (str): The ID of the guild to preview.
+        fields (str): Comma-separated dotted paths to keep (e.g. "name,approximate_member_count") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/preview")
+    return await discord_request("GET", f"/guilds/{guild_id}/preview", fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILDS_ONBOARDING(guild_id: str) -> Any:
+async def DISCORDBOT_GET_GUILDS_ONBOARDING(guild_id: str,
+                                           cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves the onboarding configuration for a specific guild.
 
@@ -4781,9 +8374,13 @@ async def DISCORDBOT_GET_GUILDS_ONBOARDING(guild_id: str) -> Any:
 
     Args:
         guild_id (str): The ID of the guild to retrieve the onboarding settings from.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "enabled,prompts.title") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/onboarding")
+    return await discord_request("GET", f"/guilds/{guild_id}/onboarding", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_PUT_GUILDS_ONBOARDING(guild_id: str, prompts: Optional[List[Dict]] = None,
@@ -4822,7 +8419,7 @@ async def DISCORDBOT_PUT_GUILDS_ONBOARDING(guild_id: str, prompts: Optional[List
     return await discord_request("PUT", f"/guilds/{guild_id}/onboarding", json=payload, headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_WIDGET(guild_id: str) -> Any:
+async def DISCORDBOT_GET_GUILD_WIDGET(guild_id: str, fields: str = "") -> Any:
     """
     Retrieves the widget object for a given guild.
 
@@ -4830,12 +8427,15 @@ async def DISCORDBOT_GET_GUILD_WIDGET(guild_id: str) -> Any:
 
     Args:
         guild_id (str): The ID of the guild to retrieve the widget for.
+        fields (str): Comma-separated dotted paths to keep (e.g. "name,presence_count") or a
+            preset: "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/widget.json")
+    return await discord_request("GET", f"/guilds/{guild_id}/widget.json", fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_WIDGET_SETTINGS(guild_id: str) -> Any:
+async def DISCORDBOT_GET_GUILD_WIDGET_SETTINGS(guild_id: str,
+                                               cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves the widget settings for a specific guild.
 
@@ -4843,9 +8443,13 @@ async def DISCORDBOT_GET_GUILD_WIDGET_SETTINGS(guild_id: str) -> Any:
 
     Args:
         guild_id (str): The ID of the guild to get widget settings for.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "enabled") or a
+            preset: "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/widget")
+    return await discord_request("GET", f"/guilds/{guild_id}/widget", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_GUILD_WIDGET_SETTINGS(guild_id: str, enabled: Optional[bool] = None,
@@ -4879,7 +8483,8 @@ async def DISCORDBOT_UPDATE_GUILD_WIDGET_SETTINGS(guild_id: str, enabled: Option
     return await discord_request("PATCH", f"/guilds/{guild_id}/widget", json=payload, headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_WELCOME_SCREEN(guild_id: str) -> Any:
+async def DISCORDBOT_GET_GUILD_WELCOME_SCREEN(guild_id: str,
+                                              cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves the welcome screen configuration for a guild.
 
@@ -4888,9 +8493,13 @@ async def DISCORDBOT_GET_GUILD_WELCOME_SCREEN(guild_id: str) -> Any:
 
     Args:
         guild_id (str): The ID of the guild to retrieve the welcome screen from.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "description,welcome_channels.channel_id") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/welcome-screen")
+    return await discord_request("GET", f"/guilds/{guild_id}/welcome-screen", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_UPDATE_GUILD_WELCOME_SCREEN(guild_id: str, enabled: Optional[bool] = None,
@@ -4929,7 +8538,7 @@ async def DISCORDBOT_UPDATE_GUILD_WELCOME_SCREEN(guild_id: str, enabled: Optiona
     return await discord_request("PATCH", f"/guilds/{guild_id}/welcome-screen", json=payload, headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_VANITY_URL(guild_id: str) -> Any:
+async def DISCORDBOT_GET_GUILD_VANITY_URL(guild_id: str, fields: str = "") -> Any:
     """
     Retrieves the vanity URL information for a specific guild.
 
@@ -4938,12 +8547,15 @@ async def DISCORDBOT_GET_GUILD_VANITY_URL(guild_id: str) -> Any:
 
     Args:
         guild_id (str): The ID of the guild to retrieve the vanity URL from.
+        fields (str): Comma-separated dotted paths to keep (e.g. "code") or a
+            preset: "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/vanity-url")
+    return await discord_request("GET", f"/guilds/{guild_id}/vanity-url", fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_GET_GUILD_SCHEDULED_EVENT(guild_id: str, guild_scheduled_event_id: str, with_user_count: Optional[bool] = None) -> Any:
+async def DISCORDBOT_GET_GUILD_SCHEDULED_EVENT(guild_id: str, guild_scheduled_event_id: str, with_user_count: Optional[bool] = None,
+                                               fields: str = "") -> Any:
     """
     Retrieves a specific scheduled event from a guild.
 
@@ -4953,14 +8565,16 @@ async def DISCORDBOT_GET_GUILD_SCHEDULED_EVENT(guild_id: str, guild_scheduled_ev
         guild_id (str): The ID of the guild where the event exists.
         guild_scheduled_event_id (str): The ID of the scheduled event to retrieve.
         with_user_count (Optional[bool]): If true, includes the number of subscribed users.
+        fields (str): Comma-separated dotted paths to keep (e.g. "name,scheduled_start_time") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
     guild_scheduled_event_id = _validate_snowflake(guild_scheduled_event_id, "Scheduled Event ID")
     
     if with_user_count:
-        return await discord_request("GET", f"/guilds/{guild_id}/scheduled-events/{guild_scheduled_event_id}?with_user_count=true")
+        return await discord_request("GET", f"/guilds/{guild_id}/scheduled-events/{guild_scheduled_event_id}?with_user_count=true", fields=fields, passthrough=True)
     else:
-        return await discord_request("GET", f"/guilds/{guild_id}/scheduled-events/{guild_scheduled_event_id}")
+        return await discord_request("GET", f"/guilds/{guild_id}/scheduled-events/{guild_scheduled_event_id}", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_CREATE_GUILD_SCHEDULED_EVENT(guild_id: str, name: str, privacy_level: int,
@@ -5062,7 +8676,8 @@ async def DISCORDBOT_DELETE_GUILD_SCHEDULED_EVENT(guild_id: str, guild_scheduled
     return await discord_request("DELETE", f"/guilds/{guild_id}/scheduled-events/{guild_scheduled_event_id}", headers=headers)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_GUILD_SCHEDULED_EVENTS(guild_id: str, with_user_count: Optional[bool] = None) -> Any:
+async def DISCORDBOT_LIST_GUILD_SCHEDULED_EVENTS(guild_id: str, with_user_count: Optional[bool] = None,
+                                                 fields: str = "") -> Any:
     """
     Retrieves a list of scheduled events for a guild.
 
@@ -5071,18 +8686,21 @@ async def DISCORDBOT_LIST_GUILD_SCHEDULED_EVENTS(guild_id: str, with_user_count:
     Args:
         guild_id (str): The ID of the guild to retrieve events from.
         with_user_count (Optional[bool]): If true, includes the number of subscribed users.
+        fields (str): Comma-separated dotted paths to keep (e.g. "id,name,status") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
     
     if with_user_count:
-        return await discord_request("GET", f"/guilds/{guild_id}/scheduled-events?with_user_count=true")
+        return await discord_request("GET", f"/guilds/{guild_id}/scheduled-events?with_user_count=true", fields=fields, passthrough=True)
     else:
-        return await discord_request("GET", f"/guilds/{guild_id}/scheduled-events")
+        return await discord_request("GET", f"/guilds/{guild_id}/scheduled-events", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_LIST_GUILD_SCHEDULED_EVENT_USERS(guild_id: str, guild_scheduled_event_id: str,
                                                       limit: Optional[int] = None, with_member: Optional[bool] = None,
-                                                      before: Optional[str] = None, after: Optional[str] = None) -> Any:
+                                                      before: Optional[str] = None, after: Optional[str] = None,
+                                                      fields: str = "") -> Any:
     """
     Retrieves a list of users subscribed to a guild scheduled event.
 
@@ -5095,6 +8713,8 @@ async def DISCORDBOT_LIST_GUILD_SCHEDULED_EVENT_USERS(guild_id: str, guild_sched
         with_member (Optional[bool]): If true, includes guild member data.
         before (Optional[str]): The user ID to start fetching users before.
         after (Optional[str]): The user ID to start fetching users after.
+        fields (str): Comma-separated dotted paths to keep (e.g. "user.id,user.username") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
     guild_scheduled_event_id = _validate_snowflake(guild_scheduled_event_id, "Scheduled Event ID")
@@ -5111,12 +8731,13 @@ async def DISCORDBOT_LIST_GUILD_SCHEDULED_EVENT_USERS(guild_id: str, guild_sched
         
     if params:
         query_string = urlencode(params)
-        return await discord_request("GET", f"/guilds/{guild_id}/scheduled-events/{guild_scheduled_event_id}/users?{query_string}")
+        return await discord_request("GET", f"/guilds/{guild_id}/scheduled-events/{guild_scheduled_event_id}/users?{query_string}", fields=fields, passthrough=True)
     else:
-        return await discord_request("GET", f"/guilds/{guild_id}/scheduled-events/{guild_scheduled_event_id}/users")
+        return await discord_request("GET", f"/guilds/{guild_id}/scheduled-events/{guild_scheduled_event_id}/users", fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_GUILD_VOICE_REGIONS(guild_id: str) -> Any:
+async def DISCORDBOT_LIST_GUILD_VOICE_REGIONS(guild_id: str,
+                                              cache_mode: str = "default", fields: str = "") -> Any:
     """
     Retrieves a list of voice regions available for a guild.
 
@@ -5124,12 +8745,16 @@ async def DISCORDBOT_LIST_GUILD_VOICE_REGIONS(guild_id: str) -> Any:
 
     Args:
         guild_id (str): The ID of the guild to retrieve voice regions for.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "id,optimal") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/regions")
+    return await discord_request("GET", f"/guilds/{guild_id}/regions", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
-async def DISCORDBOT_LIST_GUILD_INTEGRATIONS(guild_id: str) -> Any:
+async def DISCORDBOT_LIST_GUILD_INTEGRATIONS(guild_id: str, fields: str = "") -> Any:
     """
     Retrieves a list of integrations for a guild.
 
@@ -5137,9 +8762,11 @@ async def DISCORDBOT_LIST_GUILD_INTEGRATIONS(guild_id: str) -> Any:
 
     Args:
         guild_id (str): The ID of the guild to retrieve integrations from.
+        fields (str): Comma-separated dotted paths to keep (e.g. "name,account.name") or a
+            preset: "ids", "summary" or "full" (default: the full object).
     """
     guild_id = _validate_guild_id(guild_id)
-    return await discord_request("GET", f"/guilds/{guild_id}/integrations")
+    return await discord_request("GET", f"/guilds/{guild_id}/integrations", fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_DELETE_GUILD_INTEGRATION(guild_id: str, integration_id: str, reason: Optional[str] = None) -> Any:
@@ -5163,7 +8790,8 @@ async def DISCORDBOT_DELETE_GUILD_INTEGRATION(guild_id: str, integration_id: str
 # ---------------- INVITES & TEMPLATES (8 tools) ----------------
 @mcp.tool()
 async def DISCORDBOT_INVITE_RESOLVE(invite_code: str, with_counts: Optional[bool] = None,
-                                   with_expiration: Optional[bool] = None, guild_scheduled_event_id: Optional[str] = None) -> Any:
+                                   with_expiration: Optional[bool] = None, guild_scheduled_event_id: Optional[str] = None,
+                                    fields: str = "") -> Any:
     """
     Retrieves an invite object for the given invite code.
 
@@ -5172,6 +8800,8 @@ async def DISCORDBOT_INVITE_RESOLVE(invite_code: str, with_counts: Optional[bool
         with_counts (Optional[bool]): Whether to include approximate member counts.
         with_expiration (Optional[bool]): Whether to include expiration date.
         guild_scheduled_event_id (Optional[str]): The scheduled event ID to include.
+        fields (str): Comma-separated dotted paths to keep (e.g. "guild.name,approximate_member_count") or a
+            preset: "ids", "summary" or "full" (default: the full object).
 
     Returns:
         dict: Invite object containing invite details.
@@ -5181,7 +8811,7 @@ async def DISCORDBOT_INVITE_RESOLVE(invite_code: str, with_counts: Optional[bool
         "with_expiration": with_expiration,
         "guild_scheduled_event_id": guild_scheduled_event_id
     })
-    return await discord_request("GET", f"/invites/{invite_code}", params=params)
+    return await discord_request("GET", f"/invites/{invite_code}", params=params, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_INVITE_REVOKE(invite_code: str, reason: Optional[str] = None) -> Any:
@@ -5205,17 +8835,23 @@ async def DISCORDBOT_INVITE_REVOKE(invite_code: str, reason: Optional[str] = Non
 # ---------------- MISCELLANEOUS / UTILITY (4 tools) ----------------
 
 @mcp.tool()
-async def DISCORDBOT_LIST_VOICE_REGIONS() -> Any:
+async def DISCORDBOT_LIST_VOICE_REGIONS(cache_mode: str = "default", fields: str = "") -> Any:
     """
     Lists all available voice regions in Discord.
 
+    Args:
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the
+                          cache, "refresh" fetches and re-caches (default: "default").
+        fields (str): Comma-separated dotted paths to keep (e.g. "id,name") or a
+            preset: "ids", "summary" or "full" (default: the full object).
+
     Returns:
         dict containing:
             - data: list of voice region objects with properties id, name, custom, deprecated, optimal
             - successful: bool
             - error: str if any error occurred
     """
-    return await discord_request("GET", "/voice/regions")
+    return await discord_request("GET", "/voice/regions", cache_mode=cache_mode, fields=fields, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_CREATE_DM(recipient_id: str = None, access_tokens: list = None, nicks: dict = None) -> Any:
@@ -5242,18 +8878,20 @@ async def DISCORDBOT_CREATE_DM(recipient_id: str = None, access_tokens: list = N
     return await discord_request("POST", "/users/@me/channels", json=payload)
 
 @mcp.tool()
-async def DISCORDBOT_VIEW_DM_MEMBERS(channel_id: str) -> Any:
+async def DISCORDBOT_VIEW_DM_MEMBERS(channel_id: str, cache_mode: str = "default") -> Any:
     """
     Views the members/recipients in a Discord DM or group DM channel.
 
     Parameters:
         channel_id (str): The ID of the DM or group DM channel.
+        cache_mode (str): "default" serves a cached copy when fresh, "bypass" skips the cache,
+            "refresh" fetches and re-caches (default: "default").
 
     Returns:
         dict: Contains channel information including recipients/members
     """
     channel_id = _validate_channel_id(channel_id)
-    return await discord_request("GET", f"/channels/{channel_id}")
+    return await discord_request("GET", f"/channels/{channel_id}", cache_mode=cache_mode, passthrough=True)
 
 @mcp.tool()
 async def DISCORDBOT_CREATE_GROUP_DM_USER(access_tokens: List[str], nicks: Optional[Dict[str, str]] = None) -> Any:
@@ -5264,11 +8902,506 @@ async def DISCORDBOT_CREATE_GROUP_DM_USER(access_tokens: List[str], nicks: Optio
     })
     return await discord_request("POST", "/users/@me/channels", json=payload)
 
+# ---------------- SERVER STATUS & DIAGNOSTICS (5 tools) ----------------
+@mcp.tool()
+async def DISCORDBOT_GET_RATE_LIMIT_STATUS() -> Any:
+    """
+    Reports the client-side rate limiting state of this server.
+
+    Use this to check how close the server is to Discord's global request limit and to the
+    invalid request budget (401/403/429 responses) that gets an IP banned when exceeded.
+
+    Returns:
+        dict containing:
+            - profiles: per bot profile, requests sent in the current window against its
+              global cap (global) and its per-route buckets learned from Discord's
+              X-RateLimit headers (buckets)
+            - invalid_requests: invalid responses in the current window, the slowdown
+              threshold and the delay currently added to each request (shared by all bots,
+              as Discord counts them per IP)
+            - hedging: hedged GETs sent and won, the remaining hedge budget and the
+              latency after which each route's GETs are hedged
+            - scheduler: requests in flight and waiting per priority class
+              (moderation, interactive, read, bulk), and how many were promoted by aging
+    """
+    return http_client.rate_limit_status()
+
+@mcp.tool()
+async def DISCORDBOT_GET_CACHE_STATUS() -> Any:
+    """
+    Reports how many Discord API reads were saved by request coalescing.
+
+    Identical GET requests (same URL, query parameters and bot token) that run at the same
+    time share a single request to Discord, and every caller receives its result. GET
+    responses of read-mostly routes (guilds, channels, roles, members, users, emojis,
+    stickers, webhooks, commands) are served from an in-memory cache until their TTL
+    expires. Writes made through this server evict the reads they make stale and store
+    their response as the new cached copy. Static data (sticker packs, voice regions,
+    applications and their commands) is also kept on disk so it survives restarts.
+
+    Returns:
+        dict containing:
+            - single_flight: executed requests, coalesced callers, the coalesce ratio and
+              the number of shared requests currently in flight
+            - response_cache: entries, size in bytes, hits, misses, hit ratio, bypassed and
+              refreshed calls, LRU evictions, TTL expirations, entries invalidated by
+              writes and write responses stored back into the cache
+            - persistent_cache: the on-disk cache file, its entries, size, hits, misses,
+              conditional revalidations and 304 renewals, evictions and compactions
+    """
+    return {"single_flight": single_flight.status(), "response_cache": response_cache.status(),
+            "persistent_cache": persistent_cache.status()}
+
+@mcp.tool()
+async def DISCORDBOT_GET_CIRCUIT_BREAKER_STATUS() -> Any:
+    """
+    Reports the circuit breaker state of each route group (messages, guilds, channels,
+    webhooks, interactions, ...).
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive calls fail with timeouts, connection errors
+    or 5xx responses (after their retries), a group's circuit opens and its calls fail immediately instead of waiting
+    out timeouts. After CIRCUIT_RESET_TIMEOUT seconds one probe request is let through
+    (half-open); its success closes the circuit again.
+
+    Returns:
+        dict containing:
+            - enabled, failure_threshold, reset_timeout: the breaker configuration
+            - groups: per route group its state (closed, open, half_open), consecutive
+              failures, times opened, calls rejected, the last failure kind and, while
+              open, the seconds until the next probe
+    """
+    return http_client.circuits.status()
+
+@mcp.tool()
+async def DISCORDBOT_GET_METRICS(format: str = "json") -> Any:
+    """
+    Reports call counts, errors and latency of this server's tools and Discord requests.
+
+    Use this to find slow or failing tools and to see whether time goes to queueing behind
+    rate limits, to the network or to decoding responses. The same metrics are available in
+    Prometheus format from the metrics://prometheus resource and, when METRICS_PORT is set,
+    from http://127.0.0.1:METRICS_PORT/metrics.
+
+    Args:
+        format (str): "json" for a summary (default) or "prometheus" for the text exposition format
+
+    Returns:
+        dict containing (for "json"):
+            - tools: per tool its calls, errors by status and latency (count, mean, p50, p95, p99)
+            - phases: latency of the queue, network and decode phase of each request
+            - rate_limit_waits: time waited on route buckets, the scheduler and the global limit
+            - requests_by_status, requests_by_profile, rate_limited, retries, bytes (in/out)
+              and cache_lookups counters
+    """
+    if format == "prometheus":
+        return metrics.render_prometheus()
+    if format != "json":
+        raise ValueError("format must be json or prometheus")
+    return metrics.snapshot()
+
+@mcp.tool()
+async def DISCORDBOT_GET_HEALTH_STATUS(check_now: bool = False) -> Any:
+    """
+    Reports whether Discord's API is reachable and how warm the connection pool is.
+
+    A background task probes GET /gateway every HEALTH_CHECK_INTERVAL seconds over
+    PREWARM_CONNECTIONS pooled connections, replacing connections that died while idle.
+
+    Args:
+        check_now (bool): Probe Discord right away instead of reporting the last check
+
+    Returns:
+        dict containing:
+            - state: healthy, degraded (recent probe failed), unhealthy (3+ failures in a row)
+              or unknown (no probe yet)
+            - last_check, last_latency_ms, last_error: outcome of the latest probe
+            - checks, failures, consecutive_failures: probe counters
+            - pool: open and idle connections in the HTTP connection pool
+    """
+    if check_now:
+        return await health_monitor.check(max(1, config.PREWARM_CONNECTIONS))
+    return health_monitor.status()
+
+@mcp.resource("metrics://prometheus", name="metrics", mime_type="text/plain")
+def prometheus_metrics() -> str:
+    """Server metrics in the Prometheus text exposition format."""
+    return metrics.render_prometheus()
+
+# ---------------- SERVER CONFIGURATION (2 tools) ----------------
+# Settings DISCORDBOT_UPDATE_CONFIG may change on a running server. The rest are
+# only read at startup (JSON codec, cache and trace files, metrics listener) or
+# would send the bot token or traces somewhere else (API base, OTLP endpoint).
+LIVE_SETTINGS = (
+    "REQUEST_TIMEOUT", "MAX_RETRIES", "RETRY_DELAY", "RETRY_MAX_DELAY", "RETRY_BUDGET",
+    "CONNECTION_POOL_SIZE", "MAX_KEEPALIVE_CONNECTIONS", "KEEPALIVE_EXPIRY",
+    "HTTP2_ENABLED", "HTTP2_PRIOR_KNOWLEDGE", "RAW_JSON_PASSTHROUGH",
+    "RATE_LIMIT_WINDOW", "MAX_REQUESTS_PER_WINDOW", "INVALID_REQUEST_LIMIT", "INVALID_REQUEST_WINDOW",
+    "INVALID_REQUEST_SLOWDOWN", "RATE_LIMIT_MAX_WAIT",
+    "CIRCUIT_BREAKER_ENABLED", "CIRCUIT_FAILURE_THRESHOLD", "CIRCUIT_RESET_TIMEOUT",
+    "HEDGING_ENABLED", "HEDGE_PERCENTILE", "HEDGE_BUDGET",
+    "SCHEDULER_ENABLED", "SCHEDULER_MAX_CONCURRENCY", "PRIORITY_AGING",
+    "SINGLE_FLIGHT_ENABLED", "RESPONSE_CACHE_ENABLED", "RESPONSE_CACHE_MAX_BYTES",
+    "TOOL_CALL_TIMEOUT", "TRACING_ENABLED", "METRICS_ENABLED", "AUTO_MESSAGE_NONCE",
+    "HEALTH_CHECK_INTERVAL", "PREWARM_CONNECTIONS", "MAX_FILE_SIZE", "ALLOWED_FILE_TYPES",
+)
+
+@mcp.tool()
+async def DISCORDBOT_GET_CONFIG() -> Any:
+    """
+    Reports the configuration this server is running with.
+
+    Returns:
+        dict containing:
+            - settings: every configuration setting and its current value (bot tokens and
+              PROXY_SECRET are not included)
+            - live_settings: the settings DISCORDBOT_UPDATE_CONFIG can change without a restart
+            - bot_profiles: names of the configured bot profiles
+    """
+    settings = asdict(config)
+    if settings["PROXY_SECRET"]:
+        settings["PROXY_SECRET"] = "(set)"
+    return {"settings": settings, "live_settings": list(LIVE_SETTINGS),
+            "bot_profiles": sorted(http_client.profiles)}
+
+@mcp.tool()
+async def DISCORDBOT_UPDATE_CONFIG(settings: Dict[str, Any]) -> Any:
+    """
+    Changes retry, rate-limit, scheduling, connection pool and other settings on the running server.
+
+    Use this to tune throughput during an incident without a restart. Values are validated
+    like the environment variables of the same name and nothing is applied unless all of
+    them are valid. Rate limits, the scheduler and circuit breakers are updated in place,
+    so queued calls keep their place. Pool settings (CONNECTION_POOL_SIZE,
+    MAX_KEEPALIVE_CONNECTIONS, KEEPALIVE_EXPIRY, REQUEST_TIMEOUT, HTTP2_*) build a new
+    connection pool for new calls while calls in flight finish on the old one. Changes last
+    until the server restarts.
+
+    Args:
+        settings (dict): Setting names mapped to new values,
+            e.g. {"MAX_REQUESTS_PER_WINDOW": 30, "CONNECTION_POOL_SIZE": 50, "MAX_RETRIES": 1}
+
+    Returns:
+        dict containing:
+            - changed: old and new value of every setting that changed
+            - updated: live components that were reconfigured (global_rate_limit,
+              invalid_request_budget, scheduler, circuit_breakers, hedging,
+              connection_pool, response_cache, health_check)
+    """
+    if not settings:
+        raise ValueError("settings must name at least one setting")
+    parsed = {}
+    problems = []
+    for name, value in settings.items():
+        if name in CONFIG_FIELDS and name not in LIVE_SETTINGS:
+            problems.append(f"{name} can only be changed by restarting the server")
+            continue
+        try:
+            parsed[name] = parse_setting(name, value)
+        except ValueError as e:
+            problems.append(str(e))
+    if not problems:
+        problems = check_config({**asdict(config), **parsed})
+    if problems:
+        raise ValueError("; ".join(problems))
+    
+    previous = {name: getattr(config, name) for name in parsed}
+    changed = [name for name, value in parsed.items() if value != previous[name]]
+    for name in changed:
+        setattr(config, name, parsed[name])
+    
+    updated = await http_client.reconfigure(changed)
+    if "RESPONSE_CACHE_MAX_BYTES" in changed:
+        response_cache.resize(config.RESPONSE_CACHE_MAX_BYTES)
+        updated.append("response_cache")
+    if config.HEALTH_CHECK_ENABLED and ("connection_pool" in updated or
+                                        {"HEALTH_CHECK_INTERVAL", "PREWARM_CONNECTIONS"} & set(changed)):
+        # Restarting the monitor probes right away, which also pre-warms a rebuilt pool
+        await health_monitor.stop()
+        health_monitor.start()
+        updated.append("health_check")
+    if changed:
+        print("Configuration updated: " + ", ".join(f"{name}={parsed[name]}" for name in changed),
+              file=sys.stderr)
+    return {
+        "changed": {name: {"old": previous[name], "new": parsed[name]} for name in changed},
+        "updated": updated
+    }
+
+# ---------------- LOCAL PROXY ----------------
+class _ProxyRequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class DiscordProxy:
+    """Local HTTP/1.1 proxy that sends the Discord requests of many MCP servers through this process.
+    
+    Started with ``python production.py --proxy``, it owns the bot tokens, the
+    connection pool and the rate limit state (route buckets, global limits,
+    priority scheduler, circuit breakers), so concurrent MCP servers no longer
+    race each other into 429s. They run with USE_DISCORD_PROXY and point
+    DISCORD_API_BASE (or DISCORD_API_SOCKET) here; instead of a token each
+    request names its bot profile, priority class and remaining deadline in
+    the PROXY_*_HEADER headers. Identical concurrent GETs from different
+    servers share one request to Discord.
+    
+    Whoever can reach the proxy can act as any of its bots. On TCP every
+    request must therefore carry PROXY_SECRET and a Host header naming
+    PROXY_HOST, which also shuts out web pages using DNS rebinding; the proxy
+    refuses to listen on TCP without a secret. The Unix socket is only
+    accessible to its owner and checks the secret if one is set.
+    
+    ``GET /proxy/status`` reports the shared rate limit and pool state.
+    """
+    
+    # Request paths may keep the /api/v10 prefix of DISCORD_API_BASE; it is replaced by this proxy's
+    API_PREFIX = re.compile(r"^/api(/v\d+)?(?=/|$)")
+    # Request headers not forwarded to Discord
+    DROPPED_HEADERS = frozenset({
+        "host", "connection", "keep-alive", "proxy-connection", "te", "trailer", "transfer-encoding",
+        "upgrade", "content-length", "accept-encoding", "authorization",
+        PROXY_PROFILE_HEADER.lower(), PROXY_PRIORITY_HEADER.lower(), PROXY_TIMEOUT_HEADER.lower(),
+        PROXY_SECRET_HEADER.lower()
+    })
+    # Response headers that describe Discord's connection or encoding rather than the content
+    HOP_RESPONSE_HEADERS = frozenset({"connection", "keep-alive", "transfer-encoding", "content-length",
+                                      "content-encoding"})
+    
+    def __init__(self, client: ProductionHTTPClient):
+        self.client = client
+        self.max_body = config.MAX_FILE_SIZE + 1024 * 1024  # uploads plus multipart framing and payload_json
+        self.connections = 0
+        self.open_connections = 0
+        self.requests = 0
+    
+    async def start(self) -> asyncio.AbstractServer:
+        """Listen on PROXY_SOCKET, or on PROXY_HOST:PROXY_PORT when no socket is set.
+        
+        Raises RuntimeError when asked to listen on TCP without PROXY_SECRET.
+        """
+        if config.PROXY_SOCKET:
+            if os.path.exists(config.PROXY_SOCKET):
+                os.unlink(config.PROXY_SOCKET)
+            server = await asyncio.start_unix_server(self._handle, config.PROXY_SOCKET)
+            # Anyone who can connect can act as the bot
+            os.chmod(config.PROXY_SOCKET, 0o600)
+            return server
+        if not config.PROXY_SECRET:
+            raise RuntimeError("PROXY_SECRET must be set for the proxy to listen on "
+                               f"{config.PROXY_HOST}:{config.PROXY_PORT}; or set PROXY_SOCKET to use a Unix socket")
+        return await asyncio.start_server(self._handle, config.PROXY_HOST, config.PROXY_PORT)
+    
+    def _check_access(self, headers: Dict[str, str]) -> Optional[_ProxyRequestError]:
+        """Why a request may not use the proxy, or None if it may."""
+        if not config.PROXY_SOCKET:
+            host = headers.get("host", "").lower()
+            allowed = config.PROXY_HOST.lower()
+            if ":" in allowed:
+                allowed = f"[{allowed}]"
+            if host not in (allowed, f"{allowed}:{config.PROXY_PORT}"):
+                return _ProxyRequestError(403, f"Host {host!r} is not this proxy; use {allowed}:{config.PROXY_PORT}")
+        if config.PROXY_SECRET and not hmac.compare_digest(
+                headers.get(PROXY_SECRET_HEADER.lower(), "").encode(), config.PROXY_SECRET.encode()):
+            return _ProxyRequestError(401, f"Missing or wrong {PROXY_SECRET_HEADER} header")
+        return None
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one client connection, answering its requests in order until it closes."""
+        self.connections += 1
+        self.open_connections += 1
+        # Requests of one connection (one MCP server's pooled connection) form one scheduler flow
+        flow = f"proxy-client-{self.connections}"
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except _ProxyRequestError as e:
+                    await self._write(writer, e.status, [("Content-Type", "application/json")],
+                                      _json_dumps({"message": str(e), "code": 0}), keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, target, headers, body = request
+                status, response_headers, content = await self._respond(flow, method, target, headers, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._write(writer, status, response_headers, content, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            print(f"Warning: proxy connection {flow} failed: {type(e).__name__}: {e}", file=sys.stderr)
+        finally:
+            self.open_connections -= 1
+            writer.close()
+    
+    async def _read_request(self, reader: asyncio.StreamReader
+                            ) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """Read one request; None when the client closed the connection between requests."""
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise _ProxyRequestError(400, "Malformed request line")
+        method, target, _ = parts
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        # Before reading a body the client may not send
+        denied = self._check_access(headers)
+        if denied is not None:
+            raise denied
+        
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = self._parse_length((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                if len(body) + size > self.max_body:
+                    raise _ProxyRequestError(413, "Request body too large")
+                body += await reader.readexactly(size)
+                await reader.readexactly(2)
+            return method.upper(), target, headers, bytes(body)
+        length = self._parse_length(headers.get("content-length") or "0", 10)
+        if length > self.max_body:
+            raise _ProxyRequestError(413, "Request body too large")
+        return method.upper(), target, headers, await reader.readexactly(length) if length else b""
+    
+    @staticmethod
+    def _parse_length(value: Union[str, bytes], base: int) -> int:
+        try:
+            length = int(value, base)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise _ProxyRequestError(400, "Malformed body length")
+        return length
+    
+    async def _respond(self, flow: str, method: str, target: str, headers: Dict[str, str],
+                       body: bytes) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """Forward a request to Discord; returns (status, headers, body) for the client.
+        
+        Every failure becomes an error response, so the client is never left
+        without an answer.
+        """
+        json_type = [("Content-Type", "application/json")]
+        path = self.API_PREFIX.sub("", target, count=1)
+        if method == "GET" and path.split("?")[0] == "/proxy/status":
+            return 200, json_type, _json_dumps(self.status())
+        
+        self.requests += 1
+        url = f"{config.DISCORD_API_BASE}{path}"
+        profile = headers.get(PROXY_PROFILE_HEADER.lower())
+        priority = headers.get(PROXY_PRIORITY_HEADER.lower())
+        forward = {name: value for name, value in headers.items() if name not in self.DROPPED_HEADERS}
+        priority_token = _call_priority.set((None, flow))
+        deadline_token = _call_deadline.set(None)
+        try:
+            if headers.get(PROXY_TIMEOUT_HEADER.lower()):
+                _call_deadline.set(time.monotonic() + float(headers[PROXY_TIMEOUT_HEADER.lower()]))
+            
+            async def fetch() -> httpx.Response:
+                return await self.client.request_with_retry(method, url, priority=priority, profile=profile,
+                                                            headers=forward, content=body or None)
+            
+            if method == "GET" and not body and config.SINGLE_FLIGHT_ENABLED:
+                # Identical reads from different MCP servers share one request to Discord
+                key = _request_key(method, url, None, self.client.profile(profile).auth_headers())
+                response = await single_flight.do(key, fetch)
+            else:
+                response = await fetch()
+        except DiscordRateLimitError as e:
+            # Waiting it out would pass the caller's deadline; let the caller decide
+            rate_headers = [("Retry-After", str(math.ceil(e.retry_after)))]
+            if e.scope:
+                rate_headers.append(("X-RateLimit-Scope", e.scope))
+            if e.is_global:
+                rate_headers.append(("X-RateLimit-Global", "true"))
+            return 429, json_type + rate_headers, _json_dumps({
+                "message": "You are being rate limited.", "retry_after": e.retry_after, "global": e.is_global
+            })
+        except CircuitOpenError as e:
+            return 503, json_type + [("Retry-After", str(math.ceil(e.retry_after)))], \
+                _json_dumps({"message": str(e), "code": 0})
+        except DeadlineExceededError as e:
+            return 504, json_type, _json_dumps({"message": str(e), "code": 0})
+        except ValueError as e:
+            # Unknown bot profile, priority class or timeout header
+            return 400, json_type, _json_dumps({"message": str(e), "code": 0})
+        except httpx.HTTPError as e:
+            return 502, json_type, _json_dumps({"message": f"{type(e).__name__}: {e}", "code": 0})
+        except Exception as e:
+            print(f"Warning: proxy request {method} {path} failed: {type(e).__name__}: {e}", file=sys.stderr)
+            return 502, json_type, _json_dumps({"message": f"Proxy error: {type(e).__name__}: {e}", "code": 0})
+        finally:
+            _call_deadline.reset(deadline_token)
+            _call_priority.reset(priority_token)
+        
+        response_headers = [(name, value) for name, value in response.headers.multi_items()
+                            if name.lower() not in self.HOP_RESPONSE_HEADERS]
+        return response.status_code, response_headers, response.content
+    
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, status: int, headers: List[Tuple[str, str]],
+                     content: bytes, keep_alive: bool):
+        head = [f"HTTP/1.1 {status} {httpx.codes.get_reason_phrase(status)}"]
+        head.extend(f"{name}: {value}" for name, value in headers)
+        head.append(f"Content-Length: {len(content)}")
+        if not keep_alive:
+            head.append("Connection: close")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + content)
+        await writer.drain()
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "listening": config.PROXY_SOCKET or f"{config.PROXY_HOST}:{config.PROXY_PORT}",
+            "connections": self.connections,
+            "open_connections": self.open_connections,
+            "requests": self.requests,
+            "profiles": sorted(self.client.profiles),
+            "pool": self.client.pool_status(),
+            "rate_limits": self.client.rate_limit_status(),
+            "single_flight": single_flight.status()
+        }
+
+async def run_proxy():
+    """Serve DiscordProxy until interrupted, with the same pool, health checks and exporters as the MCP server."""
+    proxy = DiscordProxy(http_client)
+    async with _server_lifespan(mcp):
+        server = await proxy.start()
+        print(f"Discord API proxy listening on {proxy.status()['listening']}, forwarding to "
+              f"{config.DISCORD_API_BASE} for bot profiles: {', '.join(sorted(http_client.profiles))}",
+              file=sys.stderr)
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                # Windows: Ctrl+C still raises KeyboardInterrupt
+                pass
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            if config.PROXY_SOCKET and os.path.exists(config.PROXY_SOCKET):
+                os.unlink(config.PROXY_SOCKET)
+
 # ---------------- MAIN EXECUTION ----------------
 
 if __name__ == "__main__":
     try:
-        mcp.run()
+        if "--proxy" in sys.argv[1:]:
+            asyncio.run(run_proxy())
+        else:
+            mcp.run()
     except KeyboardInterrupt:
         pass
     except Exception as e:
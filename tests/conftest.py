@@ -0,0 +1,53 @@
+"""Shared fixtures: production.py talking to an httpx.MockTransport instead of Discord."""
+import os
+
+# production.py reads its configuration at import time
+os.environ.setdefault("DISCORD_BOT_TOKEN", "test-token")
+# Tests that use the on-disk cache open their own file (see the disk_cache fixture)
+os.environ["PERSISTENT_CACHE_ENABLED"] = "false"
+
+import httpx
+import pytest
+
+import production
+from fakes import FakeDiscord
+
+
+@pytest.fixture
+def discord():
+    return FakeDiscord()
+
+
+@pytest.fixture
+async def client(discord, monkeypatch):
+    """A fresh ProductionHTTPClient whose requests go to ``discord``."""
+    http_client = production.ProductionHTTPClient()
+    http_client.client = httpx.AsyncClient(transport=httpx.MockTransport(discord))
+    monkeypatch.setattr(production, "http_client", http_client)
+    monkeypatch.setattr(production, "single_flight", production.SingleFlight())
+    monkeypatch.setattr(production, "response_cache",
+                        production.ResponseCache(production.config.RESPONSE_CACHE_MAX_BYTES))
+    yield http_client
+    await http_client.close()
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """Override config settings for one test."""
+    def override(**values):
+        for name, value in values.items():
+            monkeypatch.setattr(production.config, name, value)
+    return override
+
+
+@pytest.fixture
+async def disk_cache(client, tmp_path, monkeypatch):
+    """Enable the persistent cache, backed by a file in ``tmp_path``."""
+    cache = production.PersistentResponseCache(str(tmp_path / "responses.sqlite3"), 1024 * 1024)
+    await cache.open()
+    monkeypatch.setattr(production.config, "PERSISTENT_CACHE_ENABLED", True)
+    monkeypatch.setattr(production, "persistent_cache", cache)
+    monkeypatch.setattr(production, "response_cache",
+                        production.ResponseCache(production.config.RESPONSE_CACHE_MAX_BYTES, cache))
+    yield cache
+    await cache.close()
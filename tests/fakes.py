@@ -0,0 +1,42 @@
+"""A stand-in for the Discord API, served through httpx.MockTransport."""
+import asyncio
+
+import httpx
+
+import production
+
+API = production.config.DISCORD_API_BASE
+
+
+class FakeDiscord:
+    """Answers requests with queued responses per API path and records what was sent.
+    
+    Responses for a path are returned in order; the last one keeps being
+    returned. Paths without responses get a 404.
+    """
+    
+    def __init__(self):
+        self.requests = []
+        self.routes = {}
+        self.delay = 0.0  # seconds each response takes
+    
+    def add(self, method, path, *responses):
+        self.routes.setdefault((method, api_path(path)), []).extend(responses)
+    
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        queue = self.routes.get((request.method, request.url.path))
+        if not queue:
+            return httpx.Response(404, json={"message": "Unknown", "code": 0})
+        response = queue.pop(0) if len(queue) > 1 else queue[0]
+        return response() if callable(response) else response
+    
+    def sent(self, method, path):
+        return sum(1 for r in self.requests if r.method == method and r.url.path == api_path(path))
+
+
+def api_path(path):
+    """URL path of a request to the API route ``path``, e.g. "/api/v10/channels/1"."""
+    return httpx.URL(API + path).path
@@ -0,0 +1,101 @@
+import asyncio
+
+import httpx
+import pytest
+
+import production
+from production import CircuitBreaker, CircuitOpenError
+from fakes import API
+
+PATH = "/channels/1/messages/2"
+
+
+@pytest.fixture
+def failing(discord, settings):
+    settings(CIRCUIT_FAILURE_THRESHOLD=2, CIRCUIT_RESET_TIMEOUT=0.1, MAX_RETRIES=2, RETRY_DELAY=0.01)
+    discord.add("GET", PATH, httpx.Response(503, json={"message": "Service Unavailable"}))
+    return discord
+
+
+async def test_circuit_counts_calls_not_attempts(client, failing):
+    response = await client.request_with_retry("GET", API + PATH)
+    assert response.status_code == 503
+    assert failing.sent("GET", PATH) == 3
+    breaker = client.circuits.get("/channels/{channel_id}/messages/{message_id}")
+    assert breaker.consecutive_failures == 1
+    assert breaker.state == CircuitBreaker.CLOSED
+    
+    await client.request_with_retry("GET", API + PATH)
+    assert breaker.consecutive_failures == 2
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+async def test_open_circuit_fails_without_sending(client, failing):
+    for _ in range(2):
+        await client.request_with_retry("GET", API + PATH)
+    sent = len(failing.requests)
+    
+    with pytest.raises(CircuitOpenError) as raised:
+        await client.request_with_retry("GET", API + "/channels/3/messages/4")
+    assert raised.value.group == "messages"
+    assert len(failing.requests) == sent
+    # Other route groups are unaffected
+    failing.add("GET", "/guilds/1", httpx.Response(200, json={"id": "1"}))
+    assert (await client.request_with_retry("GET", API + "/guilds/1")).status_code == 200
+
+
+async def test_successful_probe_closes_the_circuit(client, failing):
+    for _ in range(2):
+        await client.request_with_retry("GET", API + PATH)
+    await asyncio.sleep(0.1)
+    
+    failing.routes.clear()
+    failing.add("GET", PATH, httpx.Response(200, json={"id": "2"}))
+    assert (await client.request_with_retry("GET", API + PATH)).status_code == 200
+    breaker = client.circuits.get("/channels/{channel_id}/messages/{message_id}")
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+async def test_failed_probe_reopens_the_circuit(client, failing):
+    for _ in range(2):
+        await client.request_with_retry("GET", API + PATH)
+    await asyncio.sleep(0.1)
+    
+    sent = len(failing.requests)
+    await client.request_with_retry("GET", API + PATH)
+    # The probe is not retried into the re-opened circuit
+    assert len(failing.requests) == sent + 1
+    with pytest.raises(CircuitOpenError):
+        await client.request_with_retry("GET", API + PATH)
+
+
+async def test_client_errors_do_not_count(client, discord, settings):
+    settings(CIRCUIT_FAILURE_THRESHOLD=1)
+    discord.add("GET", PATH, httpx.Response(404, json={"message": "Unknown Message", "code": 10008}))
+    for _ in range(3):
+        assert (await client.request_with_retry("GET", API + PATH)).status_code == 404
+    assert client.circuits.get("/channels/{channel_id}/messages/{message_id}").state == CircuitBreaker.CLOSED
+
+
+async def test_status_tool_reports_open_groups(client, failing):
+    for _ in range(2):
+        await client.request_with_retry("GET", API + PATH)
+    with pytest.raises(CircuitOpenError):
+        await client.request_with_retry("GET", API + PATH)
+    group = (await production.DISCORDBOT_GET_CIRCUIT_BREAKER_STATUS())["groups"]["messages"]
+    assert group["state"] == CircuitBreaker.OPEN
+    assert group["rejected_calls"] == 1
+
+
+async def test_connection_errors_count_once_per_call(client, discord, settings):
+    settings(CIRCUIT_FAILURE_THRESHOLD=5, MAX_RETRIES=3, RETRY_DELAY=0.01)
+    
+    def refused():
+        raise httpx.ConnectError("connection refused")
+    
+    discord.add("POST", "/channels/1/messages", refused)
+    with pytest.raises(httpx.ConnectError):
+        await client.request_with_retry("POST", API + "/channels/1/messages")
+    assert discord.sent("POST", "/channels/1/messages") == 4
+    assert client.circuits.get("/channels/{channel_id}/messages").consecutive_failures == 1
@@ -0,0 +1,121 @@
+import asyncio
+from dataclasses import asdict
+
+import pytest
+
+import production
+from production import load_config, parse_setting
+
+
+@pytest.fixture
+def restore_config():
+    """Undo changes DISCORDBOT_UPDATE_CONFIG makes to the shared config."""
+    saved = asdict(production.config)
+    yield
+    for name, value in saved.items():
+        setattr(production.config, name, value)
+
+
+@pytest.mark.parametrize("name, raw, parsed", [
+    ("HEDGING_ENABLED", "on", True),
+    ("HEDGING_ENABLED", "0", False),
+    ("MAX_RETRIES", " 4 ", 4),
+    ("RETRY_DELAY", "0.5", 0.5),
+    ("JSON_CODEC", "ORJSON", "orjson"),
+    ("ALLOWED_FILE_TYPES", "png, .JPG", [".png", ".jpg"]),
+    ("TRACE_EXPORT_PATH", "~/traces.jsonl", production.os.path.expanduser("~/traces.jsonl")),
+])
+def test_settings_are_parsed_by_type(name, raw, parsed):
+    assert parse_setting(name, raw) == parsed
+
+
+@pytest.mark.parametrize("name, raw, message", [
+    ("HEDGING_ENABLED", "maybe", "true or false"),
+    ("MAX_RETRIES", "2.5", "an integer"),
+    ("MAX_RETRIES", 11, "between 0 and 10"),
+    ("RETRY_BUDGET", "-1", "at least 0"),
+    ("JSON_CODEC", "yaml", "one of"),
+    ("NOT_A_SETTING", "1", "Unknown setting"),
+])
+def test_invalid_settings_are_rejected(name, raw, message):
+    with pytest.raises(ValueError, match=message):
+        parse_setting(name, raw)
+
+
+def test_environment_overrides_the_defaults(monkeypatch):
+    monkeypatch.setenv("MAX_RETRIES", "1")
+    monkeypatch.setenv("CONNECTION_POOL_SIZE", "7")
+    monkeypatch.setenv("OTLP_ENDPOINT", "")
+    monkeypatch.setenv("RETRY_DELAY", " ")
+    loaded = load_config()
+    assert (loaded.MAX_RETRIES, loaded.CONNECTION_POOL_SIZE, loaded.OTLP_ENDPOINT) == (1, 7, "")
+    assert loaded.RETRY_DELAY == production.ProductionConfig().RETRY_DELAY
+
+
+def test_every_invalid_variable_is_reported_at_once(monkeypatch):
+    monkeypatch.setenv("MAX_RETRIES", "many")
+    monkeypatch.setenv("HEDGE_BUDGET", "2")
+    with pytest.raises(ValueError) as raised:
+        load_config()
+    assert "MAX_RETRIES" in str(raised.value) and "HEDGE_BUDGET" in str(raised.value)
+
+
+def test_inconsistent_settings_are_rejected(monkeypatch):
+    monkeypatch.setenv("HTTP2_ENABLED", "false")
+    monkeypatch.setenv("HTTP2_PRIOR_KNOWLEDGE", "true")
+    with pytest.raises(ValueError, match="HTTP2_PRIOR_KNOWLEDGE requires HTTP2_ENABLED"):
+        load_config()
+
+
+async def test_live_update_reconfigures_limits_in_place(client, restore_config):
+    limiter = client.profile().global_limiter
+    result = await production.DISCORDBOT_UPDATE_CONFIG({"MAX_REQUESTS_PER_WINDOW": 5, "MAX_RETRIES": "1"})
+    assert result["changed"]["MAX_REQUESTS_PER_WINDOW"]["new"] == 5
+    assert result["updated"] == ["global_rate_limit"]
+    assert client.profile().global_limiter is limiter and limiter.max_requests == 5
+    assert production.config.MAX_RETRIES == 1
+
+
+async def test_raised_concurrency_admits_queued_requests(client, restore_config):
+    client.scheduler.max_concurrency = 1
+    await client.scheduler.acquire("read", "busy")
+    waiter = asyncio.ensure_future(client.scheduler.acquire("read", "queued"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    await production.DISCORDBOT_UPDATE_CONFIG({"SCHEDULER_MAX_CONCURRENCY": 2})
+    await asyncio.wait_for(waiter, 1)
+
+
+async def test_updates_are_all_or_nothing(client, restore_config):
+    before = production.config.MAX_RETRIES
+    with pytest.raises(ValueError) as raised:
+        await production.DISCORDBOT_UPDATE_CONFIG({"MAX_RETRIES": before + 1, "DISCORD_API_BASE": "http://evil", "RETRY_DELAY": -1})
+    assert "restarting" in str(raised.value) and "RETRY_DELAY" in str(raised.value)
+    assert production.config.MAX_RETRIES == before
+
+
+async def test_rebuilt_pool_drains_before_closing(client):
+    old = client._lease()
+    await client.rebuild_pool()
+    assert client.client is not old
+    assert not old.is_closed
+    client._return_lease(old)
+    await asyncio.sleep(0)
+    assert old.is_closed
+    assert client.pool_status()["pools_built"] == 1
+
+
+@pytest.mark.parametrize("settings, problem", [
+    ({"MAX_REQUESTS_PER_WINDOW": 51}, "MAX_REQUESTS_PER_WINDOW cannot exceed 50"),
+    ({"MAX_REQUESTS_PER_WINDOW": 26, "RATE_LIMIT_WINDOW": 0.5}, "MAX_REQUESTS_PER_WINDOW cannot exceed 25"),
+    ({"INVALID_REQUEST_LIMIT": 10001}, "INVALID_REQUEST_LIMIT cannot exceed 10000"),
+])
+async def test_limits_are_capped_at_discords(client, restore_config, settings, problem):
+    with pytest.raises(ValueError, match=problem):
+        await production.DISCORDBOT_UPDATE_CONFIG(settings)
+
+
+def test_slower_windows_keep_discords_limit(monkeypatch):
+    monkeypatch.setenv("MAX_REQUESTS_PER_WINDOW", "50")
+    monkeypatch.setenv("RATE_LIMIT_WINDOW", "2")
+    assert load_config().MAX_REQUESTS_PER_WINDOW == 50
@@ -0,0 +1,53 @@
+import time
+
+import httpx
+
+import production
+
+
+async def test_tool_calls_share_one_client(client, discord):
+    discord.add("GET", "/channels/1/messages/2", httpx.Response(200, json={"id": "2"}))
+    pooled = client.client
+    for _ in range(3):
+        assert await production.discord_request("GET", "/channels/1/messages/2") == {"id": "2"}
+    assert client.client is pooled
+    assert not pooled.is_closed
+    assert discord.sent("GET", "/channels/1/messages/2") == 3
+
+
+async def test_lifespan_opens_and_closes_the_pool(monkeypatch):
+    http_client = production.ProductionHTTPClient()
+    monkeypatch.setattr(production, "http_client", http_client)
+    # The health monitor would probe the real Discord API
+    monkeypatch.setattr(production.config, "HEALTH_CHECK_ENABLED", False)
+    async with production._server_lifespan(production.mcp) as state:
+        assert state["http_client"] is http_client
+        pooled = http_client.client
+        assert pooled is not None and not pooled.is_closed
+    assert http_client.client is None
+    assert pooled.is_closed
+
+
+async def test_closed_client_is_reopened():
+    http_client = production.ProductionHTTPClient()
+    await http_client._ensure_client()
+    first = http_client.client
+    await http_client.close()
+    await http_client._ensure_client()
+    assert http_client.client is not first
+    assert not http_client.client.is_closed
+    await http_client.close()
+
+
+async def test_stale_connection_is_resent_at_once(client, discord, settings):
+    settings(RETRY_DELAY=1.0)
+    
+    def stale():
+        raise httpx.RemoteProtocolError("Server disconnected without sending a response.")
+    
+    discord.add("GET", "/channels/1/messages/2", stale, httpx.Response(200, json={"id": "2"}))
+    started = time.monotonic()
+    response = await client.request_with_retry("GET", production.config.DISCORD_API_BASE + "/channels/1/messages/2")
+    assert response.status_code == 200
+    assert time.monotonic() - started < 0.5
+    assert discord.sent("GET", "/channels/1/messages/2") == 2
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import production
+from production import DeadlineExceededError
+from fakes import API
+
+PATH = "/channels/1/messages/2"
+
+
+def deadline(seconds):
+    """Run the rest of the test as a tool call with ``seconds`` left before its deadline.
+    
+    Each test runs in its own task, so the deadline does not outlive the test.
+    """
+    production._call_deadline.set(time.monotonic() + seconds)
+
+
+async def test_slow_tool_call_fails_at_its_deadline(client, discord, settings):
+    settings(TOOL_CALL_TIMEOUT=0.05)
+    discord.delay = 5
+    discord.add("GET", "/gateway", httpx.Response(200, json={"url": "wss://gateway.discord.gg"}))
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        await production.mcp.call_tool("DISCORDBOT_GET_GATEWAY", {})
+    assert time.monotonic() - started < 1
+
+
+async def test_request_timeout_is_cut_to_the_deadline(client, discord):
+    discord.add("GET", PATH, httpx.Response(200, json={"id": "2"}))
+    deadline(0.5)
+    await client.request_with_retry("GET", API + PATH, timeout=30)
+    assert discord.requests[0].extensions["timeout"]["read"] <= 0.5
+
+
+async def test_timeout_at_the_deadline_is_reported_as_such(client, discord):
+    def timed_out():
+        raise httpx.ReadTimeout("timed out")
+    
+    discord.add("GET", PATH, timed_out)
+    deadline(0.5)
+    with pytest.raises(DeadlineExceededError):
+        await client.request_with_retry("GET", API + PATH)
+
+
+async def test_retries_stop_at_the_deadline(client, discord, settings):
+    settings(RETRY_DELAY=1.0, MAX_RETRIES=5)
+    discord.add("GET", PATH, httpx.Response(503, json={"message": "Service Unavailable"}))
+    deadline(0.2)
+    started = time.monotonic()
+    response = await client.request_with_retry("GET", API + PATH)
+    assert response.status_code == 503
+    assert discord.sent("GET", PATH) == 1
+    assert time.monotonic() - started < 0.2
+
+
+async def test_expired_deadline_sends_nothing(client, discord):
+    deadline(-1)
+    with pytest.raises(DeadlineExceededError):
+        await client.request_with_retry("GET", API + PATH)
+    assert not discord.requests
+
+
+async def test_cancelling_a_call_aborts_its_request(client, discord):
+    discord.delay = 5
+    discord.add("GET", PATH, httpx.Response(200, json={"id": "2"}))
+    task = asyncio.ensure_future(client.request_with_retry("GET", API + PATH))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert client.scheduler.active == 0
+
+
+def test_deadline_errors_are_reported_as_504():
+    result = production._handle_discord_error(DeadlineExceededError(1.0), "getting the gateway")
+    assert result["status"] == 504
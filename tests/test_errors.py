@@ -0,0 +1,74 @@
+import httpx
+import pytest
+
+import production
+from production import (DiscordBadRequestError, DiscordError, DiscordForbiddenError, DiscordHTTPError,
+                        DiscordNotFoundError, DiscordRateLimitError, DiscordServerError)
+
+INVALID_FORM = {
+    "message": "Invalid Form Body",
+    "code": 50035,
+    "errors": {
+        "content": {"_errors": [{"code": "BASE_TYPE_MAX_LENGTH", "message": "Must be 2000 or fewer in length."}]},
+        "embeds": {"0": {"title": {"_errors": [{"code": "BASE_TYPE_REQUIRED", "message": "Required"}]}}}
+    }
+}
+
+
+@pytest.mark.parametrize("status, error_cls", [
+    (400, DiscordBadRequestError),
+    (403, DiscordForbiddenError),
+    (404, DiscordNotFoundError),
+    (502, DiscordServerError),
+    (409, DiscordHTTPError),
+])
+def test_error_class_follows_the_status(status, error_cls):
+    error = DiscordHTTPError.from_response(httpx.Response(status, json={"message": "nope", "code": 1}), "req_1")
+    assert type(error) is error_cls
+    assert (error.status, error.message, error.code, error.request_id) == (status, "nope", 1, "req_1")
+    assert isinstance(error, DiscordError)
+
+
+def test_rate_limit_responses_become_rate_limit_errors():
+    error = DiscordHTTPError.from_response(httpx.Response(
+        429, json={"message": "You are being rate limited.", "retry_after": 2.5, "global": True},
+        headers={"X-RateLimit-Bucket": "abc"}))
+    assert isinstance(error, DiscordRateLimitError)
+    assert (error.status, error.retry_after, error.is_global, error.bucket) == (429, 2.5, True, "abc")
+
+
+def test_field_errors_are_flattened():
+    error = DiscordHTTPError.from_response(httpx.Response(400, json=INVALID_FORM))
+    assert error.field_errors == {
+        "content": [{"code": "BASE_TYPE_MAX_LENGTH", "message": "Must be 2000 or fewer in length."}],
+        "embeds.0.title": [{"code": "BASE_TYPE_REQUIRED", "message": "Required"}]
+    }
+
+
+def test_non_json_error_bodies_keep_their_text():
+    error = DiscordHTTPError.from_response(httpx.Response(502, text="Bad Gateway"))
+    assert (error.message, error.code, error.errors) == ("Bad Gateway", None, {})
+
+
+async def test_requests_raise_typed_errors(client, discord):
+    discord.add("GET", "/channels/1/messages/2", httpx.Response(404, json={"message": "Unknown Message", "code": 10008}))
+    with pytest.raises(DiscordNotFoundError) as raised:
+        await production.discord_request("GET", "/channels/1/messages/2")
+    assert raised.value.code == 10008
+    assert raised.value.request_id.startswith("req_")
+
+
+def test_error_reports_carry_discord_details():
+    error = DiscordHTTPError.from_response(httpx.Response(400, json=INVALID_FORM), "req_1")
+    report = production._handle_discord_error(error, "sending the message")
+    assert report["status"] == 400
+    assert report["code"] == 50035
+    assert report["request_id"] == "req_1"
+    assert set(report["field_errors"]) == {"content", "embeds.0.title"}
+
+
+async def test_tools_recognise_discord_error_codes(client, discord):
+    discord.add("PATCH", "/guilds/1/voice-states/@me",
+                httpx.Response(404, json={"message": "Unknown Voice State", "code": 10065}))
+    result = await production.DISCORDBOT_UPDATE_SELF_VOICE_STATE(guild_id="1", channel_id="2")
+    assert result["code"] == 10065
@@ -0,0 +1,73 @@
+import httpx
+import pytest
+
+import production
+
+MESSAGES = [
+    {"id": "1", "content": "hi", "author": {"id": "7", "username": "ann", "avatar": None}, "flags": 0},
+    {"id": "2", "content": "yo", "author": {"id": "8", "username": "bob", "avatar": None}, "flags": 0},
+]
+
+
+def messages():
+    return httpx.Response(200, json=MESSAGES)
+
+
+async def test_dotted_paths_project_each_item(client, discord):
+    discord.add("GET", "/channels/1/messages", messages())
+    result = await production.discord_request("GET", "/channels/1/messages", fields="id,author.username")
+    assert result == [{"id": "1", "author": {"username": "ann"}}, {"id": "2", "author": {"username": "bob"}}]
+
+
+async def test_presets_follow_the_route(client, discord):
+    discord.add("GET", "/channels/1/messages", messages())
+    assert await production.discord_request("GET", "/channels/1/messages", fields="ids") == [
+        {"id": "1"}, {"id": "2"}]
+    summary = await production.discord_request("GET", "/channels/1/messages", fields="summary")
+    assert summary[0] == {"id": "1", "content": "hi", "author": {"id": "7", "username": "ann"}}
+
+
+async def test_full_keeps_the_whole_response(client, discord):
+    discord.add("GET", "/channels/1/messages", messages())
+    assert await production.discord_request("GET", "/channels/1/messages", fields="full") == MESSAGES
+
+
+def test_invalid_paths_are_rejected():
+    with pytest.raises(ValueError, match="Invalid field path"):
+        production._field_selection("id,author..name", "/channels/{channel_id}/messages")
+    with pytest.raises(ValueError, match="Invalid field path"):
+        production._field_selection("author username", "/channels/{channel_id}/messages")
+
+
+async def test_presets_are_chosen_by_route_template(client, discord):
+    discord.add("GET", "/guilds/1/scheduled-events/2/users", httpx.Response(200, json=[
+        {"guild_scheduled_event_id": "2", "user": {"id": "7", "username": "ann"}}]))
+    assert await production.discord_request("GET", "/guilds/1/scheduled-events/2/users", fields="ids") == [
+        {"user": {"id": "7"}}]
+
+
+async def test_routes_without_a_preset_reject_it(client, discord):
+    discord.add("GET", "/gateway", httpx.Response(200, json={"url": "wss://gateway.discord.gg"}))
+    with pytest.raises(ValueError, match="No 'ids' fields preset for /gateway; presets: summary, full"):
+        await production.discord_request("GET", "/gateway", fields="ids")
+    assert not discord.requests
+
+
+async def test_missing_optional_fields_are_left_out(client, discord):
+    discord.add("GET", "/channels/1/messages", httpx.Response(200, json=[
+        {"id": "1", "thread": {"id": "9", "name": "t"}}, {"id": "2"}]))
+    result = await production.discord_request("GET", "/channels/1/messages", fields="id,thread.name,pinned")
+    assert result == [{"id": "1", "thread": {"name": "t"}}, {"id": "2"}]
+
+
+async def test_projection_disables_passthrough(client, discord, settings):
+    settings(RAW_JSON_PASSTHROUGH=True)
+    discord.add("GET", "/channels/1/messages", messages())
+    result = await production.discord_request("GET", "/channels/1/messages", fields="ids", passthrough=True)
+    assert result == [{"id": "1"}, {"id": "2"}]
+
+
+async def test_tools_pass_fields_through(client, discord):
+    discord.add("GET", "/channels/1/messages", messages())
+    assert await production.DISCORDBOT_LIST_MESSAGES(channel_id="1", fields="author.id") == [
+        {"author": {"id": "7"}}, {"author": {"id": "8"}}]
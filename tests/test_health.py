@@ -0,0 +1,82 @@
+import asyncio
+
+import httpx
+import pytest
+
+import production
+from production import HealthMonitor
+
+GATEWAY = httpx.Response(200, json={"url": "wss://gateway.discord.gg"})
+
+
+async def test_warm_sends_concurrent_probes(client, discord):
+    discord.delay = 0.05
+    discord.add("GET", "/gateway", GATEWAY)
+    latencies = await asyncio.wait_for(client.warm(3, "/gateway", 1.0), 0.14)
+    assert len(latencies) == 3
+    assert discord.sent("GET", "/gateway") == 3
+
+
+async def test_probes_through_the_proxy_name_the_default_bot(client, discord, settings):
+    settings(USE_DISCORD_PROXY=True, PROXY_SECRET="s3cret")
+    discord.add("GET", "/gateway", GATEWAY)
+    await client.warm(2, "/gateway", 1.0)
+    for request in discord.requests:
+        assert request.headers[production.PROXY_PROFILE_HEADER] == production.config.DEFAULT_BOT_PROFILE
+        assert request.headers[production.PROXY_SECRET_HEADER] == "s3cret"
+        assert "Authorization" not in request.headers
+    
+    settings(USE_DISCORD_PROXY=False)
+    await client.warm(1, "/gateway", 1.0)
+    assert production.PROXY_PROFILE_HEADER not in discord.requests[-1].headers
+
+async def test_successful_check_is_healthy(client, discord):
+    discord.add("GET", "/gateway", GATEWAY)
+    monitor = HealthMonitor(client)
+    assert monitor.state == "unknown"
+    status = await monitor.check(2)
+    assert status["state"] == "healthy"
+    assert status["last_latency_ms"] is not None
+    assert status["checks"] == 1
+
+
+async def test_repeated_failures_turn_unhealthy(client, discord):
+    discord.add("GET", "/gateway", httpx.Response(503, json={"message": "Service Unavailable"}))
+    monitor = HealthMonitor(client)
+    assert (await monitor.check())["state"] == "degraded"
+    for _ in range(HealthMonitor.UNHEALTHY_AFTER - 1):
+        await monitor.check()
+    assert monitor.state == "unhealthy"
+    assert "503" in monitor.last_error
+    
+    discord.routes.clear()
+    discord.add("GET", "/gateway", GATEWAY)
+    assert (await monitor.check())["state"] == "healthy"
+    assert monitor.failures == HealthMonitor.UNHEALTHY_AFTER
+
+
+async def test_monitor_prewarms_at_start(client, discord, settings):
+    settings(HEALTH_CHECK_INTERVAL=0, PREWARM_CONNECTIONS=2)
+    discord.add("GET", "/gateway", GATEWAY)
+    monitor = HealthMonitor(client)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    assert discord.sent("GET", "/gateway") == 2
+    assert monitor.state == "healthy"
+    await monitor.stop()
+
+
+async def test_disabled_monitor_does_not_start(client, discord, settings):
+    settings(HEALTH_CHECK_ENABLED=False)
+    monitor = HealthMonitor(client)
+    monitor.start()
+    await asyncio.sleep(0)
+    assert not discord.requests
+    await monitor.stop()
+
+
+async def test_health_tool_can_check_now(client, discord, monkeypatch):
+    discord.add("GET", "/gateway", GATEWAY)
+    monkeypatch.setattr(production, "health_monitor", HealthMonitor(client))
+    assert (await production.DISCORDBOT_GET_HEALTH_STATUS())["state"] == "unknown"
+    assert (await production.DISCORDBOT_GET_HEALTH_STATUS(check_now=True))["state"] == "healthy"
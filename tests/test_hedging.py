@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+
+import production
+from fakes import API
+
+PATH = "/channels/1/messages/2"
+ROUTE = "GET /channels/{channel_id}/messages/{message_id}"
+
+
+def ok():
+    return httpx.Response(200, json={"id": "2"}, headers={
+        "X-RateLimit-Bucket": "abc", "X-RateLimit-Limit": "5",
+        "X-RateLimit-Remaining": "4", "X-RateLimit-Reset-After": "10"})
+
+
+@pytest.fixture
+async def hedging(client, discord, settings):
+    """Hedging enabled on a route whose usual latency is known; the next request hangs."""
+    settings(HEDGING_ENABLED=True)
+    discord.add("GET", PATH, ok())
+    # Learn the route's bucket, which must have room for the hedge
+    await client.request_with_retry("GET", API + PATH)
+    for _ in range(client.latencies.MIN_SAMPLES):
+        client.latencies.record(ROUTE, 0.01)
+    calls = []
+    
+    async def slow_first(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return await discord(request)
+    
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(slow_first))
+    return calls
+
+
+async def test_slow_get_is_hedged(client, hedging):
+    response = await asyncio.wait_for(client.request_with_retry("GET", API + PATH), 1)
+    assert response.status_code == 200
+    assert len(hedging) == 2
+    assert client.hedge_budget.sent == client.hedge_budget.won == 1
+
+
+async def test_hedge_gets_its_own_phase_trace(client, hedging, settings):
+    settings(TRACING_ENABLED=True)
+    production._current_span.set(production.Span("test"))
+    await asyncio.wait_for(client.request_with_retry("GET", API + PATH), 1)
+    primary, hedge = (request.extensions["trace"] for request in hedging)
+    assert primary is not hedge
+    assert hedge.attributes == {"discord.hedge": True}
+
+async def test_unknown_routes_are_not_hedged(client, discord, settings):
+    settings(HEDGING_ENABLED=True)
+    discord.delay = 0.05
+    discord.add("GET", PATH, httpx.Response(200, json={"id": "2"}))
+    await client.request_with_retry("GET", API + PATH)
+    assert discord.sent("GET", PATH) == 1
+    assert client.latencies.status()[ROUTE]["samples"] == 1
+
+
+async def test_writes_are_never_hedged(client, discord, settings):
+    settings(HEDGING_ENABLED=True)
+    for _ in range(client.latencies.MIN_SAMPLES):
+        client.latencies.record("PATCH /channels/{channel_id}/messages/{message_id}", 0.001)
+    discord.delay = 0.05
+    discord.add("PATCH", PATH, httpx.Response(200, json={"id": "2"}))
+    await client.request_with_retry("PATCH", API + PATH, json={"content": "x"})
+    assert discord.sent("PATCH", PATH) == 1
+
+
+async def test_budget_limits_hedges(client, hedging):
+    client.hedge_budget.tokens = 0.0
+    task = asyncio.ensure_future(client.request_with_retry("GET", API + PATH))
+    await asyncio.sleep(0.1)
+    assert len(hedging) == 1
+    assert client.hedge_budget.denied == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+def test_hedge_delay_is_the_route_percentile(client):
+    for ms in range(1, 101):
+        client.latencies.record(ROUTE, ms / 1000)
+    assert client.latencies.hedge_delay(ROUTE) == pytest.approx(0.096)
+    assert client.latencies.hedge_delay("GET /gateway") is None
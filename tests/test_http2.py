@@ -0,0 +1,39 @@
+import sys
+
+import pytest
+
+import production
+
+
+async def built_pool(monkeypatch, **settings):
+    for name, value in settings.items():
+        monkeypatch.setattr(production.config, name, value)
+    http_client = production.ProductionHTTPClient()
+    await http_client._ensure_client()
+    pool = http_client.client._transport._pool
+    await http_client.close()
+    return pool
+
+
+async def test_http1_by_default(monkeypatch):
+    pool = await built_pool(monkeypatch, HTTP2_ENABLED=False)
+    assert (pool._http1, pool._http2) == (True, False)
+
+
+async def test_http2_is_negotiated_when_enabled(monkeypatch):
+    pytest.importorskip("h2")
+    pool = await built_pool(monkeypatch, HTTP2_ENABLED=True, HTTP2_PRIOR_KNOWLEDGE=False)
+    assert (pool._http1, pool._http2) == (True, True)
+
+
+async def test_prior_knowledge_speaks_only_http2(monkeypatch):
+    pytest.importorskip("h2")
+    pool = await built_pool(monkeypatch, HTTP2_ENABLED=True, HTTP2_PRIOR_KNOWLEDGE=True)
+    assert (pool._http1, pool._http2) == (False, True)
+
+
+async def test_falls_back_to_http1_without_h2(monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, "h2", None)
+    pool = await built_pool(monkeypatch, HTTP2_ENABLED=True, HTTP2_PRIOR_KNOWLEDGE=True)
+    assert (pool._http1, pool._http2) == (True, False)
+    assert "'h2' is not installed" in capsys.readouterr().err
@@ -0,0 +1,53 @@
+import json
+import sys
+
+import httpx
+import pytest
+
+import production
+from production import _load_json_codec
+
+VALUE = {"content": "héllo ✨", "nonce": 1234567890123456789, "embeds": [{"fields": []}], "tts": False}
+
+
+@pytest.mark.parametrize("name", production.JSON_CODECS)
+def test_codecs_round_trip(name):
+    pytest.importorskip(name)
+    codec, dumps, loads = _load_json_codec(name)
+    assert codec == name
+    encoded = dumps(VALUE)
+    assert isinstance(encoded, bytes)
+    assert loads(encoded) == VALUE == json.loads(encoded)
+
+
+@pytest.mark.parametrize("name", production.JSON_CODECS)
+def test_values_the_fast_codecs_reject_fall_back_to_the_stdlib(name):
+    pytest.importorskip(name)
+    _, dumps, loads = _load_json_codec(name)
+    assert loads(dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+
+
+def test_auto_prefers_the_fastest_installed(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    assert _load_json_codec("auto")[0] == "json"
+
+
+def test_missing_codec_falls_back_with_a_warning(monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    assert _load_json_codec("orjson")[0] == "json"
+    assert "'orjson' is not installed" in capsys.readouterr().err
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        _load_json_codec("simplejson")
+
+
+async def test_request_bodies_use_the_codec(client, discord):
+    discord.add("POST", "/channels/1/messages", httpx.Response(200, json={"id": "9", "content": "héllo ✨"}))
+    result = await production.discord_request("POST", "/channels/1/messages", json=VALUE)
+    assert result == {"id": "9", "content": "héllo ✨"}
+    request = discord.requests[-1]
+    assert json.loads(request.content) == VALUE
+    assert request.headers["Content-Type"] == "application/json"
@@ -0,0 +1,65 @@
+import inspect
+import json
+
+import httpx
+import pytest
+
+import production
+
+PATH = "/channels/1/messages"
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(settings):
+    settings(RETRY_DELAY=0.01, MAX_RETRIES=3, AUTO_MESSAGE_NONCE=True)
+
+
+def sent_bodies(discord):
+    return [json.loads(request.content) for request in discord.requests if request.method == "POST"]
+
+
+async def test_sends_carry_a_generated_enforced_nonce(client, discord):
+    discord.add("POST", PATH, httpx.Response(200, json={"id": "9"}))
+    await production.DISCORDBOT_CREATE_MESSAGE(channel_id="1", content="hi")
+    await production.DISCORDBOT_CREATE_MESSAGE(channel_id="1", content="hi")
+    first, second = sent_bodies(discord)
+    assert first["enforce_nonce"] is True
+    assert first["nonce"] > 0 and first["nonce"] != second["nonce"]
+
+
+async def test_timed_out_send_is_retried_with_the_same_nonce(client, discord):
+    def timeout():
+        raise httpx.ReadTimeout("timed out")
+    
+    discord.add("POST", PATH, timeout, httpx.Response(200, json={"id": "9"}))
+    assert await production.DISCORDBOT_CREATE_MESSAGE(channel_id="1", content="hi", nonce=42) == {"id": "9"}
+    assert [body["nonce"] for body in sent_bodies(discord)] == [42, 42]
+
+
+async def test_send_without_nonce_is_not_retried(client, discord, settings):
+    settings(AUTO_MESSAGE_NONCE=False)
+    discord.add("POST", PATH, httpx.Response(503, json={"message": "Service Unavailable"}))
+    with pytest.raises(production.DiscordServerError):
+        await production.DISCORDBOT_CREATE_MESSAGE(channel_id="1", content="hi")
+    assert discord.sent("POST", PATH) == 1
+    assert "nonce" not in sent_bodies(discord)[0]
+
+
+async def test_nonce_is_not_enforced_when_disabled(client, discord):
+    discord.add("POST", PATH, httpx.Response(503, json={"message": "Service Unavailable"}))
+    with pytest.raises(production.DiscordServerError):
+        await production.DISCORDBOT_CREATE_MESSAGE(channel_id="1", content="hi", nonce=42, enforce_nonce=False)
+    assert discord.sent("POST", PATH) == 1
+    assert "enforce_nonce" not in sent_bodies(discord)[0]
+
+
+def test_generated_nonces_are_snowflake_shaped():
+    nonce = production._generate_nonce()
+    assert 0 < nonce < 2 ** 63
+    assert (nonce >> 22) + production.DISCORD_EPOCH <= int(production.time.time() * 1000)
+
+
+def test_enforce_nonce_does_not_shift_positional_arguments():
+    params = list(inspect.signature(production.DISCORDBOT_CREATE_MESSAGE).parameters)
+    assert params[:4] == ["channel_id", "content", "nonce", "tts"]
+    assert params[-1] == "enforce_nonce"
@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+
+import production
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    registry = production.MetricsRegistry()
+    monkeypatch.setattr(production, "metrics", registry)
+    return registry
+
+
+async def test_tool_calls_and_errors_are_counted(client, discord, metrics):
+    discord.add("GET", "/gateway", httpx.Response(200, json={"url": "wss://gateway.discord.gg"}))
+    discord.add("GET", "/channels/1/messages/2", httpx.Response(404, json={"message": "Unknown Message", "code": 10008}))
+    await production.mcp.call_tool("DISCORDBOT_GET_GATEWAY", {})
+    await production.mcp.call_tool("DISCORDBOT_GET_GATEWAY", {})
+    with pytest.raises(Exception):
+        await production.mcp.call_tool("DISCORDBOT_GET_MESSAGE", {"channel_id": "1", "message_id": "2"})
+    
+    tools = metrics.snapshot()["tools"]
+    assert tools["DISCORDBOT_GET_GATEWAY"]["calls"] == 2
+    assert tools["DISCORDBOT_GET_GATEWAY"]["latency"]["count"] == 2
+    assert tools["DISCORDBOT_GET_MESSAGE"]["errors"] == {"404": 1}
+    assert metrics.snapshot()["requests_by_status"] == {200: 2, 404: 1}
+
+
+async def test_request_phases_and_cache_lookups_are_recorded(client, discord, metrics):
+    discord.add("GET", "/guilds/1", httpx.Response(200, json={"id": "1"}))
+    await production.discord_request("GET", "/guilds/1")
+    await production.discord_request("GET", "/guilds/1")
+    snapshot = metrics.snapshot()
+    assert set(snapshot["phases"]) == {"queue", "network", "decode"}
+    assert set(snapshot["rate_limit_waits"]) >= {"bucket", "global"}
+    assert snapshot["cache_lookups"] == {"miss": 1, "memory": 1}
+    assert snapshot["bytes"]["in"] == len(b'{"id":"1"}')
+
+
+def test_prometheus_exposition(metrics):
+    metrics.inc("discordbot_requests_total", route="GET /gateway", status=200)
+    metrics.observe("discordbot_tool_duration_seconds", 0.003, tool="DISCORDBOT_GET_GATEWAY")
+    text = metrics.render_prometheus()
+    assert "# TYPE discordbot_requests_total counter" in text
+    assert 'discordbot_requests_total{route="GET /gateway",status="200"} 1' in text
+    assert 'discordbot_tool_duration_seconds_bucket{tool="DISCORDBOT_GET_GATEWAY",le="0.0025"} 0' in text
+    assert 'discordbot_tool_duration_seconds_bucket{tool="DISCORDBOT_GET_GATEWAY",le="0.005"} 1' in text
+    assert 'discordbot_tool_duration_seconds_bucket{tool="DISCORDBOT_GET_GATEWAY",le="+Inf"} 1' in text
+    assert 'discordbot_tool_duration_seconds_count{tool="DISCORDBOT_GET_GATEWAY"} 1' in text
+
+
+def test_nothing_is_recorded_when_disabled(metrics, settings):
+    settings(METRICS_ENABLED=False)
+    metrics.inc("discordbot_requests_total", status=200)
+    assert metrics.render_prometheus() == "\n"
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    histogram = production._Histogram()
+    for _ in range(100):
+        histogram.observe(0.004)
+    assert 0.0025 < histogram.quantile(0.5) <= 0.005
+    assert production._Histogram().quantile(0.5) is None
+
+
+async def test_metrics_endpoint_serves_the_exposition(metrics):
+    metrics.inc("discordbot_retries_total", kind="server_error")
+    server = await asyncio.start_server(production._serve_metrics, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        async with httpx.AsyncClient() as http:
+            response = await http.get(f"http://127.0.0.1:{port}/metrics")
+            missing = await http.get(f"http://127.0.0.1:{port}/other")
+    finally:
+        server.close()
+        await server.wait_closed()
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert 'discordbot_retries_total{kind="server_error"} 1' in response.text
+    assert missing.status_code == 404
+
+
+async def test_metrics_tool_formats(metrics):
+    assert "tools" in await production.DISCORDBOT_GET_METRICS()
+    assert isinstance(await production.DISCORDBOT_GET_METRICS(format="prometheus"), str)
+    with pytest.raises(ValueError):
+        await production.DISCORDBOT_GET_METRICS(format="xml")
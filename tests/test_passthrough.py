@@ -0,0 +1,39 @@
+import httpx
+from mcp.types import TextContent
+
+import production
+
+BODY = b'{"url":"wss://gateway.discord.gg","shards":1}'
+
+
+def gateway():
+    return httpx.Response(200, content=BODY, headers={"Content-Type": "application/json"})
+
+
+async def test_body_is_returned_undecoded_when_enabled(client, discord, settings):
+    settings(RAW_JSON_PASSTHROUGH=True)
+    discord.add("GET", "/gateway", gateway())
+    result = await production.discord_request("GET", "/gateway", passthrough=True)
+    assert isinstance(result, TextContent)
+    assert result.text == BODY.decode()
+
+
+async def test_disabled_by_default(client, discord, settings):
+    settings(RAW_JSON_PASSTHROUGH=False)
+    discord.add("GET", "/gateway", gateway())
+    assert await production.discord_request("GET", "/gateway", passthrough=True) == {
+        "url": "wss://gateway.discord.gg", "shards": 1}
+
+
+async def test_only_tools_that_opt_in_get_raw_text(client, discord, settings):
+    settings(RAW_JSON_PASSTHROUGH=True)
+    discord.add("GET", "/gateway", gateway())
+    assert isinstance(await production.discord_request("GET", "/gateway"), dict)
+    assert isinstance(await production.DISCORDBOT_GET_GATEWAY(), TextContent)
+
+
+async def test_non_json_bodies_are_decoded_as_usual(client, discord, settings):
+    settings(RAW_JSON_PASSTHROUGH=True)
+    discord.add("GET", "/gateway", httpx.Response(200, text="not json", headers={"Content-Type": "text/plain"}))
+    result = await production.discord_request("GET", "/gateway", passthrough=True)
+    assert result["text"] == "not json"
@@ -0,0 +1,94 @@
+import threading
+
+import httpx
+
+import production
+from production import PersistentResponseCache, ResponseCache
+
+PATH = "/applications/5/commands"
+COMMANDS = [{"id": "7", "name": "ping"}]
+
+
+async def restart(disk_cache, monkeypatch):
+    """Replace both caches as a new server process would, keeping the file."""
+    await disk_cache.close()
+    reopened = PersistentResponseCache(disk_cache.path, disk_cache.max_bytes)
+    await reopened.open()
+    monkeypatch.setattr(production, "persistent_cache", reopened)
+    monkeypatch.setattr(production, "response_cache",
+                        ResponseCache(production.config.RESPONSE_CACHE_MAX_BYTES, reopened))
+    return reopened
+
+
+async def test_responses_survive_a_restart(client, discord, disk_cache, monkeypatch):
+    discord.add("GET", PATH, httpx.Response(200, json=COMMANDS))
+    assert await production.discord_request("GET", PATH) == COMMANDS
+    
+    reopened = await restart(disk_cache, monkeypatch)
+    assert await production.discord_request("GET", PATH) == COMMANDS
+    assert discord.sent("GET", PATH) == 1
+    assert reopened.hits == 1
+    await reopened.close()
+
+
+async def test_expired_entries_are_revalidated(client, discord, disk_cache):
+    stored = httpx.Response(200, json=COMMANDS, headers={"ETag": '"v1"'})
+    key = production._request_key("GET", production.config.DISCORD_API_BASE + PATH, None,
+                                  {**production.DEFAULT_HEADERS, "Authorization": client.profile().authorization})
+    await disk_cache.put(key, "/applications/{application_id}/commands", stored, -1.0, {"application_id": "5"})
+    discord.add("GET", PATH, httpx.Response(304))
+    
+    assert await production.discord_request("GET", PATH) == COMMANDS
+    assert discord.requests[-1].headers["If-None-Match"] == '"v1"'
+    assert disk_cache.not_modified == 1
+    # Renewed: served from disk without asking again
+    production.response_cache.clear()
+    assert await production.discord_request("GET", PATH) == COMMANDS
+    assert discord.sent("GET", PATH) == 1
+
+
+async def test_writes_invalidate_disk_entries(client, discord, disk_cache):
+    discord.add("GET", PATH, httpx.Response(200, json=COMMANDS))
+    discord.add("DELETE", PATH + "/7", httpx.Response(204))
+    await production.discord_request("GET", PATH)
+    
+    await production.discord_request("DELETE", PATH + "/7")
+    production.response_cache.clear()
+    await production.discord_request("GET", PATH)
+    assert discord.sent("GET", PATH) == 2
+
+
+async def test_file_is_bounded_by_max_bytes(tmp_path):
+    body = httpx.Response(200, content=b"x" * 300)
+    cache = PersistentResponseCache(str(tmp_path / "responses.sqlite3"), 1000)
+    await cache.open()
+    for i in range(5):
+        await cache.put(f"key{i}", "/voice/regions", body, 60.0)
+    assert cache.size <= 1000
+    assert cache.evictions == 2
+    assert (await cache.lookup("key0"))[0] is None
+    assert (await cache.lookup("key4"))[0] is not None
+    await cache.close()
+
+
+async def test_unusable_path_disables_the_cache(tmp_path, capsys):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = PersistentResponseCache(str(blocker / "responses.sqlite3"), 1000)
+    await cache.open()
+    assert await cache.lookup("key") == (None, 0.0, {})
+    assert "persistent cache disabled" in capsys.readouterr().err
+
+
+async def test_database_work_runs_off_the_event_loop(disk_cache, monkeypatch):
+    threads = []
+    put = disk_cache._put
+    
+    def record(*args):
+        threads.append(threading.current_thread())
+        return put(*args)
+    
+    monkeypatch.setattr(disk_cache, "_put", record)
+    await disk_cache.put("key", "/voice/regions", httpx.Response(200, json=[]), 60.0)
+    assert threads and threads[0] is not threading.main_thread()
+    assert (await disk_cache.lookup("key"))[0] is not None
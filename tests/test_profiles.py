@@ -0,0 +1,73 @@
+import httpx
+import pytest
+
+import production
+from production import BotProfile
+from fakes import API
+
+
+@pytest.fixture
+def alt(client):
+    """A second bot profile on the test client."""
+    profile = client.profiles["alt"] = BotProfile("alt", "Bot alt-token")
+    return profile
+
+
+def test_tokens_are_loaded_per_profile(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "main")
+    monkeypatch.setenv("DISCORD_BOT_TOKEN_MODERATOR", "Bot mod")
+    monkeypatch.setenv("DISCORD_BOT_TOKEN_EMPTY", "")
+    assert production._load_bot_tokens() == {"default": "Bot main", "moderator": "Bot mod"}
+
+
+def test_default_profile_must_have_a_token(monkeypatch, settings):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "main")
+    monkeypatch.setenv("DISCORD_BOT_TOKEN_MODERATOR", "Bot mod")
+    settings(DEFAULT_BOT_PROFILE="Moderator")
+    assert set(production._load_bot_tokens()) == {"default", "moderator"}
+    
+    settings(DEFAULT_BOT_PROFILE="support")
+    with pytest.raises(ValueError, match="DEFAULT_BOT_PROFILE is 'support' but DISCORD_BOT_TOKEN_SUPPORT is not set"):
+        production._load_bot_tokens()
+    # Through the proxy, the proxy holds the tokens and checks the profile
+    settings(USE_DISCORD_PROXY=True)
+    assert set(production._load_bot_tokens()) == {"default", "moderator"}
+
+async def test_requests_carry_the_profile_token(client, discord, alt):
+    discord.add("GET", "/gateway", httpx.Response(200, json={}))
+    await client.request_with_retry("GET", API + "/gateway")
+    await client.request_with_retry("GET", API + "/gateway", profile="ALT")
+    assert [r.headers["Authorization"] for r in discord.requests] == ["Bot test-token", "Bot alt-token"]
+
+
+async def test_profiles_have_their_own_rate_limits(client, discord, alt):
+    discord.add("GET", "/channels/1/messages/2", httpx.Response(200, json={}, headers={
+        "X-RateLimit-Bucket": "abc", "X-RateLimit-Limit": "5",
+        "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "10"}))
+    await client.request_with_retry("GET", API + "/channels/1/messages/2")
+    # The default bot's bucket is exhausted; the other bot's is not
+    response = await client.request_with_retry("GET", API + "/channels/1/messages/2", profile="alt")
+    assert response.status_code == 200
+    assert client.profile().rate_limits.get_bucket("GET", "/channels/1/messages/2").remaining == 0
+    assert alt.global_limiter is not client.profile().global_limiter
+
+
+async def test_tool_call_profile_selects_the_bot(client, discord, alt):
+    discord.add("GET", "/guilds/1", httpx.Response(200, json={"id": "1"}))
+    await production.discord_request("GET", "/guilds/1")
+    production._call_profile.set("alt")
+    await production.discord_request("GET", "/guilds/1")
+    # Cached responses are not shared between bots
+    assert discord.sent("GET", "/guilds/1") == 2
+    assert discord.requests[-1].headers["Authorization"] == "Bot alt-token"
+
+
+async def test_unknown_profiles_are_rejected(client, discord):
+    with pytest.raises(ValueError, match="Unknown bot profile 'nobody'"):
+        await client.request_with_retry("GET", API + "/gateway", profile="nobody")
+    assert not discord.requests
+
+
+async def test_status_reports_every_profile(client, alt):
+    assert set(client.rate_limit_status()["profiles"]) == {"default", "alt"}
+    assert (await production.DISCORDBOT_GET_CONFIG())["bot_profiles"] == ["alt", "default"]
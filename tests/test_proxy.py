@@ -0,0 +1,149 @@
+import asyncio
+import os
+import stat
+
+import httpx
+import pytest
+
+import production
+from production import DiscordProxy
+
+SECRET = "s3cret"
+
+
+@pytest.fixture
+async def proxy(client, settings):
+    """A DiscordProxy in front of ``client``, listening on a free local port."""
+    settings(PROXY_HOST="127.0.0.1", PROXY_PORT=0, PROXY_SOCKET="", PROXY_SECRET=SECRET)
+    proxy = DiscordProxy(client)
+    server = await proxy.start()
+    port = server.sockets[0].getsockname()[1]
+    settings(PROXY_PORT=port)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}/api/v10",
+                                 headers={production.PROXY_SECRET_HEADER: SECRET}) as http:
+        yield http
+    server.close()
+    await server.wait_closed()
+
+
+async def test_requests_are_forwarded_with_the_bot_token(proxy, discord):
+    discord.add("PATCH", "/channels/1/messages/2", httpx.Response(200, json={"id": "2", "content": "new"}))
+    response = await proxy.patch("/channels/1/messages/2", json={"content": "new"}, headers={
+        production.PROXY_PROFILE_HEADER: "default", production.PROXY_PRIORITY_HEADER: "interactive"})
+    assert response.status_code == 200
+    assert response.json() == {"id": "2", "content": "new"}
+    sent = discord.requests[0]
+    assert sent.headers["Authorization"] == "Bot test-token"
+    assert production.PROXY_PROFILE_HEADER not in sent.headers
+    assert production.PROXY_PRIORITY_HEADER not in sent.headers
+    assert production.PROXY_SECRET_HEADER not in sent.headers
+    assert sent.content == b'{"content":"new"}'
+
+
+async def test_requests_without_the_secret_are_refused(proxy, discord):
+    response = await proxy.get("/gateway", headers={production.PROXY_SECRET_HEADER: "guess"})
+    assert response.status_code == 401
+    assert not discord.requests
+
+
+async def test_requests_for_another_host_are_refused(proxy, discord):
+    # What a page on a DNS-rebound domain would send
+    response = await proxy.get("/gateway", headers={"Host": "attacker.example:8765"})
+    assert response.status_code == 403
+    assert not discord.requests
+
+
+async def test_tcp_listener_requires_a_secret(client, settings):
+    settings(PROXY_SOCKET="", PROXY_SECRET="")
+    with pytest.raises(RuntimeError, match="PROXY_SECRET must be set"):
+        await DiscordProxy(client).start()
+
+
+async def test_config_hides_the_secret(client, settings):
+    settings(PROXY_SECRET=SECRET)
+    assert (await production.DISCORDBOT_GET_CONFIG())["settings"]["PROXY_SECRET"] == "(set)"
+
+
+async def test_status_endpoint(proxy):
+    response = await proxy.get("/proxy/status")
+    assert response.status_code == 200
+    assert response.json()["profiles"] == ["default"]
+
+
+async def test_unknown_profiles_are_rejected(proxy, discord):
+    response = await proxy.get("/gateway", headers={production.PROXY_PROFILE_HEADER: "nobody"})
+    assert response.status_code == 400
+    assert "Unknown bot profile" in response.json()["message"]
+    assert not discord.requests
+
+
+async def test_rate_limits_past_the_wait_are_passed_on(proxy, discord, settings):
+    settings(RATE_LIMIT_MAX_WAIT=1.0)
+    discord.add("GET", "/channels/1/messages/2", httpx.Response(
+        429, json={"retry_after": 30.0, "global": False}, headers={"X-RateLimit-Scope": "user"}))
+    response = await proxy.get("/channels/1/messages/2")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+    assert response.json()["retry_after"] == 30.0
+
+
+async def test_unexpected_errors_are_answered_with_a_502(proxy, discord, capsys):
+    def broken():
+        raise RuntimeError("boom")
+    
+    discord.add("GET", "/guilds/1", broken)
+    discord.add("GET", "/guilds/2", httpx.Response(200, json={"id": "2"}))
+    response = await proxy.get("/guilds/1")
+    assert response.status_code == 502
+    assert response.json() == {"message": "Proxy error: RuntimeError: boom", "code": 0}
+    assert "proxy request GET /guilds/1 failed" in capsys.readouterr().err
+    # The connection is still served
+    assert (await proxy.get("/guilds/2")).json() == {"id": "2"}
+
+
+async def test_malformed_body_lengths_are_rejected(proxy, discord):
+    port = production.config.PROXY_PORT
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"POST /api/v10/channels/1/messages HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+                 f"{production.PROXY_SECRET_HEADER}: {SECRET}\r\nContent-Length: -5\r\n\r\n".encode())
+    await writer.drain()
+    assert (await reader.readline()).startswith(b"HTTP/1.1 400")
+    assert b"Malformed body length" in await reader.read()
+    writer.close()
+    assert not discord.requests
+
+async def test_concurrent_reads_share_one_request(proxy, discord):
+    discord.delay = 0.05
+    discord.add("GET", "/guilds/1/roles", httpx.Response(200, json=[]))
+    responses = await asyncio.gather(*(proxy.get("/guilds/1/roles") for _ in range(3)))
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert discord.sent("GET", "/guilds/1/roles") == 1
+
+
+async def test_servers_behind_the_proxy_send_profile_names(client, discord, settings):
+    settings(USE_DISCORD_PROXY=True, PROXY_SECRET=SECRET)
+    profile = client.profile()
+    assert profile.auth_headers() == {production.PROXY_PROFILE_HEADER: "default",
+                                      production.PROXY_SECRET_HEADER: SECRET}
+    discord.add("GET", "/gateway", httpx.Response(200, json={}))
+    profile.authorization = ""
+    await client.request_with_retry("GET", production.config.DISCORD_API_BASE + "/gateway")
+    sent = discord.requests[0].headers
+    assert "Authorization" not in sent
+    assert sent[production.PROXY_PROFILE_HEADER] == "default"
+    assert sent[production.PROXY_PRIORITY_HEADER] == "read"
+
+
+async def test_unix_socket_is_private(client, discord, settings, tmp_path):
+    path = str(tmp_path / "discord.sock")
+    settings(PROXY_SOCKET=path, PROXY_SECRET="")
+    server = await DiscordProxy(client).start()
+    try:
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        discord.add("GET", "/gateway", httpx.Response(200, json={"url": "wss://gateway.discord.gg"}))
+        async with httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(uds=path)) as http:
+            response = await http.get("http://proxy/api/v10/gateway")
+        assert response.json() == {"url": "wss://gateway.discord.gg"}
+    finally:
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,215 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import production
+from production import GlobalRateLimiter, InvalidRequestTracker, RateLimitInfo, RateLimitManager
+from fakes import API
+
+
+def limited(status=200, bucket="abc", limit=5, remaining=4, reset_after=10.0, **headers):
+    return httpx.Response(status, json={"id": "1"}, headers={
+        "X-RateLimit-Bucket": bucket,
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset-After": str(reset_after),
+        **headers
+    })
+
+
+def test_rate_limit_headers_are_parsed():
+    info = RateLimitInfo.from_headers(limited(remaining=0, reset_after=1.5, **{"X-RateLimit-Scope": "shared"}).headers)
+    assert (info.bucket, info.limit, info.remaining, info.reset_after, info.scope) == ("abc", 5, 0, 1.5, "shared")
+    assert RateLimitInfo.from_headers(httpx.Response(200).headers) is None
+
+
+def test_routes_are_templated_with_their_major_parameters():
+    assert production._parse_route("/api/v10/channels/1/messages/2") == (
+        "/channels/{channel_id}/messages/{message_id}", {"channel_id": "1", "message_id": "2"})
+    assert production._parse_route("/guilds/3/members/4")[0] == "/guilds/{guild_id}/members/{user_id}"
+
+
+async def test_bucket_sends_one_request_until_limits_are_known():
+    bucket = RateLimitManager().get_bucket("GET", "/channels/1/messages")
+    await bucket.acquire()
+    second = asyncio.ensure_future(bucket.acquire())
+    await asyncio.sleep(0.01)
+    assert not second.done()
+    
+    bucket.update(RateLimitInfo(bucket="abc", limit=5, remaining=4, reset_after=10.0))
+    await asyncio.wait_for(second, 1)
+    assert bucket.in_flight == 1
+    assert bucket.remaining == 3
+
+
+async def test_bucket_waits_for_reset_when_exhausted():
+    bucket = RateLimitManager().get_bucket("GET", "/channels/1/messages")
+    await bucket.acquire()
+    bucket.update(RateLimitInfo(bucket="abc", limit=1, remaining=0, reset_after=0.1))
+    
+    waited = await bucket.acquire()
+    assert waited >= 0.09
+
+
+async def test_routes_without_headers_are_not_limited():
+    bucket = RateLimitManager().get_bucket("GET", "/gateway")
+    await bucket.acquire()
+    bucket.update(None)
+    assert await asyncio.wait_for(asyncio.gather(bucket.acquire(), bucket.acquire()), 1)
+
+
+async def test_buckets_are_split_by_major_parameter():
+    manager = RateLimitManager()
+    assert manager.get_bucket("GET", "/channels/1/messages") is manager.get_bucket("GET", "/channels/1/messages")
+    assert manager.get_bucket("GET", "/channels/1/messages") is not manager.get_bucket("GET", "/channels/2/messages")
+
+
+async def test_route_learning_a_shared_bucket_hands_over_its_requests():
+    manager = RateLimitManager()
+    shared = manager.get_bucket("GET", "/channels/1/messages")
+    await shared.acquire()
+    manager.update(shared, RateLimitInfo(bucket="h", limit=5, remaining=4, reset_after=10.0))
+    
+    orphan = manager.get_bucket("GET", "/channels/1/messages/2")
+    assert orphan is not shared
+    await orphan.acquire()
+    waiter = asyncio.ensure_future(orphan.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    
+    manager.update(orphan, RateLimitInfo(bucket="h", limit=5, remaining=3, reset_after=10.0))
+    await asyncio.wait_for(waiter, 1)
+    assert orphan.merged_into is shared
+    assert manager.get_bucket("GET", "/channels/1/messages/3") is shared
+    assert manager.get_bucket("GET", "/channels/2/messages/3") is not shared
+    # The orphan's finished request released its slot once; the waiter now holds one on the shared bucket
+    assert shared.in_flight == 1
+    assert shared.remaining == 2
+    
+    orphan.release()
+    assert shared.in_flight == 0
+
+
+async def test_requests_wait_for_the_bucket_to_reset(client, discord):
+    path = "/channels/1/messages/2"
+    discord.add("GET", path, limited(limit=1, remaining=0, reset_after=0.1))
+    
+    await client.request_with_retry("GET", API + path)
+    started = time.monotonic()
+    await client.request_with_retry("GET", API + path)
+    assert time.monotonic() - started >= 0.09
+    assert discord.sent("GET", path) == 2
+
+
+async def test_global_limiter_holds_requests_past_the_window():
+    limiter = GlobalRateLimiter(2, 0.1)
+    assert await limiter.acquire() < 0.05
+    assert await limiter.acquire() < 0.05
+    assert await limiter.acquire() >= 0.09
+
+
+async def test_global_limiter_lets_urgent_waiters_through_first():
+    limiter = GlobalRateLimiter(1, 0.05)
+    await limiter.acquire()
+    order = []
+    
+    async def take(priority):
+        await limiter.acquire(priority)
+        order.append(priority)
+    
+    tasks = []
+    for priority in ("bulk", "read", "bulk", "moderation"):
+        tasks.append(asyncio.ensure_future(take(priority)))
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order == ["bulk", "moderation", "read", "bulk"]
+
+async def test_global_limit_applies_across_routes(client, discord):
+    client.profile().global_limiter = GlobalRateLimiter(2, 0.1)
+    for path in ("/channels/1", "/channels/2", "/guilds/3"):
+        discord.add("GET", path, httpx.Response(200, json={}))
+    
+    started = time.monotonic()
+    for path in ("/channels/1", "/channels/2", "/guilds/3"):
+        await client.request_with_retry("GET", API + path)
+    assert time.monotonic() - started >= 0.09
+
+
+def test_invalid_requests_slow_down_past_the_threshold():
+    tracker = InvalidRequestTracker(limit=10, window=600.0, slowdown=0.5)
+    for _ in range(5):
+        tracker.record(401)
+    assert tracker.delay() == 0.0
+    
+    tracker.record(200)
+    tracker.record(429, RateLimitInfo(scope="shared"))
+    assert tracker.delay() == 0.0
+    
+    tracker.record(403)
+    assert 0.0 < tracker.delay() < tracker.MAX_SLOWDOWN_DELAY
+    for _ in range(4):
+        tracker.record(429)
+    assert tracker.delay() > 599.0
+
+
+async def test_invalid_responses_are_counted(client, discord):
+    discord.add("GET", "/channels/1", httpx.Response(403, json={"message": "Missing Access", "code": 50001}))
+    discord.add("GET", "/channels/2", httpx.Response(200, json={}))
+    await client.request_with_retry("GET", API + "/channels/1")
+    await client.request_with_retry("GET", API + "/channels/2")
+    assert client.invalid_requests.status()["used"] == 1
+
+
+def test_retry_after_falls_back_to_the_header():
+    response = httpx.Response(429, text="", headers={"Retry-After": "2"})
+    assert production._parse_retry_after(response, None) == (2.0, False)
+    response = httpx.Response(429, json={"retry_after": 0.5, "global": True})
+    assert production._parse_retry_after(response, None) == (0.5, True)
+
+
+async def test_429_is_waited_out_and_resent(client, discord):
+    path = "/channels/1/messages/2"
+    discord.add("GET", path,
+                limited(429, remaining=0, reset_after=0.1, **{"Retry-After": "0.1"}),
+                limited(remaining=4))
+    
+    started = time.monotonic()
+    response = await client.request_with_retry("GET", API + path)
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 0.09
+    assert discord.sent("GET", path) == 2
+    assert client.invalid_requests.status()["used"] == 1
+
+
+async def test_429_longer_than_the_max_wait_raises(client, discord, settings):
+    settings(RATE_LIMIT_MAX_WAIT=1.0)
+    path = "/channels/1/messages/2"
+    discord.add("GET", path, httpx.Response(429, json={"retry_after": 30.0, "global": False}))
+    
+    with pytest.raises(production.DiscordRateLimitError) as raised:
+        await client.request_with_retry("GET", API + path)
+    assert raised.value.retry_after == 30.0
+    assert discord.sent("GET", path) == 1
+
+
+async def test_global_429_pauses_the_profile(client, discord):
+    discord.add("GET", "/channels/1",
+                httpx.Response(429, json={"retry_after": 0.1, "global": True},
+                               headers={"X-RateLimit-Global": "true"}),
+                httpx.Response(200, json={}))
+    
+    response = await client.request_with_retry("GET", API + "/channels/1")
+    assert response.status_code == 200
+    assert client.profile().global_limiter.paused_until > 0
+
+
+async def test_rate_limited_tool_call_reports_retry_after(client, discord, settings):
+    settings(RATE_LIMIT_MAX_WAIT=1.0)
+    discord.add("GET", "/channels/1", httpx.Response(429, json={"retry_after": 30.0, "global": False}))
+    
+    with pytest.raises(production.DiscordRateLimitError) as raised:
+        await production.discord_request("GET", "/channels/1")
+    result = production._handle_discord_error(raised.value, "get channel")
+    assert (result["status"], result["retry_after"], result["global"]) == (429, 30.0, False)
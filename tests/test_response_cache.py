@@ -0,0 +1,186 @@
+import gzip
+
+import httpx
+import pytest
+
+import production
+from production import ResponseCache
+
+
+def response(body):
+    return httpx.Response(200, json=body)
+
+
+def test_entries_expire_after_their_ttl():
+    cache = ResponseCache(1024 * 1024)
+    cache.put("a", "/guilds/{guild_id}", response({"id": "1"}), ttl=-1.0)
+    cache.put("b", "/guilds/{guild_id}", response({"id": "2"}), ttl=60.0)
+    assert cache.get("a") is None
+    assert cache.get("b").json() == {"id": "2"}
+    assert (cache.expirations, cache.hits) == (1, 1)
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    entry_size = len(response({"id": "1"}).content) + 1 + ResponseCache.ENTRY_OVERHEAD
+    cache = ResponseCache(entry_size * 2)
+    cache.put("a", "/guilds/{guild_id}", response({"id": "1"}), 60.0)
+    cache.put("b", "/guilds/{guild_id}", response({"id": "2"}), 60.0)
+    cache.get("a")
+    cache.put("c", "/guilds/{guild_id}", response({"id": "3"}), 60.0)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.evictions == 1
+
+
+def test_only_gets_of_listed_routes_have_a_ttl():
+    assert ResponseCache.ttl_for("GET", "/guilds/{guild_id}") == production.CACHE_TTL_POLICIES["/guilds/{guild_id}"]
+    assert ResponseCache.ttl_for("PATCH", "/guilds/{guild_id}") is None
+    assert ResponseCache.ttl_for("GET", "/channels/{channel_id}/messages") is None
+
+
+async def test_invalidate_matches_path_parameters():
+    cache = ResponseCache(1024 * 1024)
+    cache.put("g1", "/guilds/{guild_id}/roles", response([]), 60.0, {"guild_id": "1"})
+    cache.put("g2", "/guilds/{guild_id}/roles", response([]), 60.0, {"guild_id": "2"})
+    assert await cache.invalidate("/guilds/{guild_id}/roles", {"guild_id": "1"}) == 1
+    assert cache.get("g1") is None and cache.get("g2") is not None
+    assert await cache.invalidate("*", {}) == 1
+
+
+async def test_reads_are_served_from_cache(client, discord):
+    discord.add("GET", "/guilds/1", response({"id": "1", "name": "old"}))
+    assert await production.discord_request("GET", "/guilds/1") == {"id": "1", "name": "old"}
+    assert await production.discord_request("GET", "/guilds/1") == {"id": "1", "name": "old"}
+    assert discord.sent("GET", "/guilds/1") == 1
+
+
+async def test_uncached_routes_always_reach_discord(client, discord):
+    discord.add("GET", "/channels/1/messages", response([]))
+    for _ in range(2):
+        await production.discord_request("GET", "/channels/1/messages")
+    assert discord.sent("GET", "/channels/1/messages") == 2
+
+
+async def test_cache_modes(client, discord):
+    discord.add("GET", "/guilds/1", response({"id": "1", "name": "old"}), response({"id": "1", "name": "new"}))
+    await production.discord_request("GET", "/guilds/1")
+    
+    assert await production.discord_request("GET", "/guilds/1", cache_mode="bypass") == {"id": "1", "name": "new"}
+    # A bypassed read does not touch the cached copy
+    assert await production.discord_request("GET", "/guilds/1") == {"id": "1", "name": "old"}
+    assert await production.discord_request("GET", "/guilds/1", cache_mode="refresh") == {"id": "1", "name": "new"}
+    assert await production.discord_request("GET", "/guilds/1") == {"id": "1", "name": "new"}
+    assert discord.sent("GET", "/guilds/1") == 3
+    
+    with pytest.raises(ValueError):
+        await production.discord_request("GET", "/guilds/1", cache_mode="stale")
+
+
+async def test_error_responses_are_not_cached(client, discord):
+    discord.add("GET", "/guilds/1", httpx.Response(403, json={"message": "Missing Access", "code": 50001}),
+                response({"id": "1"}))
+    with pytest.raises(production.DiscordForbiddenError):
+        await production.discord_request("GET", "/guilds/1")
+    assert await production.discord_request("GET", "/guilds/1") == {"id": "1"}
+
+
+async def test_tools_pass_the_cache_mode(client, discord):
+    discord.add("GET", "/guilds/1/roles", response([]))
+    await production.DISCORDBOT_LIST_GUILD_ROLES(guild_id="1")
+    await production.DISCORDBOT_LIST_GUILD_ROLES(guild_id="1")
+    await production.DISCORDBOT_LIST_GUILD_ROLES(guild_id="1", cache_mode="bypass")
+    assert discord.sent("GET", "/guilds/1/roles") == 2
+
+
+
+@pytest.mark.parametrize("tool, kwargs, path", [
+    ("DISCORDBOT_LIST_GUILD_EMOJIS", {"guild_id": "1"}, "/guilds/1/emojis"),
+    ("DISCORDBOT_GET_STICKER", {"sticker_id": "2"}, "/stickers/2"),
+    ("DISCORDBOT_GET_WEBHOOK", {"webhook_id": "3"}, "/webhooks/3"),
+    ("DISCORDBOT_LIST_AUTO_MODERATION_RULES", {"guild_id": "1"}, "/guilds/1/auto-moderation/rules"),
+    ("DISCORDBOT_GET_GUILD_WELCOME_SCREEN", {"guild_id": "1"}, "/guilds/1/welcome-screen"),
+    ("DISCORDBOT_GET_APPLICATION_COMMAND", {"application_id": "4", "command_id": "5"},
+     "/applications/4/commands/5"),
+])
+async def test_cached_getters_accept_the_cache_mode(client, discord, tool, kwargs, path):
+    discord.add("GET", path, response({"id": "1"}))
+    tool = getattr(production, tool)
+    await tool(**kwargs)
+    await tool(**kwargs)
+    assert discord.sent("GET", path) == 1
+    await tool(**kwargs, cache_mode="refresh")
+    assert discord.sent("GET", path) == 2
+
+
+async def test_write_refreshes_the_cached_read(client, discord):
+    discord.add("GET", "/guilds/1", response({"id": "1", "name": "old"}))
+    discord.add("PATCH", "/guilds/1", response({"id": "1", "name": "new"}))
+    await production.discord_request("GET", "/guilds/1")
+    
+    await production.discord_request("PATCH", "/guilds/1", json={"name": "new"})
+    assert await production.discord_request("GET", "/guilds/1") == {"id": "1", "name": "new"}
+    assert discord.sent("GET", "/guilds/1") == 1
+    assert production.response_cache.write_throughs == 1
+
+
+async def test_write_through_of_a_compressed_response(client, discord):
+    body = b'{"id": "1", "name": "new"}'
+    discord.add("GET", "/guilds/1", response({"id": "1", "name": "old"}))
+    discord.add("PATCH", "/guilds/1", httpx.Response(
+        200, content=gzip.compress(body),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip", "ETag": '"v2"'}))
+    await production.discord_request("GET", "/guilds/1")
+    
+    await production.discord_request("PATCH", "/guilds/1", json={"name": "new"})
+    assert await production.discord_request("GET", "/guilds/1") == {"id": "1", "name": "new"}
+    assert discord.sent("GET", "/guilds/1") == 1
+    assert production.response_cache.write_throughs == 1
+
+
+async def test_write_evicts_affected_reads_only(client, discord):
+    for path in ("/guilds/1/roles", "/guilds/1", "/guilds/2/roles"):
+        discord.add("GET", path, response({"path": path}))
+        await production.discord_request("GET", path)
+    discord.add("DELETE", "/guilds/1/roles/5", httpx.Response(204))
+    
+    await production.discord_request("DELETE", "/guilds/1/roles/5")
+    for path in ("/guilds/1/roles", "/guilds/1", "/guilds/2/roles"):
+        await production.discord_request("GET", path)
+    assert discord.sent("GET", "/guilds/1/roles") == 2
+    assert discord.sent("GET", "/guilds/1") == 2
+    assert discord.sent("GET", "/guilds/2/roles") == 1
+
+
+async def test_placeholders_resolve_from_the_write_response(client, discord):
+    discord.add("GET", "/guilds/1/channels", response([]))
+    discord.add("PATCH", "/channels/7", response({"id": "7", "guild_id": "1", "name": "renamed"}))
+    await production.discord_request("GET", "/guilds/1/channels")
+    
+    await production.discord_request("PATCH", "/channels/7", json={"name": "renamed"})
+    await production.discord_request("GET", "/guilds/1/channels")
+    assert discord.sent("GET", "/guilds/1/channels") == 2
+    # The updated channel was written through
+    assert await production.discord_request("GET", "/channels/7") == {"id": "7", "guild_id": "1", "name": "renamed"}
+    assert discord.sent("GET", "/channels/7") == 0
+
+
+async def test_write_with_unknown_outcome_still_evicts(client, discord):
+    discord.add("GET", "/guilds/1/channels", response([]))
+    discord.add("POST", "/guilds/1/channels", httpx.Response(500, json={"message": "Internal Server Error"}))
+    await production.discord_request("GET", "/guilds/1/channels")
+    
+    with pytest.raises(production.DiscordServerError):
+        await production.discord_request("POST", "/guilds/1/channels", json={"name": "new"})
+    await production.discord_request("GET", "/guilds/1/channels")
+    assert discord.sent("GET", "/guilds/1/channels") == 2
+
+
+async def test_rejected_write_keeps_the_cache(client, discord):
+    discord.add("GET", "/guilds/1", response({"id": "1"}))
+    discord.add("PATCH", "/guilds/1", httpx.Response(403, json={"message": "Missing Permissions", "code": 50013}))
+    await production.discord_request("GET", "/guilds/1")
+    
+    with pytest.raises(production.DiscordForbiddenError):
+        await production.discord_request("PATCH", "/guilds/1", json={"name": "new"})
+    await production.discord_request("GET", "/guilds/1")
+    assert discord.sent("GET", "/guilds/1") == 1
@@ -0,0 +1,94 @@
+import httpx
+import pytest
+
+import production
+from production import RetryPolicy
+from fakes import API
+
+PATH = "/channels/1/messages"
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(settings):
+    settings(RETRY_DELAY=0.01, MAX_RETRIES=3)
+
+
+def unavailable():
+    return httpx.Response(503, json={"message": "Service Unavailable"})
+
+
+async def test_idempotent_requests_are_retried_on_5xx(client, discord):
+    discord.add("GET", PATH, unavailable(), unavailable(), httpx.Response(200, json=[]))
+    response = await client.request_with_retry("GET", API + PATH)
+    assert response.status_code == 200
+    assert discord.sent("GET", PATH) == 3
+
+
+async def test_retries_stop_after_max_retries(client, discord):
+    discord.add("GET", PATH, unavailable())
+    response = await client.request_with_retry("GET", API + PATH)
+    assert response.status_code == 503
+    assert discord.sent("GET", PATH) == 4
+
+
+async def test_non_idempotent_requests_are_not_resent_after_reaching_discord(client, discord):
+    discord.add("POST", PATH, unavailable())
+    assert (await client.request_with_retry("POST", API + PATH)).status_code == 503
+    assert discord.sent("POST", PATH) == 1
+    
+    def timeout():
+        raise httpx.ReadTimeout("timed out")
+    
+    discord.add("PATCH", PATH, timeout)
+    with pytest.raises(httpx.ReadTimeout):
+        await client.request_with_retry("PATCH", API + PATH)
+    assert discord.sent("PATCH", PATH) == 1
+
+
+async def test_requests_that_never_left_are_retried_for_every_method(client, discord):
+    def refused():
+        raise httpx.ConnectError("connection refused")
+    
+    discord.add("POST", PATH, refused, httpx.Response(200, json={"id": "1"}))
+    assert (await client.request_with_retry("POST", API + PATH)).status_code == 200
+    assert discord.sent("POST", PATH) == 2
+
+
+async def test_idempotent_override(client, discord):
+    discord.add("POST", PATH, unavailable(), httpx.Response(200, json={"id": "1"}))
+    assert (await client.request_with_retry("POST", API + PATH, idempotent=True)).status_code == 200
+    assert discord.sent("POST", PATH) == 2
+
+
+async def test_client_errors_are_not_retried(client, discord):
+    discord.add("GET", PATH, httpx.Response(404, json={"message": "Unknown Channel", "code": 10003}))
+    assert (await client.request_with_retry("GET", API + PATH)).status_code == 404
+    assert discord.sent("GET", PATH) == 1
+
+
+async def test_retry_budget_caps_total_backoff(client, discord, settings):
+    settings(RETRY_DELAY=0.2, RETRY_BUDGET=0.1)
+    discord.add("GET", PATH, unavailable())
+    assert (await client.request_with_retry("GET", API + PATH)).status_code == 503
+    assert discord.sent("GET", PATH) == 1
+
+
+def test_backoff_is_jittered_within_bounds(settings):
+    settings(RETRY_DELAY=0.1, RETRY_MAX_DELAY=1.0)
+    policy = RetryPolicy()
+    delays = [policy.next_delay(RetryPolicy.SERVER_ERROR, 1, 0.2) for _ in range(200)]
+    assert all(0.1 <= delay <= 0.6 for delay in delays)
+    assert len(set(delays)) > 1
+    assert policy.next_delay(RetryPolicy.SERVER_ERROR, 5, 10.0) <= 1.0
+    # A stale keep-alive connection is resent at once the first time
+    assert policy.next_delay(RetryPolicy.CONNECTION_RESET, 0, 0.0) == 0.0
+
+
+def test_failures_are_classified_by_kind():
+    policy = RetryPolicy()
+    assert policy.classify_error(httpx.ConnectTimeout("")) == RetryPolicy.NOT_SENT
+    assert policy.classify_error(httpx.ReadError("")) == RetryPolicy.CONNECTION_RESET
+    assert policy.classify_error(httpx.ReadTimeout("")) == RetryPolicy.TIMEOUT
+    assert policy.classify_error(ValueError()) is None
+    assert policy.classify_response(httpx.Response(502)) == RetryPolicy.SERVER_ERROR
+    assert policy.classify_response(httpx.Response(400)) is None
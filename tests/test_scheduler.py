@@ -0,0 +1,130 @@
+import asyncio
+
+import httpx
+import pytest
+
+import production
+from production import RequestScheduler
+from fakes import API
+
+
+async def hold(scheduler, order, priority, flow):
+    await scheduler.acquire(priority, flow)
+    order.append((priority, flow))
+
+
+async def queue_behind_busy_slot(scheduler, *waiters):
+    """Fill the only slot, queue ``waiters`` in order, then free it; returns the admission order."""
+    await scheduler.acquire("read", "busy")
+    order = []
+    tasks = []
+    for priority, flow in waiters:
+        tasks.append(asyncio.ensure_future(hold(scheduler, order, priority, flow)))
+        await asyncio.sleep(0)
+    for _ in tasks:
+        scheduler.release()
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return order
+
+
+async def test_urgent_classes_are_admitted_first():
+    scheduler = RequestScheduler(1, aging=0)
+    order = await queue_behind_busy_slot(
+        scheduler, ("bulk", "a"), ("read", "b"), ("moderation", "c"), ("interactive", "d"))
+    assert [priority for priority, _ in order] == ["moderation", "interactive", "read", "bulk"]
+
+
+async def test_flows_in_a_class_take_turns():
+    scheduler = RequestScheduler(1, aging=0)
+    order = await queue_behind_busy_slot(
+        scheduler, ("read", "crawl"), ("read", "crawl"), ("read", "crawl"), ("read", "lookup"))
+    assert [flow for _, flow in order] == ["crawl", "lookup", "crawl", "crawl"]
+
+
+async def test_long_waits_are_promoted():
+    scheduler = RequestScheduler(1, aging=0.01)
+    await scheduler.acquire("read", "busy")
+    order = []
+    bulk = asyncio.ensure_future(hold(scheduler, order, "bulk", "old"))
+    await asyncio.sleep(0.05)
+    urgent = asyncio.ensure_future(hold(scheduler, order, "moderation", "new"))
+    await asyncio.sleep(0)
+    scheduler.release()
+    await asyncio.sleep(0)
+    scheduler.release()
+    await asyncio.gather(bulk, urgent)
+    assert order == [("bulk", "old"), ("moderation", "new")]
+    assert scheduler.aged == 1
+
+
+async def test_cancelled_waiters_leave_the_queue():
+    scheduler = RequestScheduler(1, aging=0)
+    await scheduler.acquire("read", "busy")
+    waiter = asyncio.ensure_future(scheduler.acquire("bulk", "gone"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.status()["waiting"]["bulk"] == 0
+    scheduler.release()
+    assert scheduler.active == 0
+
+
+async def test_urgent_requests_overtake_queued_bulk_at_the_global_limit(client, discord, settings):
+    # The scheduler has slots to spare, so requests queue at the global limit instead
+    client.profile().global_limiter = production.GlobalRateLimiter(1, 0.02)
+    settings(PRIORITY_AGING=0)
+    for i in range(6):
+        discord.add("GET", f"/channels/{i}", httpx.Response(200, json={}))
+    
+    bulk = []
+    for i in range(5):
+        bulk.append(asyncio.ensure_future(
+            client.request_with_retry("GET", f"{API}/channels/{i}", priority="bulk")))
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.005)
+    await client.request_with_retry("GET", f"{API}/channels/5", priority="moderation")
+    # Only the bulk request already holding the limiter got ahead of it
+    assert len(discord.requests) <= 3
+    await asyncio.gather(*bulk)
+
+def test_tool_priorities():
+    assert production.tool_priority("DISCORDBOT_BAN_USER_FROM_GUILD") == "moderation"
+    assert production.tool_priority("DISCORDBOT_LIST_GUILD_MEMBERS") == "bulk"
+    assert production.tool_priority("DISCORDBOT_GET_CHANNEL") == "read"
+    assert production.tool_priority("DISCORDBOT_CREATE_MESSAGE") == "interactive"
+
+
+async def test_requests_are_scheduled_under_the_tool_class(client, discord, monkeypatch):
+    seen = []
+    acquire = client.scheduler.acquire
+    
+    async def record(priority, flow):
+        seen.append((priority, flow))
+        return await acquire(priority, flow)
+    
+    monkeypatch.setattr(client.scheduler, "acquire", record)
+    discord.add("PUT", "/guilds/1/bans/2", httpx.Response(204))
+    await production.mcp.call_tool("DISCORDBOT_BAN_USER_FROM_GUILD", {"guild_id": "1", "user_id": "2"})
+    await client.request_with_retry("GET", API + "/gateway")
+    assert seen == [("moderation", "default/DISCORDBOT_BAN_USER_FROM_GUILD"), ("read", "default/GET")]
+
+
+async def test_unknown_priority_is_rejected(client):
+    with pytest.raises(ValueError):
+        await client.request_with_retry("GET", API + "/gateway", priority="urgent")
+
+
+async def test_concurrency_defaults_to_the_pool_size(settings):
+    settings(SCHEDULER_MAX_CONCURRENCY=0, CONNECTION_POOL_SIZE=40)
+    client = production.ProductionHTTPClient()
+    assert client.scheduler.max_concurrency == 40
+    
+    settings(CONNECTION_POOL_SIZE=60)
+    await client.reconfigure(["CONNECTION_POOL_SIZE"])
+    assert client.scheduler.max_concurrency == 60
+    settings(SCHEDULER_MAX_CONCURRENCY=5)
+    await client.reconfigure(["SCHEDULER_MAX_CONCURRENCY"])
+    assert client.scheduler.max_concurrency == 5
+    await client.close()
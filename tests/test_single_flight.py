@@ -0,0 +1,126 @@
+import asyncio
+
+import httpx
+
+import production
+from production import SingleFlight
+
+
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+    
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "result"
+    
+    waiters = [asyncio.ensure_future(flight.do("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    release.set()
+    assert await asyncio.gather(*waiters) == ["result"] * 3
+    assert calls == 1
+    assert (flight.executed, flight.coalesced) == (1, 2)
+    assert flight.status()["in_flight"] == 0
+
+
+async def test_errors_reach_every_caller():
+    flight = SingleFlight()
+    
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+    
+    results = await asyncio.gather(flight.do("key", fetch), flight.do("key", fetch), return_exceptions=True)
+    assert [type(r) for r in results] == [ValueError, ValueError]
+    assert flight.executed == 1
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    
+    async def fetch():
+        await release.wait()
+        return "result"
+    
+    first = asyncio.ensure_future(flight.do("key", fetch))
+    second = asyncio.ensure_future(flight.do("key", fetch))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.sleep(0.01)
+    release.set()
+    assert await second == "result"
+    assert first.cancelled()
+
+
+async def test_shared_call_is_cancelled_with_its_last_caller():
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+    
+    async def fetch():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+    
+    waiters = [asyncio.ensure_future(flight.do("key", fetch)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert flight.status()["in_flight"] == 0
+
+
+async def test_identical_reads_send_one_request(client, discord):
+    path = "/channels/1/messages/2"
+    discord.delay = 0.05
+    discord.add("GET", path, httpx.Response(200, json={"id": "2", "content": "hi"}))
+    
+    results = await asyncio.gather(*(production.discord_request("GET", path) for _ in range(5)))
+    assert all(result == {"id": "2", "content": "hi"} for result in results)
+    assert discord.sent("GET", path) == 1
+    assert production.single_flight.coalesced == 4
+
+
+async def test_different_params_are_not_coalesced(client, discord):
+    path = "/channels/1/messages"
+    discord.delay = 0.05
+    discord.add("GET", path, httpx.Response(200, json=[]))
+    
+    await asyncio.gather(production.discord_request("GET", path, params={"limit": 1}),
+                         production.discord_request("GET", path, params={"limit": 2}))
+    assert discord.sent("GET", path) == 2
+
+
+async def test_writes_are_not_coalesced(client, discord):
+    path = "/channels/1/messages"
+    discord.delay = 0.05
+    discord.add("POST", path, httpx.Response(200, json={"id": "3"}))
+    
+    await asyncio.gather(*(production.discord_request("POST", path, json={"content": "hi"}) for _ in range(2)))
+    assert discord.sent("POST", path) == 2
+
+
+async def test_coalescing_can_be_disabled(client, discord, settings):
+    settings(SINGLE_FLIGHT_ENABLED=False)
+    path = "/channels/1/messages/2"
+    discord.delay = 0.05
+    discord.add("GET", path, httpx.Response(200, json={"id": "2"}))
+    
+    await asyncio.gather(*(production.discord_request("GET", path) for _ in range(3)))
+    assert discord.sent("GET", path) == 3
+
+
+async def test_status_reports_the_coalesce_ratio(client, discord):
+    path = "/channels/1/messages/2"
+    discord.delay = 0.05
+    discord.add("GET", path, httpx.Response(200, json={"id": "2"}))
+    
+    await asyncio.gather(*(production.discord_request("GET", path) for _ in range(4)))
+    status = (await production.DISCORDBOT_GET_CACHE_STATUS())["single_flight"]
+    assert (status["executed"], status["coalesced"], status["coalesce_ratio"]) == (1, 3, 0.75)
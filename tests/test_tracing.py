@@ -0,0 +1,93 @@
+import json
+
+import httpx
+import pytest
+
+import production
+
+
+@pytest.fixture
+def traces(client, tmp_path, settings, monkeypatch):
+    """Enable tracing into a file in ``tmp_path``; returns a reader of the exported spans."""
+    path = tmp_path / "traces.jsonl"
+    settings(TRACING_ENABLED=True)
+    exporter = production.SpanExporter(str(path), "", "test")
+    monkeypatch.setattr(production, "span_exporter", exporter)
+    
+    async def spans():
+        await exporter.close()
+        lines = path.read_text().splitlines() if path.exists() else []
+        return [span for line in lines
+                for span in json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]]
+    return spans
+
+
+def attributes(span):
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+async def test_tool_call_is_exported_as_one_trace(client, discord, traces):
+    discord.add("GET", "/gateway", httpx.Response(200, json={"url": "wss://gateway.discord.gg"}))
+    await production.mcp.call_tool("DISCORDBOT_GET_GATEWAY", {})
+    spans = {span["name"]: span for span in await traces()}
+    root = spans["tools/call DISCORDBOT_GET_GATEWAY"]
+    assert "parentSpanId" not in root
+    assert {span["traceId"] for span in spans.values()} == {root["traceId"]}
+    
+    request = spans["GET /gateway"]
+    assert request["parentSpanId"] == root["spanId"]
+    assert attributes(request)["http.response.status_code"] == "200"
+    assert attributes(request)["discord.request_id"].startswith("req_")
+    assert spans["attempt"]["parentSpanId"] == request["spanId"]
+    assert {"ratelimit.global_wait", "decode"} <= set(spans)
+
+
+async def test_failed_calls_record_the_error(client, discord, traces):
+    discord.add("GET", "/channels/1/messages/2", httpx.Response(404, json={"message": "Unknown Message", "code": 10008}))
+    with pytest.raises(production.DiscordNotFoundError):
+        await production.discord_request("GET", "/channels/1/messages/2")
+    [request] = [span for span in await traces() if span["name"] == "GET /channels/{channel_id}/messages/{message_id}"]
+    assert request["status"]["code"] == 2
+    assert "DiscordNotFoundError" in request["status"]["message"]
+
+
+async def test_nothing_is_exported_when_disabled(client, discord, traces, settings):
+    settings(TRACING_ENABLED=False)
+    discord.add("GET", "/gateway", httpx.Response(200, json={}))
+    await production.mcp.call_tool("DISCORDBOT_GET_GATEWAY", {})
+    assert await traces() == []
+
+
+async def test_spans_are_posted_to_the_otlp_endpoint(client, discord, settings, monkeypatch):
+    posted = []
+    
+    def collector(request):
+        posted.append(json.loads(request.content))
+        return httpx.Response(200)
+    
+    exporter = production.SpanExporter("", "http://collector/v1/traces", "test")
+    exporter._client = httpx.AsyncClient(transport=httpx.MockTransport(collector))
+    settings(TRACING_ENABLED=True)
+    monkeypatch.setattr(production, "span_exporter", exporter)
+    discord.add("GET", "/gateway", httpx.Response(200, json={}))
+    await production.mcp.call_tool("DISCORDBOT_GET_GATEWAY", {})
+    await exporter.close()
+    resource = posted[0]["resourceSpans"][0]
+    assert resource["resource"]["attributes"][0]["value"] == {"stringValue": "test"}
+    assert exporter.exported == len(resource["scopeSpans"][0]["spans"]) > 0
+
+
+async def test_file_writes_leave_the_event_loop(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = production.SpanExporter(str(path), "", "test")
+    span = production.Span("root")
+    span.end_ns = span.start_ns
+    exporter.export([span])
+    exporter.export([span])
+    assert not path.exists()
+    await exporter.close()
+    assert len(path.read_text().splitlines()) == 2
+    assert exporter.exported == 2
+
+def test_request_ids_are_unique():
+    assert len({production._new_request_id() for _ in range(1000)}) == 1000